@@ -3,7 +3,9 @@ from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.db.session import get_async_db
+from backend.core.config import settings
 from backend.core.security import decode_token
+from backend.core.user_cache import Principal, get_user_cache
 from backend.repositories.user_repository import UserRepository
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
@@ -14,7 +16,36 @@ user_repo = UserRepository()
 async def get_current_user(
     db: AsyncSession = Depends(get_async_db),
     token: str = Depends(oauth2_scheme),
+) -> Principal:
+    return await authenticate_token(db, token)
+
+
+async def get_current_user_record(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user),
 ):
+    """The full User row, for routes that read or modify the profile."""
+    user = await user_repo.get_by_id(db, current_user.id)
+
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+        )
+
+    return user
+
+
+async def authenticate_token(db: AsyncSession, token: str) -> Principal:
+    """
+    Resolve a bearer token to its principal (id, role, is_active).  Shared by
+    the dependency above and by WebSocket endpoints, which receive the token
+    as a query parameter.
+
+    With AUTH_TRUST_TOKEN_CLAIMS the signed role claims are used as-is and
+    no lookup happens; tokens without them, and every token otherwise, are
+    resolved through the user cache, falling back to the database.
+    """
     try:
         payload = decode_token(token)
     except Exception:
@@ -37,6 +68,23 @@ async def get_current_user(
             detail="Invalid token payload",
         )
 
+    if settings.AUTH_TRUST_TOKEN_CLAIMS and "role" in payload:
+        try:
+            return Principal.from_claims(payload)
+        except (KeyError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid token payload",
+            )
+
+    user_cache = get_user_cache()
+    principal = await user_cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    # Taken before the lookup: an update/delete committed meanwhile keeps
+    # this (possibly stale) row out of the cache
+    generation = await user_cache.generation(user_id)
     user = await user_repo.get_by_id(db, user_id)
 
     if not user:
@@ -45,4 +93,6 @@ async def get_current_user(
             detail="User not found",
         )
 
-    return user
\ No newline at end of file
+    principal = Principal.from_user(user)
+    await user_cache.set(principal, generation=generation)
+    return principal
\ No newline at end of file
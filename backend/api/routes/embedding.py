@@ -0,0 +1,64 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from backend.api.deps import get_current_user
+from backend.schemas.embedding import (
+    EmbeddingIndexRequest,
+    EmbeddingIndexResponse,
+    EmbeddingSearchRequest,
+    EmbeddingSearchResponse,
+)
+from backend.services.embedding_service import EmbeddingService
+from backend.core.exceptions import ModelNotFoundError, ModelInferenceError
+
+
+router = APIRouter(prefix="/embeddings", tags=["Embeddings"])
+embedding_service = EmbeddingService()
+
+
+# ------------------------------------------------------------------ #
+# Index Texts                                                          #
+# ------------------------------------------------------------------ #
+
+@router.post("/", response_model=EmbeddingIndexResponse)
+async def index_texts(
+    payload: EmbeddingIndexRequest,
+    current_user = Depends(get_current_user),
+):
+    try:
+        return await embedding_service.index_texts(
+            texts=payload.texts,
+            user_id=str(current_user.id),
+            model_version_id=payload.model_version_id,
+        )
+    except ModelNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except ModelInferenceError as e:
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+# ------------------------------------------------------------------ #
+# Similarity Search                                                    #
+# ------------------------------------------------------------------ #
+
+@router.post("/search", response_model=EmbeddingSearchResponse)
+async def search(
+    payload: EmbeddingSearchRequest,
+    current_user = Depends(get_current_user),
+):
+    try:
+        model_version_id, hits = await embedding_service.search(
+            query=payload.query,
+            user_id=str(current_user.id),
+            k=payload.k,
+            model_version_id=payload.model_version_id,
+        )
+    except ModelNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except ModelInferenceError as e:
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return {"model_version_id": model_version_id, "hits": hits}
@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.db.session import get_async_db
 from backend.api.deps import get_current_user
-from backend.schemas.execution import ExecutionResponse
+from backend.schemas.execution import ExecutionResponse, ExecutionTraceResponse
+from backend.schemas.pagination import Page
 from backend.services.execution_service import ExecutionService
 from backend.services.task_service import TaskService
+from backend.core.exceptions import InvalidCursorError
 
 
 router = APIRouter(prefix="/executions", tags=["Executions"])
@@ -23,27 +25,48 @@ async def get_execution(
     db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_user),
 ):
-    execution = await execution_service.get_execution(db, execution_id)
-    if not execution:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Execution not found")
+    return await _get_owned_execution(db, execution_id, current_user)
 
-    # Ownership check via task
-    task = await task_service.get_task(db, str(execution.task_id))
-    if not task:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
-    if str(task.user_id) != str(current_user.id):
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
 
-    return execution
+# ------------------------------------------------------------------ #
+# Get Execution Trace                                                  #
+# ------------------------------------------------------------------ #
+
+@router.get("/{execution_id}/trace", response_model=ExecutionTraceResponse)
+async def get_execution_trace(
+    execution_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user),
+):
+    execution = await _get_owned_execution(db, execution_id, current_user)
+    if not execution.metrics:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No trace recorded for this execution")
+
+    trace = execution.metrics
+    stages = trace.get("stages", {})
+    total_ms = trace.get("total_ms")
+
+    return {
+        "execution_id": str(execution.id),
+        "task_id": str(execution.task_id),
+        "status": execution.status,
+        "runtime_ms": execution.runtime_ms,
+        "total_ms": total_ms,
+        "stages": stages,
+        "unaccounted_ms": round(total_ms - sum(stages.values()), 1) if total_ms is not None else None,
+        "attrs": trace.get("attrs", {}),
+    }
 
 
 # ------------------------------------------------------------------ #
 # Get Executions By Task ID                                            #
 # ------------------------------------------------------------------ #
 
-@router.get("/task/{task_id}", response_model=list[ExecutionResponse])
+@router.get("/task/{task_id}", response_model=Page[ExecutionResponse])
 async def get_task_executions(
     task_id: str,
+    cursor: str | None = None,
+    limit: int = Query(default=100, ge=1, le=500),
     db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_user),
 ):
@@ -54,4 +77,31 @@ async def get_task_executions(
     if str(task.user_id) != str(current_user.id):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
 
-    return await execution_service.get_task_executions(db, task_id)
\ No newline at end of file
+    try:
+        return await execution_service.get_task_executions(
+            db,
+            task_id,
+            cursor=cursor,
+            limit=limit,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+# ------------------------------------------------------------------ #
+# Internal                                                             #
+# ------------------------------------------------------------------ #
+
+async def _get_owned_execution(db: AsyncSession, execution_id: str, current_user):
+    execution = await execution_service.get_execution(db, execution_id)
+    if not execution:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Execution not found")
+
+    # Ownership check via task
+    task = await task_service.get_task(db, str(execution.task_id))
+    if not task:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+    if str(task.user_id) != str(current_user.id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
+
+    return execution
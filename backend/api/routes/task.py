@@ -1,11 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import json
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.db.session import get_async_db
-from backend.api.deps import get_current_user
-from backend.schemas.task import TaskCreate, TaskResponse, TaskStatusResponse
+from backend.db.session import AsyncSessionLocal, get_async_db
+from backend.api.deps import authenticate_token, get_current_user
+from backend.schemas.task import (
+    TaskBatchCreate,
+    TaskBatchResponse,
+    TaskCreate,
+    TaskResponse,
+    TaskStatusResponse,
+)
+from backend.schemas.pagination import Page
 from backend.services.task_service import TaskService
-from backend.core.exceptions import TaskNotFoundError, TaskExecutionError
+from backend.core.enums import TaskStatus
+from backend.core.exceptions import InvalidCursorError, TaskNotFoundError, TaskExecutionError
+from backend.queue.streams import EVENT_DONE, EVENT_ERROR, read_task_stream, stream_exists
+from backend.queue.notifications import subscribe_task_events, task_event
 
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
@@ -34,6 +57,100 @@ async def create_task(
     return task
 
 
+# ------------------------------------------------------------------ #
+# Create Tasks In Bulk                                                 #
+# ------------------------------------------------------------------ #
+
+@router.post("/batch", response_model=TaskBatchResponse, status_code=status.HTTP_201_CREATED)
+async def create_tasks_batch(
+    payload: TaskBatchCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user),
+):
+    items = await task_service.create_tasks_batch(
+        db,
+        user_id=str(current_user.id),
+        items=[task.model_dump() for task in payload.tasks],
+    )
+    failed = sum(1 for item in items if item["error"])
+    return {"created": len(items) - failed, "failed": failed, "items": items}
+
+
+# ------------------------------------------------------------------ #
+# Task Status Events (push, replaces polling /status)                 #
+# ------------------------------------------------------------------ #
+# Declared before /{task_id} so "events" is not captured as a task id.
+# Auth and ownership hit the DB once per connection; every transition
+# after that arrives over Redis pub/sub.
+
+@router.get("/events")
+async def task_events(
+    request: Request,
+    task_id: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user),
+):
+    initial = await _check_subscription(db, task_id, current_user)
+    user_id = str(current_user.id)
+
+    # Release the pooled connection — the stream can stay open for hours
+    await db.close()
+
+    async def relay():
+        async for event in subscribe_task_events(user_id=user_id, task_id=task_id, initial=initial):
+            if await request.is_disconnected():
+                return
+            if event is None:
+                yield ": keep-alive\n\n"
+                continue
+            yield _sse("status", event)
+
+    return StreamingResponse(relay(), media_type="text/event-stream", headers=_SSE_HEADERS)
+
+
+@router.websocket("/events/ws")
+async def task_events_ws(
+    websocket: WebSocket,
+    token: str,
+    task_id: str | None = None,
+):
+    try:
+        async with AsyncSessionLocal() as db:
+            user = await authenticate_token(db, token)
+            initial = await _check_subscription(db, task_id, user)
+    except HTTPException as e:
+        await websocket.close(code=1008, reason=str(e.detail))
+        return
+
+    await websocket.accept()
+    try:
+        async for event in subscribe_task_events(
+            user_id=str(user.id), task_id=task_id, initial=initial
+        ):
+            if event is None:
+                await websocket.send_json({"type": "heartbeat"})
+                continue
+            await websocket.send_json({"type": "status", **event})
+    except WebSocketDisconnect:
+        pass
+
+
+async def _check_subscription(db: AsyncSession, task_id: str | None, current_user) -> dict | None:
+    """Ownership check for single-task subscriptions; returns its current state."""
+    if task_id is None:
+        return None
+
+    task = await task_service.get_task(db, task_id)
+
+    if not task:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+
+    if str(task.user_id) != str(current_user.id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
+
+    return task_event(task)
+
+
 # ------------------------------------------------------------------ #
 # Get Task By ID                                                       #
 # ------------------------------------------------------------------ #
@@ -76,16 +193,84 @@ async def get_task_status(
     return task
 
 
+# ------------------------------------------------------------------ #
+# Stream Task Output (SSE)                                             #
+# ------------------------------------------------------------------ #
+
+@router.get("/{task_id}/stream")
+async def stream_task(
+    task_id: str,
+    request: Request,
+    last_event_id: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user),
+):
+    task = await task_service.get_task(db, task_id)
+
+    if not task:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+
+    if str(task.user_id) != str(current_user.id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
+
+    # Finished without streaming (or the stream expired) — nothing to relay
+    terminal = task.status in (TaskStatus.SUCCESS, TaskStatus.FAILED)
+    if terminal and not await stream_exists(task_id):
+        event = EVENT_DONE if task.status == TaskStatus.SUCCESS else EVENT_ERROR
+        body = iter([_sse(event, {"status": task.status})])
+        return StreamingResponse(body, media_type="text/event-stream", headers=_SSE_HEADERS)
+
+    # Only tasks created with `"stream": true` ever publish to the stream;
+    # relaying anything else would send keep-alives forever
+    if not (task.input_payload or {}).get("stream"):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Task was not created with \"stream\": true; follow it via GET /tasks/events instead",
+        )
+
+    await db.close()
+
+    async def relay():
+        async for entry in read_task_stream(task_id, last_id=last_event_id or "0"):
+            if await request.is_disconnected():
+                return
+            if entry is None:
+                yield ": keep-alive\n\n"
+                continue
+            entry_id, event, data = entry
+            yield _sse(event, data, entry_id)
+
+    return StreamingResponse(relay(), media_type="text/event-stream", headers=_SSE_HEADERS)
+
+
+_SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def _sse(event: str, data: dict, event_id: str | None = None) -> str:
+    head = f"id: {event_id}\n" if event_id else ""
+    return f"{head}event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
 # ------------------------------------------------------------------ #
 # List My Tasks                                                        #
 # ------------------------------------------------------------------ #
 
-@router.get("/user/me", response_model=list[TaskResponse])
+@router.get("/user/me", response_model=Page[TaskResponse])
 async def get_user_tasks(
+    cursor: str | None = None,
+    limit: int = Query(default=50, ge=1, le=200),
     db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_user),
 ):
-    return await task_service.get_user_tasks(db, user_id=str(current_user.id))
+    try:
+        return await task_service.get_user_tasks(
+            db,
+            user_id=str(current_user.id),
+            cursor=cursor,
+            limit=limit,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 # ------------------------------------------------------------------ #
@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.db.session import get_async_db
-from backend.api.deps import get_current_user
+from backend.api.deps import get_current_user, get_current_user_record
 from backend.repositories.user_repository import UserRepository
 from backend.schemas.user import UserResponse, UserUpdate
+from backend.schemas.pagination import Page
+from backend.core.enums import UserRole
+from backend.core.exceptions import InvalidCursorError
 
 
 router = APIRouter(
@@ -15,10 +18,27 @@ router = APIRouter(
 user_repo = UserRepository()
 
 
+# List Users (admin only)
+@router.get("/", response_model=Page[UserResponse])
+async def list_users(
+    cursor: str | None = None,
+    limit: int = Query(default=100, ge=1, le=500),
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user),
+):
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
+
+    try:
+        return await user_repo.list_users(db, cursor=cursor, limit=limit)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
 # Get Current User
 @router.get("/me", response_model=UserResponse)
 async def get_me(
-    current_user = Depends(get_current_user),
+    current_user = Depends(get_current_user_record),
 ):
     return current_user
 
@@ -28,7 +48,7 @@ async def get_me(
 async def update_me(
     payload: UserUpdate,
     db: AsyncSession = Depends(get_async_db),
-    current_user = Depends(get_current_user),
+    current_user = Depends(get_current_user_record),
 ):
     updated_user = await user_repo.update_user(
         db,
@@ -43,7 +63,7 @@ async def update_me(
 @router.delete("/me")
 async def delete_me(
     db: AsyncSession = Depends(get_async_db),
-    current_user = Depends(get_current_user),
+    current_user = Depends(get_current_user_record),
 ):
     await user_repo.delete_user(db, current_user)
 
@@ -0,0 +1,65 @@
+"""
+Memory and parse time: json.loads -> list[list[float]] vs EmbeddingMatrix.
+
+Simulates a HuggingFace feature-extraction response body and parses it
+both ways.  Memory is reported as the tracemalloc peak while parsing and
+as the size retained by the parsed result.  Runs without a database or network:
+    python -m backend.benchmarks.bench_embedding_matrix --rows 1000 --dim 768
+"""
+import argparse
+import json
+import random
+import time
+import tracemalloc
+
+from backend.ml.vectors import EmbeddingMatrix, np
+
+
+def _make_body(rows: int, dim: int) -> str:
+    rng = random.Random(0)
+    return json.dumps([[rng.uniform(-1, 1) for _ in range(dim)] for _ in range(rows)])
+
+
+def _measure(parse, body: str, repeats: int) -> tuple[float, int, int]:
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        parse(body)
+    elapsed_ms = (time.perf_counter() - t0) * 1000 / repeats
+
+    tracemalloc.start()
+    result = parse(body)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed_ms, peak, retained
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    body = _make_body(args.rows, args.dim)
+
+    list_ms, list_peak, list_kept = _measure(json.loads, body, args.repeats)
+    matrix_ms, matrix_peak, matrix_kept = _measure(EmbeddingMatrix.from_json, body, args.repeats)
+
+    print(f"batch={args.rows}x{args.dim}  body={len(body) / 1e6:.1f} MB  numpy={np is not None}")
+    print(
+        f"list[list[float]] : parse {list_ms:8.1f} ms   "
+        f"peak {list_peak / 1e6:7.1f} MB   retained {list_kept / 1e6:7.1f} MB"
+    )
+    print(
+        f"EmbeddingMatrix   : parse {matrix_ms:8.1f} ms   "
+        f"peak {matrix_peak / 1e6:7.1f} MB   retained {matrix_kept / 1e6:7.1f} MB"
+    )
+    print(
+        f"savings           : parse {list_ms / matrix_ms:8.2f}x   "
+        f"peak {list_peak / matrix_peak:7.2f}x      retained {list_kept / matrix_kept:7.2f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
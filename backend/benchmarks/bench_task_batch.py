@@ -0,0 +1,88 @@
+"""
+Tasks/sec: N x TaskService.create_task (the POST /tasks/ path) vs. one
+TaskService.create_tasks_batch call (the POST /tasks/batch path).
+
+Needs the real stack (DATABASE_ASYNC_URL, REDIS_URL, CELERY_BROKER_URL).
+A throwaway user owns the tasks; the rows (and the user) are deleted
+afterwards, but the broker messages are real — run it against a scratch
+broker or with no workers attached, and purge the queues afterwards:
+    python -m backend.benchmarks.bench_task_batch --sizes 100 1000 10000
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+from sqlalchemy import delete
+
+from backend.core.enums import TaskType
+from backend.db.session import AsyncSessionLocal, async_engine
+from backend.models.task import Task
+from backend.queue.redis_client import close_redis, init_redis
+from backend.repositories.user_repository import UserRepository
+from backend.services.task_service import TaskService
+
+
+def _items(n: int) -> list[dict]:
+    return [
+        {
+            "name": f"bench-{i}",
+            "task_type": TaskType.INFERENCE,
+            "input_payload": {"prompt": "benchmark"},
+            "priority": 0,
+            "model_version_id": None,
+        }
+        for i in range(n)
+    ]
+
+
+async def bench_single(service: TaskService, user_id: str, n: int) -> float:
+    t0 = time.perf_counter()
+    async with AsyncSessionLocal() as db:
+        for item in _items(n):
+            await service.create_task(db, user_id=user_id, **item)
+    return n / (time.perf_counter() - t0)
+
+
+async def bench_batch(service: TaskService, user_id: str, n: int) -> float:
+    t0 = time.perf_counter()
+    async with AsyncSessionLocal() as db:
+        await service.create_tasks_batch(db, user_id=user_id, items=_items(n))
+    return n / (time.perf_counter() - t0)
+
+
+async def main(sizes: list[int], single_limit: int):
+    await init_redis()
+    service = TaskService()
+
+    async with AsyncSessionLocal() as db:
+        user = await UserRepository().create_user(
+            db,
+            email=f"bench-{uuid.uuid4().hex[:8]}@example.invalid",
+            password_hash="x",
+        )
+    user_id = str(user.id)
+
+    try:
+        print(f"{'tasks':>7} | {'POST /tasks/ x N':>18} | {'POST /tasks/batch':>18} | speedup")
+        for n in sizes:
+            # The per-task path is linear and slow; cap it and extrapolate
+            single = await bench_single(service, user_id, min(n, single_limit))
+            batch = await bench_batch(service, user_id, n)
+            print(f"{n:>7} | {single:>12.1f} tps | {batch:>12.1f} tps | {batch / single:6.1f}x")
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(Task).where(Task.user_id == user_id))
+            await db.commit()
+            users = UserRepository()
+            await users.delete_user(db, await users.get_by_id(db, user_id))
+        await close_redis()
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--single-limit", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes, args.single_limit))
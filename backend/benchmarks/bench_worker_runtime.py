@@ -0,0 +1,76 @@
+"""
+Tasks/sec: per-task asyncio.run() + fresh engine vs. the persistent
+worker runtime.
+
+Each simulated task opens a session and runs the same two round trips
+the real pipeline starts with (SELECT 1 + a task lookup-sized query).
+No provider calls are made, so the numbers isolate loop/pool overhead.
+
+Run from the repo root against a real Postgres (uses DATABASE_ASYNC_URL):
+    python -m backend.benchmarks.bench_worker_runtime --tasks 500
+"""
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from backend.core.config import settings
+from backend.workers.worker_app.runtime import WorkerRuntime
+
+
+async def _simulated_task(session_factory) -> None:
+    async with session_factory() as db:
+        await db.execute(text("SELECT 1"))
+        await db.execute(text("SELECT now()"))
+
+
+async def _fresh_engine_task() -> None:
+    # Mirrors the old _run_task: new engine per task, disposed afterwards
+    engine = create_async_engine(settings.DATABASE_ASYNC_URL, pool_pre_ping=True)
+    factory = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
+    try:
+        await _simulated_task(factory)
+    finally:
+        await engine.dispose()
+
+
+def bench_fresh_loop(n: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(n):
+        asyncio.run(_fresh_engine_task())
+    return n / (time.perf_counter() - t0)
+
+
+def bench_runtime(n: int) -> float:
+    runtime = WorkerRuntime()
+    runtime.start()
+    try:
+        # Warm the pool so the first-connection cost isn't counted
+        runtime.run(_simulated_task(runtime.session_factory))
+
+        t0 = time.perf_counter()
+        for _ in range(n):
+            runtime.run(_simulated_task(runtime.session_factory))
+        return n / (time.perf_counter() - t0)
+    finally:
+        runtime.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=200)
+    args = parser.parse_args()
+
+    before = bench_fresh_loop(args.tasks)
+    after = bench_runtime(args.tasks)
+
+    print(f"tasks={args.tasks}")
+    print(f"asyncio.run + fresh engine : {before:8.1f} tasks/sec")
+    print(f"persistent worker runtime  : {after:8.1f} tasks/sec")
+    print(f"speedup                    : {after / before:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
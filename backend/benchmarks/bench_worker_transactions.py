@@ -0,0 +1,143 @@
+"""
+Transactions and statements per task: the step-by-step worker pipeline
+(every service call commits on its own) vs. the unit-of-work pipeline in
+queue/tasks.py (one transaction before execution, one after).
+
+Inference is skipped — only the DB writes around it are measured.
+
+Run from the repo root against a real Postgres (uses DATABASE_ASYNC_URL):
+    python -m backend.benchmarks.bench_worker_transactions --tasks 200
+"""
+import argparse
+import time
+import uuid
+
+from sqlalchemy import delete, event, select
+
+from backend.core.enums import TaskType
+from backend.models.execution import Execution
+from backend.models.result import Result
+from backend.models.task import Task
+from backend.repositories.user_repository import UserRepository
+from backend.services.execution_service import ExecutionService
+from backend.services.result_service import ResultService
+from backend.services.task_service import TaskService
+from backend.workers.worker_app.runtime import WorkerRuntime
+
+OUTPUT = {"text": "benchmark", "latency_ms": 0.0}
+
+task_service = TaskService()
+execution_service = ExecutionService()
+result_service = ResultService()
+
+
+async def _new_queued_task(db, user_id: str) -> str:
+    task = await task_service.task_repo.create_task(
+        db,
+        user_id=user_id,
+        name="bench",
+        task_type=TaskType.INFERENCE,
+        input_payload={"prompt": "benchmark"},
+    )
+    await task_service.queue_task(db, task_id=task.id)
+    return str(task.id)
+
+
+async def step_by_step(db, task_id: str) -> None:
+    execution = await execution_service.create_execution(db, task_id=task_id, worker_id=None)
+    await task_service.start_task_execution(db, task_id=task_id)
+    await execution_service.mark_execution_running(db, execution_id=str(execution.id))
+    await task_service.get_task(db, task_id)
+    await task_service.complete_task_execution(db, task_id=task_id)
+    await execution_service.mark_execution_success(db, execution_id=str(execution.id), runtime_ms=1)
+    await result_service.store_result(db, task_id=task_id, execution_id=str(execution.id), output_summary=OUTPUT)
+
+
+async def unit_of_work(db, task_id: str) -> None:
+    task = await task_service.start_task_execution(db, task_id=task_id, commit=False)
+    execution = await execution_service.create_execution(
+        db, task_id=task_id, worker_id=None, task=task, started=True, commit=False
+    )
+    await db.commit()
+
+    await task_service.complete_task_execution(db, task_id=task_id, commit=False)
+    await execution_service.mark_execution_success(db, execution_id=str(execution.id), runtime_ms=1, commit=False)
+    await result_service.store_result(db, task_id=task_id, execution_id=str(execution.id), output_summary=OUTPUT, commit=False)
+    await db.commit()
+
+
+def measure(runtime: WorkerRuntime, user_id: str, pipeline, n: int) -> tuple[float, float, float]:
+    async def prepare():
+        async with runtime.session_factory() as db:
+            return [await _new_queued_task(db, user_id) for _ in range(n)]
+
+    task_ids = runtime.run(prepare())
+    counts = {"commits": 0, "statements": 0}
+
+    def on_commit(_conn):
+        counts["commits"] += 1
+
+    def on_execute(*_args):
+        counts["statements"] += 1
+
+    sync_engine = runtime.engine.sync_engine
+    event.listen(sync_engine, "commit", on_commit)
+    event.listen(sync_engine, "before_cursor_execute", on_execute)
+
+    async def run_all():
+        for task_id in task_ids:
+            async with runtime.session_factory() as db:
+                await pipeline(db, task_id)
+
+    try:
+        t0 = time.perf_counter()
+        runtime.run(run_all())
+        elapsed = time.perf_counter() - t0
+    finally:
+        event.remove(sync_engine, "commit", on_commit)
+        event.remove(sync_engine, "before_cursor_execute", on_execute)
+
+    return counts["commits"] / n, counts["statements"] / n, n / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=200)
+    args = parser.parse_args()
+
+    runtime = WorkerRuntime()
+    runtime.start()
+
+    async def make_user():
+        async with runtime.session_factory() as db:
+            user = await UserRepository().create_user(
+                db,
+                email=f"bench-{uuid.uuid4().hex[:8]}@example.invalid",
+                password_hash="x",
+            )
+            return str(user.id)
+
+    user_id = runtime.run(make_user())
+
+    try:
+        print(f"tasks={args.tasks}")
+        print(f"{'pipeline':<14} | {'commits/task':>12} | {'statements/task':>15} | {'tasks/sec':>9}")
+        for name, pipeline in (("step-by-step", step_by_step), ("unit-of-work", unit_of_work)):
+            commits, statements, tps = measure(runtime, user_id, pipeline, args.tasks)
+            print(f"{name:<14} | {commits:>12.1f} | {statements:>15.1f} | {tps:>9.1f}")
+    finally:
+        async def cleanup():
+            owned = select(Task.id).where(Task.user_id == user_id)
+            async with runtime.session_factory() as db:
+                await db.execute(delete(Result).where(Result.task_id.in_(owned)))
+                await db.execute(delete(Execution).where(Execution.task_id.in_(owned)))
+                await db.execute(delete(Task).where(Task.user_id == user_id))
+                users = UserRepository()
+                await users.delete_user(db, await users.get_by_id(db, user_id))
+
+        runtime.run(cleanup())
+        runtime.shutdown()
+
+
+if __name__ == "__main__":
+    main()
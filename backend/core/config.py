@@ -22,17 +22,116 @@ class Settings(BaseSettings):
     CELERY_MAX_RETRIES: int = 3      # Max retry attempts for failed tasks 
     CELERY_RETRY_DELAY_SECONDS: int = 5 # Delay between retries (seconds)
 
+    # Priority routing (see queue/routing.py and workers/worker_app/pools.py)
+    TASK_PRIORITY_HIGH_THRESHOLD: int = 5   # priority >= this goes to the high queue
+    TASK_PRIORITY_LOW_THRESHOLD: int = -5   # priority <= this goes to the low queue
+    WORKER_POOL_CONCURRENCY: dict[str, int] = {"high": 8, "default": 4, "low": 2}  # Processes per queue pool
+    WORKER_EXECUTION_MODE: str = "prefork"        # "prefork" (celery worker) or "asyncio" (async_consumer.py)
+    ASYNC_WORKER_CONCURRENCY: int = 100           # Concurrent tasks per asyncio worker process
+    ASYNC_WORKER_SHUTDOWN_TIMEOUT_SECONDS: float = 30.0  # Grace period for in-flight tasks on SIGTERM
+
+    # Batch messages (execute_ai_task_batch, see queue/tasks.py)
+    TASK_BATCH_MESSAGE_SIZE: int = 50             # Max tasks per batch message; 1 disables batching
+    TASK_BATCH_CONCURRENCY: int = 16              # Inferences run at once within one batch message
+
+    # Worker runtime (one event loop + engine per Celery worker process)
+    WORKER_DB_POOL_SIZE: int = 5        # Persistent connections per worker process
+    WORKER_DB_MAX_OVERFLOW: int = 5     # Extra connections allowed under burst
+    WORKER_DB_POOL_RECYCLE_SECONDS: int = 1800  # Recycle connections older than this
+
     # Third-party API keys
     OPENROUTER_API_KEY: str          # OpenRouter API key for primary inference provider
     HUGGINGFACE_API_KEY: str         # HuggingFace API key for fallback inference and embeddings provider
     APP_URL: str = "http://localhost:8000"   # shown in OpenRouter dashboard
     APP_NAME: str = "TaskForge"
 
+    # Provider HTTP client pool (shared per process, see ml/providers/registry.py)
+    PROVIDER_HTTP2: bool = True                   # Use HTTP/2 when the `h2` package is installed
+    PROVIDER_MAX_CONNECTIONS: int = 100           # Max open sockets per provider client
+    PROVIDER_MAX_KEEPALIVE_CONNECTIONS: int = 20  # Idle sockets kept warm per provider client
+    PROVIDER_KEEPALIVE_EXPIRY_SECONDS: float = 30.0  # Idle socket lifetime
+
+    # Completion cache (opt-in, see ml/cache.py)
+    COMPLETION_CACHE_ENABLED: bool = False        # Master switch for the response cache
+    COMPLETION_CACHE_TTL_SECONDS: int = 3600      # Default entry lifetime (Redis + in-process)
+    COMPLETION_CACHE_MAX_ENTRIES: int = 1024      # In-process LRU capacity per worker process
+
+    # Request coalescing (single-flight, see ml/coalescing.py)
+    REQUEST_COALESCING_ENABLED: bool = True       # Dedupe identical in-flight requests per process (temperature-0 completions, embeddings)
+    REQUEST_COALESCING_DISTRIBUTED: bool = False  # Also dedupe across workers via Redis lock + pub/sub
+    REQUEST_COALESCING_WAIT_SECONDS: float = 60.0 # Max time a follower waits on a remote leader
+
+    # ModelVersion lookups (process-local cache, see ml/model_version_cache.py)
+    MODEL_VERSION_CACHE_ENABLED: bool = True      # Serve _resolve_model from memory
+    MODEL_VERSION_CACHE_TTL_SECONDS: float = 300.0  # Upper bound on staleness if an invalidation is missed
+
+    # Provider circuit breaker (state shared via Redis, see ml/circuit_breaker.py)
+    CIRCUIT_BREAKER_ENABLED: bool = True          # Skip providers whose breaker is open
+    CIRCUIT_BREAKER_WINDOW_SECONDS: int = 60      # Rolling window for error / slow-call rates
+    CIRCUIT_BREAKER_BUCKET_SECONDS: int = 10      # Window granularity (one Redis hash per bucket)
+    CIRCUIT_BREAKER_MIN_CALLS: int = 5            # Calls in the window before the breaker may trip
+    CIRCUIT_BREAKER_ERROR_RATE: float = 0.5       # Error rate that opens the breaker
+    CIRCUIT_BREAKER_SLOW_CALL_SECONDS: float = 15.0  # Calls at least this slow count as slow
+    CIRCUIT_BREAKER_SLOW_CALL_RATE: float = 0.8   # Slow-call rate that opens the breaker
+    CIRCUIT_BREAKER_COOLDOWN_SECONDS: float = 30.0   # Open time before a background probe
+    CIRCUIT_BREAKER_HALF_OPEN_SUCCESSES: int = 3  # Trial successes needed to close again
+    CIRCUIT_BREAKER_STATE_CACHE_SECONDS: float = 1.0 # Per-process cache of the shared state
+
+    # Provider rate limiting (Redis token buckets, see ml/rate_limiter.py)
+    RATE_LIMIT_ENABLED: bool = True               # Admit completions through the shared limiter
+    PROVIDER_RATE_LIMITS: dict[str, dict[str, int]] = {}  # "provider" or "provider:model_id" -> requests/tokens_per_minute
+    RATE_LIMIT_MAX_WAIT_SECONDS: float = 20.0     # Longer waits raise and reschedule the task instead
+    RATE_LIMIT_DEFAULT_RETRY_AFTER_SECONDS: float = 5.0  # Block time after a 429 without Retry-After
+    RATE_LIMIT_BACKOFF_FACTOR: float = 0.5        # Admitted-rate multiplier applied on each 429
+    RATE_LIMIT_MIN_SCALE: float = 0.1             # Floor for the admitted-rate multiplier
+    RATE_LIMIT_RECOVERY_SECONDS: float = 60.0     # Time to recover from 0 to the full configured rate
+
+    # Hedged completions (opt-in, see ml/hedging.py)
+    HEDGING_ENABLED: bool = False                 # Master switch; per model version via config["hedge"]
+    HEDGE_LATENCY_PERCENTILE: float = 95.0        # Hedge once the primary is slower than this percentile
+    HEDGE_LATENCY_WINDOW: int = 256               # Recent latencies kept per provider/model
+    HEDGE_MIN_SAMPLES: int = 20                   # Samples needed before the percentile is trusted
+    HEDGE_DEFAULT_DELAY_MS: int = 2000            # Hedge delay until enough samples are collected
+    HEDGE_BUDGET_RATIO: float = 0.1               # Max share of requests that may be hedged
+    HEDGE_BUDGET_BURST: int = 5                   # Hedges allowed back-to-back before the ratio applies
+
+    # Embedding micro-batching (see ml/batching.py)
+    EMBEDDING_BATCHING_ENABLED: bool = True       # Merge concurrent embed() calls per model
+    EMBEDDING_BATCH_MAX_SIZE: int = 64            # Max texts per provider call
+    EMBEDDING_BATCH_MAX_WAIT_MS: int = 10         # Max time a text waits for batch-mates
+    EMBEDDING_COMPACT_VECTORS: bool = True        # Parse embeddings into float32 EmbeddingMatrix
+
+    # Vector store (see vectorstore/store.py)
+    VECTOR_STORE_DIR: str = str(BASE_DIR / "data" / "vectors")  # <model_version_id>/<user_id>/ per store
+    VECTOR_STORE_IVF_NPROBE: int = 8              # IVF buckets scanned per query
+    VECTOR_STORE_IVF_MIN_ROWS: int = 10000        # Smaller stores are left to the exact scan (vectorstore/build_index.py)
+    VECTOR_STORE_MAX_OPEN: int = 256              # Stores kept loaded per process (LRU); evicted ones reload from disk
+
+    # Streaming completions (Redis streams, see queue/streams.py)
+    TASK_STREAM_TTL_SECONDS: int = 3600           # Stream key lifetime after the last event
+    TASK_STREAM_MAXLEN: int = 10000               # Approximate cap on events kept per task
+    TASK_STREAM_BLOCK_MS: int = 15000             # XREAD block time; SSE heartbeat interval
+
+    # Task status push notifications (Redis pub/sub, see queue/notifications.py)
+    TASK_STATUS_SNAPSHOT_TTL_SECONDS: int = 86400 # Last-known status kept for new subscribers
+    TASK_EVENTS_HEARTBEAT_SECONDS: float = 15.0   # Keep-alive interval on idle subscriptions
+
+    # Metrics counters (see monitoring/counters.py)
+    METRICS_RECONCILE_INTERVAL_SECONDS: int = 300 # Beat interval for the DB reconciliation job
+    PROMETHEUS_MULTIPROC_DIR: str | None = None   # Shared sample dir for multi-process hosts (see monitoring/prometheus.py)
+
     # Authentication security
     ALGORITHM: str                  # JWT signing algorithm (e.g., HS256)
     SECRET_KEY: str                 # Cryptographic signing secret
     ACCESS_TOKEN_EXPIRE_MINUTES: int   # Access token lifetime (minutes)
     REFRESH_TOKEN_EXPIRE_DAYS: int     # Refresh token lifetime (days)
+    AUTH_TRUST_TOKEN_CLAIMS: bool = False  # Authenticate from signed role claims, no user lookup; changes apply at token expiry
+
+    # Authenticated-user cache (see core/user_cache.py)
+    USER_CACHE_ENABLED: bool = True               # Cache id/role/is_active for get_current_user
+    USER_CACHE_TTL_SECONDS: int = 60              # Redis tier lifetime
+    USER_CACHE_LOCAL_TTL_SECONDS: float = 5.0     # In-process tier; staleness bound on other API processes
+    USER_CACHE_MAX_ENTRIES: int = 10000           # In-process LRU capacity per API process
 
     # API defaults
     API_INFERENCE_TOKEN_LIMIT: int = 1000       # Max tokens per request (default for all providers)
@@ -53,4 +53,13 @@ class WorkerStatus(str, enum.Enum):
 class WorkerType(str, enum.Enum):
     CPU = "CPU"
     GPU = "GPU"
-    GPU_HIGH_MEM = "GPU_HIGH_MEM"
\ No newline at end of file
+    GPU_HIGH_MEM = "GPU_HIGH_MEM"
+
+# -------------------------
+# Provider
+# -------------------------
+
+class CircuitState(str, enum.Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
@@ -29,6 +29,11 @@ class TaskPermissionError(TaskException):
 class TaskExecutionError(TaskException):
     pass
 
+
+class TaskRetryLimitError(TaskExecutionError):
+    """Raised when a task has used up its own retry budget (max_retries)."""
+
+
 class ExecutionNotFoundError(Exception):
     pass
 
@@ -52,4 +57,8 @@ class ModelNotFoundError(Exception):
     """Raised when a ModelVersion row doesn't exist or no default is configured."""
 
 class ModelInferenceError(Exception):
-    """Raised when inference fails across all providers."""
\ No newline at end of file
+    """Raised when inference fails across all providers."""
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
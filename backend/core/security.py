@@ -19,10 +19,11 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 
 # Token Creation
-def create_access_token(subject: str) -> str:
+def create_access_token(subject: str, claims: dict | None = None) -> str:
     expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
 
     payload = {
+        **(claims or {}),   # authz claims, see AUTH_TRUST_TOKEN_CLAIMS
         "sub": subject,
         "type": "access",
         "exp": expire,
@@ -0,0 +1,204 @@
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from backend.core.config import settings
+from backend.core.enums import UserRole
+from backend.queue.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "taskforge:user:"
+_GENERATION_PREFIX = "taskforge:user-generation:"
+_GENERATION_TTL_SECONDS = 3600  # Only has to outlive a database lookup in flight
+
+# Write the entry only if the user's generation is still the one read before
+# the database lookup — an invalidation in between means the row may be stale
+_SET_IF_GENERATION_SCRIPT = """
+if (redis.call("get", KEYS[2]) or "") ~= ARGV[1] then
+    return 0
+end
+redis.call("set", KEYS[1], ARGV[2], "EX", ARGV[3])
+return 1
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """
+    What `get_current_user` hands to routes: the fields authorization needs,
+    without an ORM row behind them.  Routes that need the full user record
+    (profile, updates) depend on `get_current_user_record` instead.
+    """
+
+    id: uuid.UUID
+    role: UserRole
+    is_active: bool
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        return cls(id=_as_uuid(user.id), role=UserRole(user.role), is_active=bool(user.is_active))
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Principal":
+        return cls(id=_as_uuid(data["id"]), role=UserRole(data["role"]), is_active=bool(data["is_active"]))
+
+    @classmethod
+    def from_claims(cls, payload: dict) -> "Principal":
+        """Access-token payload carrying the claims from `as_claims()`."""
+        return cls(id=_as_uuid(payload["sub"]), role=UserRole(payload["role"]), is_active=bool(payload["active"]))
+
+    def as_dict(self) -> dict:
+        return {"id": str(self.id), "role": self.role.value, "is_active": self.is_active}
+
+    def as_claims(self) -> dict:
+        return {"role": self.role.value, "active": self.is_active}
+
+
+class UserCache:
+    """
+    Short-lived cache of authenticated principals, keyed by user id.
+
+    In-process LRU (USER_CACHE_LOCAL_TTL_SECONDS) in front of Redis
+    (USER_CACHE_TTL_SECONDS), same layout as the completion cache.
+    `UserRepository.update_user` / `delete_user` call `invalidate()`, which
+    drops the Redis entry and this process's copy; other API processes may
+    keep serving their local copy for at most the local TTL.
+
+    A request that read the user from the database before an invalidation
+    must not write its stale copy back afterwards.  Each invalidation bumps
+    a per-user generation key; callers take `generation()` before the
+    database lookup and pass it to `set()`, which only writes while the
+    generation is unchanged (compare-and-set in Redis, plus a process-local
+    epoch for the LRU tier).
+
+    Redis failures degrade to a miss — the cache must never fail a request.
+    """
+
+    def __init__(self, max_entries: int | None = None):
+        self._max_entries = max_entries or settings.USER_CACHE_MAX_ENTRIES
+        self._entries: OrderedDict[str, tuple[float, Principal]] = OrderedDict()
+        # Bumped by every local invalidate(); guards the LRU tier the way the
+        # Redis generation key guards the shared one
+        self._epoch = 0
+
+    async def get(self, user_id: str) -> Principal | None:
+        if not settings.USER_CACHE_ENABLED:
+            return None
+
+        key = str(user_id)
+        principal = self._get_local(key)
+        if principal is not None:
+            return principal
+
+        try:
+            raw = await get_redis().get(_KEY_PREFIX + key)
+        except Exception as exc:
+            logger.warning("user_cache.redis.get_failed", extra={"error": str(exc)})
+            return None
+        if raw is None:
+            return None
+
+        try:
+            principal = Principal.from_dict(json.loads(raw))
+        except (ValueError, TypeError, KeyError) as exc:
+            logger.warning("user_cache.redis.decode_failed", extra={"user_id": key, "error": str(exc)})
+            return None
+        self._set_local(key, principal)
+        return principal
+
+    async def generation(self, user_id) -> tuple[str, int] | None:
+        """
+        Take before loading the user from the database; pass to `set()`.
+        None when Redis is unavailable — `set()` then caches nothing.
+        """
+        if not settings.USER_CACHE_ENABLED:
+            return None
+
+        epoch = self._epoch
+        try:
+            current = await get_redis().get(_GENERATION_PREFIX + str(user_id))
+        except Exception as exc:
+            logger.warning("user_cache.redis.get_failed", extra={"error": str(exc)})
+            return None
+        return (current or "", epoch)
+
+    async def set(self, principal: Principal, *, generation: tuple[str, int] | None) -> None:
+        if not settings.USER_CACHE_ENABLED or generation is None:
+            return
+
+        key = str(principal.id)
+        expected, epoch = generation
+        try:
+            stored = await get_redis().eval(
+                _SET_IF_GENERATION_SCRIPT,
+                2,
+                _KEY_PREFIX + key,
+                _GENERATION_PREFIX + key,
+                expected,
+                json.dumps(principal.as_dict()),
+                settings.USER_CACHE_TTL_SECONDS,
+            )
+        except Exception as exc:
+            logger.warning("user_cache.redis.set_failed", extra={"error": str(exc)})
+            return
+
+        if stored and epoch == self._epoch:
+            self._set_local(key, principal)
+
+    async def invalidate(self, user_id) -> None:
+        key = str(user_id)
+        self._epoch += 1
+        self._entries.pop(key, None)
+        try:
+            async with get_redis().pipeline(transaction=True) as pipe:
+                pipe.incr(_GENERATION_PREFIX + key)
+                pipe.expire(_GENERATION_PREFIX + key, _GENERATION_TTL_SECONDS)
+                pipe.delete(_KEY_PREFIX + key)
+                await pipe.execute()
+        except Exception as exc:
+            logger.warning("user_cache.redis.delete_failed", extra={"user_id": key, "error": str(exc)})
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    # ------------------------------------------------------------------ #
+    # Internal helpers                                                     #
+    # ------------------------------------------------------------------ #
+
+    def _get_local(self, key: str) -> Principal | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, principal = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return principal
+
+    def _set_local(self, key: str, principal: Principal) -> None:
+        self._entries[key] = (time.monotonic() + settings.USER_CACHE_LOCAL_TTL_SECONDS, principal)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+
+def _as_uuid(value) -> uuid.UUID:
+    return value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))
+
+
+# Process-wide instance — the LRU tier is shared by every request.
+_cache: UserCache | None = None
+
+
+def get_user_cache() -> UserCache:
+    global _cache
+    if _cache is None:
+        _cache = UserCache()
+    return _cache
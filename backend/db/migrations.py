@@ -0,0 +1,135 @@
+"""
+Lightweight, idempotent schema upgrades run at startup after create_all.
+
+`Base.metadata.create_all` only creates missing *tables*; it never touches
+tables that already exist.  This brings existing tables up to the models:
+
+  * columns present on a model but missing in the database are added
+    (ALTER TABLE ... ADD COLUMN IF NOT EXISTS, with the model's DDL);
+  * indexes declared on a model but missing in the database are created,
+    CONCURRENTLY on PostgreSQL so live tables are not write-locked;
+  * INVALID indexes (a CREATE INDEX CONCURRENTLY that failed or was
+    interrupted leaves one behind, and IF NOT EXISTS would skip it forever)
+    are dropped and built again;
+  * indexes listed in _RETIRED_INDEXES (superseded by a renamed model
+    index) are dropped once their table has been upgraded.
+
+Nothing else is ever dropped or altered in place — destructive changes
+still need a hand-written migration.  Safe to run on every boot and from
+several processes at once: every statement is IF NOT EXISTS, and on
+PostgreSQL an advisory lock lets one process upgrade at a time, so an
+index another process is still building is never mistaken for a failed one.
+"""
+import logging
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.schema import CreateColumn, CreateIndex
+
+from backend.db.base import Base
+
+logger = logging.getLogger(__name__)
+
+# pg_advisory_lock key held while upgrading ("taskforge" as a bigint)
+_UPGRADE_LOCK_KEY = 0x7461736B666F7267
+
+# Index names a model no longer declares, by table.  Only add names whose
+# replacement is declared on the model — they are dropped after it is built.
+_RETIRED_INDEXES: dict[str, tuple[str, ...]] = {
+    # Keyset indexes before `id` was added as the tiebreaker column
+    "tasks": ("ix_tasks_user_id_submitted_at",),
+    "executions": (
+        "ix_executions_task_id_created_at",
+        "ix_executions_worker_id_created_at",
+        "ix_executions_status_created_at",
+    ),
+}
+
+
+def apply_schema_upgrades(engine: Engine) -> None:
+    import backend.models  # noqa — register every table on Base.metadata
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        postgresql = conn.dialect.name == "postgresql"
+        if postgresql:
+            conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": _UPGRADE_LOCK_KEY})
+        try:
+            _upgrade_tables(conn, postgresql)
+        finally:
+            if postgresql:
+                conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _UPGRADE_LOCK_KEY})
+
+
+def _upgrade_tables(conn, postgresql: bool) -> None:
+    # Inspected only once the lock is held, so it sees the previous holder's work
+    inspector = inspect(conn)
+    existing_tables = set(inspector.get_table_names())
+
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue  # create_all just built it, indexes included
+
+        columns = {col["name"] for col in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in columns:
+                continue
+            ddl = CreateColumn(column).compile(dialect=conn.dialect)
+            conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN IF NOT EXISTS {ddl}"))
+            logger.info(
+                "db.migrations.column_added",
+                extra={"table": table.name, "column": column.name},
+            )
+
+        indexes = {ix["name"] for ix in inspector.get_indexes(table.name)}
+        invalid = _invalid_indexes(conn, table.name) if postgresql else set()
+        for index in table.indexes:
+            if index.name in invalid:
+                conn.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{index.name}"'))
+                logger.warning(
+                    "db.migrations.invalid_index_dropped",
+                    extra={"table": table.name, "index": index.name},
+                )
+            elif index.name in indexes:
+                continue
+            _create_index(conn, index)
+            logger.info(
+                "db.migrations.index_created",
+                extra={"table": table.name, "index": index.name},
+            )
+
+        for name in _RETIRED_INDEXES.get(table.name, ()):
+            if name not in indexes and name not in invalid:
+                continue
+            concurrently = "CONCURRENTLY " if postgresql else ""
+            conn.execute(text(f'DROP INDEX {concurrently}IF EXISTS "{name}"'))
+            logger.info(
+                "db.migrations.index_retired",
+                extra={"table": table.name, "index": name},
+            )
+
+
+def _invalid_indexes(conn, table_name: str) -> set[str]:
+    # Left behind by a CREATE INDEX CONCURRENTLY that failed; never used
+    # by the planner, but still maintained on every write
+    rows = conn.execute(
+        text(
+            "SELECT c.relname FROM pg_index i"
+            " JOIN pg_class c ON c.oid = i.indexrelid"
+            " WHERE i.indrelid = to_regclass(:table) AND NOT i.indisvalid"
+        ),
+        {"table": table_name},
+    )
+    return set(rows.scalars())
+
+
+def _create_index(conn, index) -> None:
+    # CONCURRENTLY is toggled only for this statement, so later create_all
+    # calls (which run inside a transaction) keep emitting plain DDL
+    options = index.dialect_options["postgresql"]
+    previous = options.get("concurrently")
+    if conn.dialect.name == "postgresql":
+        options["concurrently"] = True
+    try:
+        conn.execute(CreateIndex(index, if_not_exists=True))
+    finally:
+        options["concurrently"] = previous
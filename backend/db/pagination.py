@@ -0,0 +1,69 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.exceptions import InvalidCursorError
+
+
+class Page:
+    # Plain class rather than a dataclass: FastAPI would deep-copy a
+    # dataclass (ORM rows included) via asdict() before validating it
+    __slots__ = ("items", "next_cursor")
+
+    def __init__(self, items: list, next_cursor: str | None = None):
+        self.items = items
+        self.next_cursor = next_cursor
+
+
+def encode_cursor(sort_value: datetime, row_id) -> str:
+    raw = json.dumps([sort_value.isoformat(), str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(sort_value), uuid.UUID(row_id)
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursorError("Invalid pagination cursor") from exc
+
+
+async def keyset_paginate(
+    db: AsyncSession,
+    stmt: Select,
+    *,
+    sort_column,
+    id_column,
+    cursor: str | None = None,
+    limit: int = 50,
+) -> Page:
+    """
+    Newest-first keyset pagination on `(sort_column, id_column)`.
+
+    Instead of OFFSET the next page starts strictly after the last row
+    seen, `WHERE (sort, id) < (:last_sort, :last_id)`, so every page costs
+    one index range scan no matter how deep it is.  The id breaks ties
+    between rows sharing a timestamp.  Cursors are opaque to clients.
+    """
+    if cursor is not None:
+        stmt = stmt.where(tuple_(sort_column, id_column) < decode_cursor(cursor))
+
+    result = await db.execute(
+        stmt.order_by(sort_column.desc(), id_column.desc()).limit(limit + 1)
+    )
+    rows = list(result.scalars().all())
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(
+            getattr(last, sort_column.key),
+            getattr(last, id_column.key),
+        )
+    return Page(items=rows, next_cursor=next_cursor)
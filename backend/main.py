@@ -3,6 +3,7 @@ from contextlib import asynccontextmanager
 
 from backend.db.session import async_engine, sync_engine
 from backend.db.base import Base
+from backend.db.migrations import apply_schema_upgrades
 
 # ensures Celery tasks are registered on startup
 import backend.queue.tasks  # noqa
@@ -12,8 +13,11 @@ from backend.api.routes.task import router as task_router
 from backend.api.routes.user import router as user_router
 from backend.api.routes.result import router as result_router
 from backend.api.routes.execution import router as execution_router
+from backend.api.routes.embedding import router as embedding_router
 
 from backend.queue.redis_client import init_redis, close_redis
+from backend.ml.providers.registry import close_providers
+from backend.ml.model_version_cache import get_model_version_cache
 from backend.monitoring.health import router as health_router
 from backend.monitoring.metrics import router as metrics_router
 
@@ -21,6 +25,7 @@ from backend.monitoring.metrics import router as metrics_router
 async def lifespan(app: FastAPI):
     # Startup
     Base.metadata.create_all(bind=sync_engine)
+    apply_schema_upgrades(sync_engine)
 
     await init_redis()
 
@@ -28,6 +33,8 @@ async def lifespan(app: FastAPI):
     yield
 
     # Shutdown
+    await close_providers()
+    await get_model_version_cache().close()
     await close_redis()
 
 
@@ -43,6 +50,7 @@ app.include_router(user_router)
 app.include_router(task_router)
 app.include_router(result_router)
 app.include_router(execution_router)
+app.include_router(embedding_router)
 
 # Monitoring
 app.include_router(health_router)
@@ -0,0 +1,146 @@
+import asyncio
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+from backend.core.config import settings
+from backend.ml.providers.base import EmbeddingRequest, EmbeddingResponse
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingEmbedding:
+    request: EmbeddingRequest
+    future: asyncio.Future
+
+
+@dataclass
+class _BatchQueue:
+    model_id: str
+    extra_params: dict
+    pending: list[_PendingEmbedding] = field(default_factory=list)
+    size: int = 0                       # total texts across pending requests
+    timer: asyncio.Task | None = None
+
+
+class EmbeddingBatcher:
+    """
+    Micro-batches concurrent embedding requests into one provider call.
+
+    Requests are queued per (model_id, extra_params).  A queue is flushed
+    when it reaches `max_batch_size` texts or when its oldest request has
+    waited `max_wait_ms`, whichever comes first.  The merged response is
+    sliced back so every caller receives an EmbeddingResponse covering
+    exactly its own texts, in order.
+
+    Usage:
+        batcher = EmbeddingBatcher(router.embed)
+        response = await batcher.embed(request)
+    """
+
+    def __init__(
+        self,
+        embed: Callable[[EmbeddingRequest], Awaitable[EmbeddingResponse]],
+        *,
+        max_batch_size: int | None = None,
+        max_wait_ms: int | None = None,
+    ):
+        self._embed = embed
+        self._max_batch_size = max_batch_size or settings.EMBEDDING_BATCH_MAX_SIZE
+        self._max_wait = (
+            max_wait_ms if max_wait_ms is not None else settings.EMBEDDING_BATCH_MAX_WAIT_MS
+        ) / 1000
+        self._queues: dict[tuple[str, str], _BatchQueue] = {}
+        self._dispatches: set[asyncio.Task] = set()   # strong refs until done
+
+    # ------------------------------------------------------------------ #
+    # Public interface                                                     #
+    # ------------------------------------------------------------------ #
+
+    async def embed(self, request: EmbeddingRequest) -> EmbeddingResponse:
+        # Oversized requests already fill a batch on their own
+        if len(request.texts) >= self._max_batch_size:
+            return await self._embed(request)
+
+        key = (request.model_id, json.dumps(request.extra_params, sort_keys=True, default=str))
+        queue = self._queues.get(key)
+
+        # Flush first rather than overshoot the provider's batch limit
+        if queue is not None and queue.size + len(request.texts) > self._max_batch_size:
+            self._flush_now(key)
+            queue = None
+
+        if queue is None:
+            queue = _BatchQueue(model_id=request.model_id, extra_params=request.extra_params)
+            self._queues[key] = queue
+            queue.timer = asyncio.create_task(self._flush_after_wait(key, queue))
+
+        future = asyncio.get_running_loop().create_future()
+        queue.pending.append(_PendingEmbedding(request=request, future=future))
+        queue.size += len(request.texts)
+
+        if queue.size >= self._max_batch_size:
+            self._flush_now(key)
+
+        return await future
+
+    # ------------------------------------------------------------------ #
+    # Flushing                                                             #
+    # ------------------------------------------------------------------ #
+
+    def _flush_now(self, key: tuple[str, str]) -> None:
+        queue = self._queues.pop(key)
+        if queue.timer is not None:
+            queue.timer.cancel()
+        task = asyncio.create_task(self._dispatch(queue))
+        self._dispatches.add(task)
+        task.add_done_callback(self._dispatches.discard)
+
+    async def _flush_after_wait(self, key: tuple[str, str], queue: _BatchQueue) -> None:
+        await asyncio.sleep(self._max_wait)
+        if self._queues.get(key) is queue:
+            del self._queues[key]
+            await self._dispatch(queue)
+
+    async def _dispatch(self, queue: _BatchQueue) -> None:
+        texts = [text for item in queue.pending for text in item.request.texts]
+        merged = EmbeddingRequest(
+            texts=texts,
+            model_id=queue.model_id,
+            extra_params=queue.extra_params,
+        )
+
+        try:
+            response = await self._embed(merged)
+            if len(response.embeddings) != len(texts):
+                raise ValueError(
+                    f"Provider returned {len(response.embeddings)} embeddings "
+                    f"for {len(texts)} texts."
+                )
+        except Exception as exc:
+            for item in queue.pending:
+                if not item.future.done():
+                    item.future.set_exception(exc)
+            return
+
+        logger.debug(
+            "embedding_batcher.flush",
+            extra={"model_id": queue.model_id, "requests": len(queue.pending), "texts": len(texts)},
+        )
+
+        offset = 0
+        for item in queue.pending:
+            count = len(item.request.texts)
+            if not item.future.done():
+                item.future.set_result(
+                    EmbeddingResponse(
+                        embeddings=response.embeddings[offset:offset + count],
+                        model_id=response.model_id,
+                        provider=response.provider,
+                        token_count=response.token_count * count // len(texts),
+                        latency_ms=response.latency_ms,
+                    )
+                )
+            offset += count
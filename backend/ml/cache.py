@@ -0,0 +1,195 @@
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, replace
+
+from backend.core.config import settings
+from backend.ml.providers.base import CompletionRequest, CompletionResponse
+from backend.queue.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+CACHE_PROVIDER_NAME = "cache"
+
+_KEY_PREFIX = "taskforge:completion:"
+METRICS_KEY = "taskforge:metrics:completion_cache"
+
+
+# ------------------------------------------------------------------ #
+# Policy                                                               #
+# ------------------------------------------------------------------ #
+
+@dataclass
+class CachePolicy:
+    """
+    Per-model-version caching rules.  Read from `ModelVersion.config["cache"]`:
+
+        {"cache": {"enabled": true, "ttl_seconds": 600, "temperature_zero_only": true}}
+
+    Missing keys fall back to the global settings; caching is only ever
+    active when COMPLETION_CACHE_ENABLED is set.
+    """
+
+    enabled: bool = True
+    ttl_seconds: int = 3600
+    temperature_zero_only: bool = True
+
+    @classmethod
+    def from_model_version(cls, model_version) -> "CachePolicy":
+        config = (getattr(model_version, "config", None) or {}).get("cache", {})
+        return cls(
+            enabled=settings.COMPLETION_CACHE_ENABLED and config.get("enabled", True),
+            ttl_seconds=config.get("ttl_seconds", settings.COMPLETION_CACHE_TTL_SECONDS),
+            temperature_zero_only=config.get("temperature_zero_only", True),
+        )
+
+    def allows(self, request: CompletionRequest) -> bool:
+        if not self.enabled or self.ttl_seconds <= 0:
+            return False
+        if self.temperature_zero_only and request.temperature != 0:
+            return False
+        return True
+
+
+def request_hash(request) -> str:
+    """Canonical content hash of a request dataclass — equal requests, equal hash."""
+    canonical = json.dumps(asdict(request), sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def cache_key(request: CompletionRequest) -> str:
+    return _KEY_PREFIX + request_hash(request)
+
+
+# ------------------------------------------------------------------ #
+# Two-tier cache                                                       #
+# ------------------------------------------------------------------ #
+
+class CompletionCache:
+    """
+    In-process LRU in front of Redis.
+
+    Lookups hit the LRU first, then Redis (which back-fills the LRU).
+    Entries expire by TTL in both tiers; the LRU also evicts least-recently
+    used entries past `max_entries`.  Redis failures degrade to a miss —
+    the cache must never fail an inference.
+    """
+
+    def __init__(self, max_entries: int | None = None):
+        self._max_entries = max_entries or settings.COMPLETION_CACHE_MAX_ENTRIES
+        self._entries: OrderedDict[str, tuple[float, CompletionResponse]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, request: CompletionRequest) -> CompletionResponse | None:
+        t0 = time.monotonic()
+        key = cache_key(request)
+
+        response = self._get_local(key)
+        if response is None:
+            response = await self._get_remote(key)
+
+        await self._record("hits" if response else "misses")
+        if response is None:
+            return None
+
+        return replace(
+            response,
+            provider=CACHE_PROVIDER_NAME,
+            latency_ms=(time.monotonic() - t0) * 1000,
+        )
+
+    async def set(
+        self,
+        request: CompletionRequest,
+        response: CompletionResponse,
+        ttl_seconds: int,
+    ) -> None:
+        key = cache_key(request)
+        self._set_local(key, response, ttl_seconds)
+
+        try:
+            await get_redis().set(key, json.dumps(asdict(response)), ex=ttl_seconds)
+        except Exception as exc:
+            logger.warning("completion_cache.redis.set_failed", extra={"error": str(exc)})
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    # ------------------------------------------------------------------ #
+    # Internal helpers                                                     #
+    # ------------------------------------------------------------------ #
+
+    def _get_local(self, key: str) -> CompletionResponse | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, response = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return response
+
+    def _set_local(self, key: str, response: CompletionResponse, ttl_seconds: int) -> None:
+        self._entries[key] = (time.monotonic() + ttl_seconds, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    async def _get_remote(self, key: str) -> CompletionResponse | None:
+        try:
+            async with get_redis().pipeline(transaction=False) as pipe:
+                pipe.get(key)
+                pipe.ttl(key)
+                raw, ttl = await pipe.execute()
+        except Exception as exc:
+            logger.warning("completion_cache.redis.get_failed", extra={"error": str(exc)})
+            return None
+
+        if raw is None:
+            return None
+
+        try:
+            response = CompletionResponse(**json.loads(raw))
+        except (ValueError, TypeError) as exc:
+            # Corrupt or written by an incompatible version — a miss; the
+            # provider call that follows overwrites the entry
+            logger.warning(
+                "completion_cache.redis.decode_failed",
+                extra={"key": key, "error": str(exc)},
+            )
+            return None
+        if ttl and ttl > 0:
+            self._set_local(key, response, ttl)
+        return response
+
+    async def _record(self, outcome: str) -> None:
+        if outcome == "hits":
+            self.hits += 1
+        else:
+            self.misses += 1
+
+        # Aggregated across workers for /metrics
+        try:
+            await get_redis().hincrby(METRICS_KEY, outcome, 1)
+        except Exception as exc:
+            logger.warning(
+                "completion_cache.redis.metrics_failed",
+                extra={"outcome": outcome, "error": str(exc)},
+            )
+
+
+# Process-wide instance — the LRU tier is shared by every ModelService.
+_cache: CompletionCache | None = None
+
+
+def get_completion_cache() -> CompletionCache:
+    global _cache
+    if _cache is None:
+        _cache = CompletionCache()
+    return _cache
@@ -0,0 +1,272 @@
+import asyncio
+import logging
+import time
+
+from backend.core.config import settings
+from backend.core.enums import CircuitState
+from backend.queue.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "taskforge:circuit:"
+
+# KEYS[1] = state hash, KEYS[2] = current window bucket, KEYS[3..] = older buckets
+# ARGV    = now, ok, slow, latency_ms, bucket_ttl, min_calls, error_rate,
+#           slow_rate, half_open_successes
+#
+# Records one call outcome and applies the transition it causes, atomically,
+# so every worker process sees the same breaker.  Returns the new state.
+_RECORD_SCRIPT = """
+local state = redis.call("HGET", KEYS[1], "state") or "closed"
+local ok = ARGV[2] == "1"
+
+redis.call("HINCRBY", KEYS[2], "calls", 1)
+if not ok then redis.call("HINCRBY", KEYS[2], "errors", 1) end
+if ARGV[3] == "1" then redis.call("HINCRBY", KEYS[2], "slow", 1) end
+redis.call("HINCRBY", KEYS[2], "latency_ms", ARGV[4])
+redis.call("EXPIRE", KEYS[2], ARGV[5])
+
+if state == "open" then
+    return state            -- late result from a call started before tripping
+end
+
+if state == "half_open" then
+    if not ok then
+        redis.call("HSET", KEYS[1], "state", "open", "opened_at", ARGV[1], "trial_successes", 0)
+        return "open"
+    end
+    if redis.call("HINCRBY", KEYS[1], "trial_successes", 1) >= tonumber(ARGV[9]) then
+        redis.call("HSET", KEYS[1], "state", "closed", "trial_successes", 0)
+        for i = 2, #KEYS do redis.call("DEL", KEYS[i]) end   -- forget the outage
+        return "closed"
+    end
+    return state
+end
+
+local calls, errors, slow = 0, 0, 0
+for i = 2, #KEYS do
+    local v = redis.call("HMGET", KEYS[i], "calls", "errors", "slow")
+    calls = calls + (tonumber(v[1]) or 0)
+    errors = errors + (tonumber(v[2]) or 0)
+    slow = slow + (tonumber(v[3]) or 0)
+end
+
+if calls >= tonumber(ARGV[6])
+    and (errors / calls >= tonumber(ARGV[7]) or slow / calls >= tonumber(ARGV[8])) then
+    redis.call("HSET", KEYS[1], "state", "open", "opened_at", ARGV[1], "trial_successes", 0)
+    return "open"
+end
+return "closed"
+"""
+
+# KEYS[1] = state hash; ARGV = now, probe_ok
+# Only an OPEN breaker is moved by a probe result.
+_PROBE_RESULT_SCRIPT = """
+if redis.call("HGET", KEYS[1], "state") ~= "open" then
+    return 0
+end
+if ARGV[2] == "1" then
+    redis.call("HSET", KEYS[1], "state", "half_open", "trial_successes", 0)
+else
+    redis.call("HSET", KEYS[1], "opened_at", ARGV[1])
+end
+return 1
+"""
+
+
+class CircuitBreaker:
+    """
+    Per-provider circuit breaker shared by every process through Redis.
+
+    CLOSED     — calls go through; outcomes land in a rolling window of
+                 time buckets.  Once the window holds at least
+                 CIRCUIT_BREAKER_MIN_CALLS calls and either the error rate or
+                 the slow-call rate crosses its threshold, the breaker opens.
+    OPEN       — the router skips the provider immediately.  After the
+                 cooldown one process (Redis lock) probes it in the
+                 background; a successful probe moves it to HALF_OPEN.
+    HALF_OPEN  — live traffic is let through again; the first failure
+                 re-opens it, CIRCUIT_BREAKER_HALF_OPEN_SUCCESSES successes
+                 close it and clear the window.
+
+    State reads are cached per process for CIRCUIT_BREAKER_STATE_CACHE_SECONDS
+    so the hot path rarely touches Redis.  Redis being unavailable never
+    blocks a provider — the breaker then behaves as CLOSED.
+
+    Usage:
+        if await breaker.allow(provider):
+            ...
+            await breaker.record(provider, model_id=..., ok=True, seconds=1.2)
+    """
+
+    def __init__(self):
+        self._cached: dict[str, tuple[float, CircuitState, float]] = {}
+        self._probes: dict[str, asyncio.Task] = {}
+        self._probe_models: dict[str, str] = {}
+
+    # ------------------------------------------------------------------ #
+    # Public interface                                                     #
+    # ------------------------------------------------------------------ #
+
+    async def allow(self, provider) -> bool:
+        if not settings.CIRCUIT_BREAKER_ENABLED:
+            return True
+
+        name = provider.provider_name
+        state, opened_at = await self._get_state(name)
+        if state != CircuitState.OPEN:
+            return True
+
+        if time.time() - opened_at >= settings.CIRCUIT_BREAKER_COOLDOWN_SECONDS:
+            self._schedule_probe(provider)
+        return False
+
+    async def record(self, provider, *, model_id: str, ok: bool, seconds: float) -> None:
+        if not settings.CIRCUIT_BREAKER_ENABLED:
+            return
+
+        name = provider.provider_name
+        self._probe_models[name] = model_id
+        now = time.time()
+        try:
+            state = await get_redis().eval(
+                _RECORD_SCRIPT,
+                1 + len(self._bucket_keys(name, now)),
+                _state_key(name),
+                *self._bucket_keys(name, now),
+                now,
+                1 if ok else 0,
+                1 if seconds >= settings.CIRCUIT_BREAKER_SLOW_CALL_SECONDS else 0,
+                int(seconds * 1000),
+                settings.CIRCUIT_BREAKER_WINDOW_SECONDS + settings.CIRCUIT_BREAKER_BUCKET_SECONDS,
+                settings.CIRCUIT_BREAKER_MIN_CALLS,
+                settings.CIRCUIT_BREAKER_ERROR_RATE,
+                settings.CIRCUIT_BREAKER_SLOW_CALL_RATE,
+                settings.CIRCUIT_BREAKER_HALF_OPEN_SUCCESSES,
+            )
+        except Exception as exc:
+            logger.warning("circuit_breaker.redis.record_failed", extra={"provider": name, "error": str(exc)})
+            return
+
+        state = CircuitState(state)
+        previous = self._cached.get(name, (0.0, CircuitState.CLOSED, 0.0))[1]
+        self._cached[name] = (time.monotonic(), state, now if state == CircuitState.OPEN else 0.0)
+        if state != previous:
+            logger.warning(
+                "circuit_breaker.transition",
+                extra={"provider": name, "from": previous.value, "to": state.value},
+            )
+
+    async def snapshot(self, provider_names: list[str]) -> dict:
+        """Breaker state plus rolling-window health per provider (health endpoint)."""
+        now = time.time()
+        async with get_redis().pipeline(transaction=False) as pipe:
+            for name in provider_names:
+                pipe.hgetall(_state_key(name))
+                for key in self._bucket_keys(name, now):
+                    pipe.hmget(key, "calls", "errors", "slow", "latency_ms")
+            rows = await pipe.execute()
+
+        per_provider = 1 + self._bucket_count()
+        result = {}
+        for i, name in enumerate(provider_names):
+            state = rows[i * per_provider] or {}
+            calls = errors = slow = latency_ms = 0
+            for bucket in rows[i * per_provider + 1:(i + 1) * per_provider]:
+                c, e, s, l = (int(v or 0) for v in bucket)
+                calls, errors, slow, latency_ms = calls + c, errors + e, slow + s, latency_ms + l
+
+            error_rate = errors / calls if calls else 0.0
+            slow_rate = slow / calls if calls else 0.0
+            result[name] = {
+                "state": state.get("state", CircuitState.CLOSED.value),
+                "calls": calls,
+                "error_rate": round(error_rate, 4),
+                "slow_rate": round(slow_rate, 4),
+                "avg_latency_ms": round(latency_ms / calls, 1) if calls else None,
+                # 1.0 = no errors, no slow calls in the window
+                "health_score": round((1 - error_rate) * (1 - slow_rate), 4),
+            }
+        return result
+
+    # ------------------------------------------------------------------ #
+    # Internal helpers                                                     #
+    # ------------------------------------------------------------------ #
+
+    async def _get_state(self, name: str) -> tuple[CircuitState, float]:
+        cached = self._cached.get(name)
+        if cached and time.monotonic() - cached[0] < settings.CIRCUIT_BREAKER_STATE_CACHE_SECONDS:
+            return cached[1], cached[2]
+
+        try:
+            fields = await get_redis().hmget(_state_key(name), "state", "opened_at")
+        except Exception as exc:
+            logger.warning("circuit_breaker.redis.read_failed", extra={"provider": name, "error": str(exc)})
+            return CircuitState.CLOSED, 0.0
+
+        state = CircuitState(fields[0]) if fields[0] else CircuitState.CLOSED
+        opened_at = float(fields[1] or 0.0)
+        self._cached[name] = (time.monotonic(), state, opened_at)
+        return state, opened_at
+
+    def _schedule_probe(self, provider) -> None:
+        name = provider.provider_name
+        running = self._probes.get(name)
+        if running is not None and not running.done():
+            return
+        self._probes[name] = asyncio.create_task(self._probe(provider))
+
+    async def _probe(self, provider) -> None:
+        name = provider.provider_name
+        redis = get_redis()
+        # One prober across all processes per cooldown period
+        lock_key = f"{_KEY_PREFIX}{name}:probe"
+        try:
+            if not await redis.set(lock_key, "1", nx=True, ex=int(settings.CIRCUIT_BREAKER_COOLDOWN_SECONDS) or 1):
+                return
+        except Exception:
+            return
+
+        model_id = self._probe_models.get(name)
+        t0 = time.perf_counter()
+        try:
+            await provider.probe(model_id)
+            ok = True
+        except Exception as exc:
+            ok = False
+            logger.info("circuit_breaker.probe.failed", extra={"provider": name, "error": str(exc)})
+
+        try:
+            await redis.eval(_PROBE_RESULT_SCRIPT, 1, _state_key(name), time.time(), 1 if ok else 0)
+        except Exception as exc:
+            logger.warning("circuit_breaker.redis.probe_failed", extra={"provider": name, "error": str(exc)})
+            return
+
+        self._cached.pop(name, None)
+        logger.info(
+            "circuit_breaker.probe.done",
+            extra={"provider": name, "ok": ok, "latency_ms": round((time.perf_counter() - t0) * 1000, 1)},
+        )
+
+    def _bucket_count(self) -> int:
+        return max(settings.CIRCUIT_BREAKER_WINDOW_SECONDS // settings.CIRCUIT_BREAKER_BUCKET_SECONDS, 1)
+
+    def _bucket_keys(self, name: str, now: float) -> list[str]:
+        # Current bucket first — the record script writes to KEYS[2]
+        current = int(now // settings.CIRCUIT_BREAKER_BUCKET_SECONDS)
+        return [f"{_KEY_PREFIX}{name}:w:{current - i}" for i in range(self._bucket_count())]
+
+
+def _state_key(name: str) -> str:
+    return f"{_KEY_PREFIX}{name}"
+
+
+# Process-wide instance — shares the cached state and probe tasks.
+_breaker: CircuitBreaker | None = None
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    global _breaker
+    if _breaker is None:
+        _breaker = CircuitBreaker()
+    return _breaker
@@ -0,0 +1,215 @@
+import asyncio
+import json
+import logging
+import uuid
+from typing import Any, Awaitable, Callable, TypeVar
+
+from backend.core.config import settings
+from backend.queue.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_KEY_PREFIX = "taskforge:coalesce:"
+_RESULT_TTL_SECONDS = 5     # Only needs to cover the subscribe/publish race
+
+# Compare-and-delete so a leader never releases a lock it no longer owns.
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class RequestCoalescer:
+    """
+    Single-flight execution for identical provider requests.
+
+    The first caller for a key becomes the leader and runs `call()`; every
+    concurrent caller with the same key awaits the leader's future instead
+    of issuing its own HTTP request.  Exceptions are shared the same way.
+
+    With `distributed=True` the leader additionally takes a Redis lock, and
+    followers in *other* worker processes subscribe to a pub/sub channel and
+    receive the leader's encoded result.  Anything going wrong on the Redis
+    side (no lock holder result, timeout, connection error) makes the
+    follower fall back to running `call()` itself — coalescing only ever
+    saves work, it never fails a request.
+
+    Usage:
+        result = await coalescer.run(key, lambda: provider.complete(request))
+    """
+
+    def __init__(
+        self,
+        *,
+        distributed: bool | None = None,
+        wait_seconds: float | None = None,
+    ):
+        self._distributed = (
+            settings.REQUEST_COALESCING_DISTRIBUTED if distributed is None else distributed
+        )
+        self._wait_seconds = wait_seconds or settings.REQUEST_COALESCING_WAIT_SECONDS
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.coalesced = 0
+
+    # ------------------------------------------------------------------ #
+    # Public interface                                                     #
+    # ------------------------------------------------------------------ #
+
+    async def run(
+        self,
+        key: str,
+        call: Callable[[], Awaitable[T]],
+        *,
+        encode: Callable[[T], Any] | None = None,
+        decode: Callable[[Any], T] | None = None,
+    ) -> T:
+        """
+        `encode`/`decode` convert the result to and from JSON-safe data and
+        are only needed for cross-process coalescing.
+        """
+        if not settings.REQUEST_COALESCING_ENABLED:
+            return await call()
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # Leader was cancelled — take over rather than fail
+                return await self.run(key, call, encode=encode, decode=decode)
+
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(_consume_result)
+        self._inflight[key] = future
+
+        try:
+            if self._distributed and encode is not None and decode is not None:
+                result = await self._run_distributed(key, call, encode, decode)
+            else:
+                result = await call()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+    # ------------------------------------------------------------------ #
+    # Cross-process coalescing                                             #
+    # ------------------------------------------------------------------ #
+
+    async def _run_distributed(self, key, call, encode, decode):
+        lock_key = f"{_KEY_PREFIX}lock:{key}"
+        result_key = f"{_KEY_PREFIX}result:{key}"
+        channel = f"{_KEY_PREFIX}done:{key}"
+        token = uuid.uuid4().hex
+
+        try:
+            redis = get_redis()
+            is_leader = await redis.set(
+                lock_key, token, nx=True, ex=int(self._wait_seconds) + 1
+            )
+        except Exception as exc:
+            logger.warning("coalescer.redis.unavailable", extra={"error": str(exc)})
+            return await call()
+
+        if is_leader:
+            return await self._lead(redis, call, encode, lock_key, result_key, channel, token)
+
+        raw = await self._follow(redis, result_key, channel)
+        if raw is not None:
+            message = json.loads(raw)
+            if message.get("ok"):
+                self.coalesced += 1
+                return decode(message["value"])
+
+        return await call()
+
+    async def _lead(self, redis, call, encode, lock_key, result_key, channel, token):
+        try:
+            result = await call()
+        except Exception:
+            await self._publish(redis, result_key, channel, json.dumps({"ok": False}))
+            raise
+        finally:
+            try:
+                await redis.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+            except Exception as exc:
+                logger.warning("coalescer.redis.release_failed", extra={"error": str(exc)})
+
+        await self._publish(
+            redis, result_key, channel, json.dumps({"ok": True, "value": encode(result)})
+        )
+        return result
+
+    async def _follow(self, redis, result_key: str, channel: str) -> str | None:
+        pubsub = redis.pubsub()
+        try:
+            await pubsub.subscribe(channel)
+
+            # The leader may have finished before we subscribed
+            raw = await redis.get(result_key)
+            if raw is not None:
+                return raw
+
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self._wait_seconds
+            while (remaining := deadline - loop.time()) > 0:
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=remaining
+                )
+                if message is not None:
+                    return message["data"]
+
+            logger.warning("coalescer.follower.timeout", extra={"channel": channel})
+            return None
+
+        except Exception as exc:
+            logger.warning("coalescer.redis.follow_failed", extra={"error": str(exc)})
+            return None
+
+        finally:
+            try:
+                await pubsub.unsubscribe(channel)
+                await pubsub.aclose()
+            except Exception:
+                pass
+
+    @staticmethod
+    async def _publish(redis, result_key: str, channel: str, payload: str) -> None:
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.set(result_key, payload, ex=_RESULT_TTL_SECONDS)
+                pipe.publish(channel, payload)
+                await pipe.execute()
+        except Exception as exc:
+            logger.warning("coalescer.redis.publish_failed", extra={"error": str(exc)})
+
+
+def _consume_result(future: asyncio.Future) -> None:
+    # Mark the exception as retrieved when no follower awaited it
+    if not future.cancelled():
+        future.exception()
+
+
+# Process-wide instance — in-flight requests are deduped across all callers.
+_coalescer: RequestCoalescer | None = None
+
+
+def get_request_coalescer() -> RequestCoalescer:
+    global _coalescer
+    if _coalescer is None:
+        _coalescer = RequestCoalescer()
+    return _coalescer
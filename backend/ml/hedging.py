@@ -0,0 +1,110 @@
+import logging
+import math
+from collections import deque
+from dataclasses import dataclass
+
+from backend.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# ------------------------------------------------------------------ #
+# Policy                                                               #
+# ------------------------------------------------------------------ #
+
+@dataclass
+class HedgePolicy:
+    """
+    Per-model-version hedging rules.  Read from `ModelVersion.config["hedge"]`:
+
+        {"hedge": {"enabled": true, "percentile": 95, "budget_ratio": 0.05}}
+
+    Missing keys fall back to the global settings; hedging is only ever
+    active when HEDGING_ENABLED is set.  `budget_key` scopes the hedge
+    budget (the model version id).
+    """
+
+    enabled: bool = False
+    percentile: float = 95.0
+    budget_ratio: float = 0.1
+    budget_key: str = ""
+
+    @classmethod
+    def from_model_version(cls, model_version) -> "HedgePolicy":
+        config = (getattr(model_version, "config", None) or {}).get("hedge", {})
+        return cls(
+            enabled=settings.HEDGING_ENABLED and config.get("enabled", True),
+            percentile=config.get("percentile", settings.HEDGE_LATENCY_PERCENTILE),
+            budget_ratio=config.get("budget_ratio", settings.HEDGE_BUDGET_RATIO),
+            budget_key=str(model_version.id),
+        )
+
+
+# ------------------------------------------------------------------ #
+# Controller                                                           #
+# ------------------------------------------------------------------ #
+
+class HedgeController:
+    """
+    Decides when ProviderRouter fires a hedge and whether it may.
+
+    Delay — the policy's percentile of the primary's recent successful
+    latencies for that model (a rolling window per provider/model, kept in
+    process).  Primaries cancelled because their hedge won are recorded
+    with their elapsed time, a lower bound, so the slow tail stays in the
+    window.  Until HEDGE_MIN_SAMPLES are collected HEDGE_DEFAULT_DELAY_MS
+    is used.
+
+    Budget — a token bucket per model version: every hedge-eligible request
+    adds `budget_ratio` tokens (capped at HEDGE_BUDGET_BURST), every hedge
+    spends one.  Hedged requests therefore stay below `budget_ratio` of the
+    traffic plus a small burst, so hedging can at most add that share to
+    provider cost.  Buckets are per process, which bounds the ratio
+    globally as well.
+    """
+
+    def __init__(self):
+        self._latencies: dict[tuple[str, str], deque[float]] = {}
+        self._tokens: dict[str, float] = {}
+
+    def observe(self, provider_name: str, model_id: str, seconds: float) -> None:
+        window = self._latencies.get((provider_name, model_id))
+        if window is None:
+            window = deque(maxlen=settings.HEDGE_LATENCY_WINDOW)
+            self._latencies[(provider_name, model_id)] = window
+        window.append(seconds)
+
+    def delay_seconds(self, provider_name: str, model_id: str, percentile: float) -> float:
+        window = self._latencies.get((provider_name, model_id))
+        if window is None or len(window) < settings.HEDGE_MIN_SAMPLES:
+            return settings.HEDGE_DEFAULT_DELAY_MS / 1000
+
+        ordered = sorted(window)
+        rank = min(math.ceil(percentile / 100 * len(ordered)) - 1, len(ordered) - 1)
+        return ordered[max(rank, 0)]
+
+    def credit(self, policy: HedgePolicy) -> None:
+        """Called once per hedge-eligible request."""
+        tokens = self._tokens.get(policy.budget_key, float(settings.HEDGE_BUDGET_BURST))
+        self._tokens[policy.budget_key] = min(
+            tokens + policy.budget_ratio, float(settings.HEDGE_BUDGET_BURST)
+        )
+
+    def try_spend(self, policy: HedgePolicy) -> bool:
+        tokens = self._tokens.get(policy.budget_key, float(settings.HEDGE_BUDGET_BURST))
+        if tokens < 1:
+            logger.info("hedge.budget_exhausted", extra={"budget_key": policy.budget_key})
+            return False
+        self._tokens[policy.budget_key] = tokens - 1
+        return True
+
+
+# Process-wide instance — latency windows and budgets are shared by every router.
+_controller: HedgeController | None = None
+
+
+def get_hedge_controller() -> HedgeController:
+    global _controller
+    if _controller is None:
+        _controller = HedgeController()
+    return _controller
@@ -0,0 +1,167 @@
+import json
+import logging
+import time
+from typing import Awaitable, Callable
+
+import sqlalchemy as sa
+
+from backend.core.config import settings
+from backend.models.model_version import ModelVersion
+from backend.queue.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "taskforge:model-versions:invalidate"
+_RESUBSCRIBE_BACKOFF_SECONDS = 5.0
+
+Loader = Callable[[], Awaitable[ModelVersion | None]]
+
+
+class ModelVersionCache:
+    """
+    Process-local cache of ModelVersion rows for `ModelService._resolve_model`.
+
+    Rows are cached by id and as the default for a task type, each for
+    MODEL_VERSION_CACHE_TTL_SECONDS.  The table changes rarely, so any write
+    (`ModelVersionRepository.deactivate`, future admin endpoints) calls
+    `publish_model_version_invalidation()`, and every process drops its whole
+    cache when it sees the message — a changed row can also move the default
+    of its task type.
+
+    Invalidations are read from a Redis pub/sub subscription before each
+    lookup with a non-blocking poll, so no background listener is needed:
+    that also holds for prefork workers, whose event loop only runs while a
+    task does.  If the subscription breaks the cache is cleared and
+    re-subscribed later; while Redis is unavailable only the TTL bounds
+    staleness.
+
+    Cached rows are transient copies, never attached to a session — treat
+    them as read-only.  Misses are not cached.
+    """
+
+    def __init__(self):
+        self._by_id: dict[str, tuple[float, ModelVersion]] = {}
+        self._defaults: dict[str, tuple[float, ModelVersion]] = {}
+        # Bumped on every invalidation; a load that started before one is not stored
+        self._generation = 0
+        self._pubsub = None
+        self._polling = False
+        self._subscribe_after = 0.0
+
+    # ------------------------------------------------------------------ #
+    # Public interface                                                     #
+    # ------------------------------------------------------------------ #
+
+    async def get_by_id(self, model_version_id: str, load: Loader) -> ModelVersion | None:
+        return await self._get(self._by_id, str(model_version_id), load)
+
+    async def get_default(self, task_type: str, load: Loader) -> ModelVersion | None:
+        return await self._get(self._defaults, str(task_type), load)
+
+    def clear(self) -> None:
+        self._by_id.clear()
+        self._defaults.clear()
+        self._generation += 1
+
+    async def close(self) -> None:
+        await self._unsubscribe()
+        self.clear()
+
+    # ------------------------------------------------------------------ #
+    # Internal helpers                                                     #
+    # ------------------------------------------------------------------ #
+
+    async def _get(self, entries: dict, key: str, load: Loader) -> ModelVersion | None:
+        if not settings.MODEL_VERSION_CACHE_ENABLED:
+            return await load()
+
+        await self._poll_invalidations()
+
+        entry = entries.get(key)
+        if entry is not None:
+            expires_at, model_version = entry
+            if expires_at > time.monotonic():
+                return model_version
+            del entries[key]
+
+        generation = self._generation
+        model_version = await load()
+        if model_version is None:
+            return None
+
+        cached = _detached_copy(model_version)
+        if generation == self._generation:
+            expires_at = time.monotonic() + settings.MODEL_VERSION_CACHE_TTL_SECONDS
+            entries[key] = (expires_at, cached)
+            self._by_id[str(cached.id)] = (expires_at, cached)
+        return cached
+
+    async def _poll_invalidations(self) -> None:
+        # One reader per connection; concurrent lookups skip the poll
+        if self._polling:
+            return
+        self._polling = True
+        try:
+            if self._pubsub is None:
+                if time.monotonic() < self._subscribe_after:
+                    return
+                pubsub = get_redis().pubsub()
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                self._pubsub = pubsub
+                # Anything cached before subscribing may have missed a message
+                self.clear()
+
+            while True:
+                message = await self._pubsub.get_message(timeout=0)
+                if message is None:
+                    return
+                if message["type"] == "message":
+                    self.clear()
+                    logger.info("model_version_cache.invalidated", extra={"payload": message["data"]})
+        except Exception as exc:
+            logger.warning("model_version_cache.subscription_failed", extra={"error": str(exc)})
+            if self._pubsub is not None:
+                self.clear()    # messages may have been lost with the connection
+            await self._unsubscribe()
+            self._subscribe_after = time.monotonic() + _RESUBSCRIBE_BACKOFF_SECONDS
+        finally:
+            self._polling = False
+
+    async def _unsubscribe(self) -> None:
+        pubsub, self._pubsub = self._pubsub, None
+        if pubsub is None:
+            return
+        try:
+            await pubsub.aclose()
+        except Exception:
+            pass
+
+
+def _detached_copy(model_version: ModelVersion) -> ModelVersion:
+    # Column values only — safe to share across sessions and coroutines
+    return ModelVersion(**{
+        attr.key: getattr(model_version, attr.key)
+        for attr in sa.inspect(ModelVersion).column_attrs
+    })
+
+
+async def publish_model_version_invalidation(model_version_id: str | None = None) -> None:
+    """Tell every process to drop its cached ModelVersions.  Never raises."""
+    try:
+        await get_redis().publish(
+            INVALIDATION_CHANNEL,
+            json.dumps({"model_version_id": str(model_version_id) if model_version_id else None}),
+        )
+    except Exception as exc:
+        logger.warning("model_version_cache.publish_failed", extra={"error": str(exc)})
+
+
+# Process-wide instance — shared by every ModelService.
+_cache: ModelVersionCache | None = None
+
+
+def get_model_version_cache() -> ModelVersionCache:
+    global _cache
+    if _cache is None:
+        _cache = ModelVersionCache()
+    return _cache
@@ -1,6 +1,10 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator
 from core.exceptions import AllProvidersFailedError
+from backend.ml.vectors import EmbeddingMatrix
 
 # ------------------------------------------------------------------ #
 # Provider I/O contracts                                              #
@@ -26,6 +30,16 @@ class CompletionResponse:
     latency_ms: float
 
 
+@dataclass
+class CompletionChunk:
+    text: str                           # incremental text (may be empty)
+    model_id: str
+    provider: str
+    finish_reason: str | None = None
+    prompt_tokens: int = 0              # usually only set on the final chunk
+    completion_tokens: int = 0
+
+
 @dataclass
 class EmbeddingRequest:
     texts: list[str]
@@ -35,7 +49,9 @@ class EmbeddingRequest:
 
 @dataclass
 class EmbeddingResponse:
-    embeddings: list[list[float]]
+    # Nested lists, or a compact float32 EmbeddingMatrix (same read API,
+    # call .tolist() where plain lists are required)
+    embeddings: list[list[float]] | EmbeddingMatrix
     model_id: str
     provider: str
     token_count: int
@@ -63,6 +79,22 @@ class BaseProvider(ABC):
         """
         ...
 
+    async def stream_complete(self, request: CompletionRequest) -> AsyncIterator[CompletionChunk]:
+        """
+        Stream a completion as incremental chunks.
+        Providers without native streaming yield the full completion as a
+        single chunk.  Must raise ProviderError on any API or network failure.
+        """
+        response = await self.complete(request)
+        yield CompletionChunk(
+            text=response.text,
+            model_id=response.model_id,
+            provider=response.provider,
+            finish_reason="stop",
+            prompt_tokens=response.prompt_tokens,
+            completion_tokens=response.completion_tokens,
+        )
+
     @abstractmethod
     async def embed(self, request: EmbeddingRequest) -> EmbeddingResponse:
         """
@@ -79,6 +111,25 @@ class BaseProvider(ABC):
         """
         ...
 
+    async def probe(self, model_id: str | None) -> None:
+        """
+        Cheap end-to-end liveness check used by the circuit breaker while the
+        provider is open: a one-token completion against `model_id` (the
+        last model routed to this provider).  Must raise on failure.
+        """
+        if model_id is None:
+            return   # nothing routed here yet — let half-open trial traffic decide
+        await self.complete(
+            CompletionRequest(prompt="ping", model_id=model_id, max_tokens=1, temperature=0)
+        )
+
+    async def aclose(self) -> None:
+        """
+        Release network resources (HTTP connection pools).
+        Providers without persistent clients can keep this no-op.
+        """
+        return None
+
 
 # ------------------------------------------------------------------ #
 # Provider-level exceptions                                           #
@@ -96,7 +147,31 @@ class ProviderAuthError(ProviderError):
 
 
 class ProviderRateLimitError(ProviderError):
-    """Provider is rate-limiting this account."""
+    """
+    Provider is rate-limiting this account (or our own limiter has no
+    capacity).  `retry_after` is the server's hint in seconds, if any.
+    """
+    def __init__(self, provider: str, message: str, *, retry_after: float | None = None):
+        self.retry_after = retry_after
+        super().__init__(provider, message)
+
+
+def parse_retry_after(headers) -> float | None:
+    """Seconds from a `Retry-After` header (delta-seconds or HTTP date)."""
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
 
 
 class ProviderTimeoutError(ProviderError):
@@ -12,7 +12,10 @@ from backend.ml.providers.base import (
     ProviderRateLimitError,
     ProviderTimeoutError,
     ProviderUnavailableError,
+    parse_retry_after,
 )
+from backend.ml.providers.registry import build_http_client
+from backend.ml.vectors import EmbeddingMatrix
 
 
 _BASE_URL = "https://api-inference.huggingface.co/models"
@@ -36,7 +39,7 @@ class HuggingFaceProvider(BaseProvider):
 
     def __init__(self):
         self._api_key = settings.HUGGINGFACE_API_KEY
-        self._client = httpx.AsyncClient(
+        self._client = build_http_client(
             base_url=_BASE_URL,
             timeout=_TIMEOUT_SECONDS,
             headers={
@@ -86,11 +89,15 @@ class HuggingFaceProvider(BaseProvider):
         payload = {"inputs": request.texts, **request.extra_params}
 
         t0 = time.monotonic()
-        raw = await self._post(request.model_id, payload)
+        raw = await self._post(
+            request.model_id,
+            payload,
+            compact=settings.EMBEDDING_COMPACT_VECTORS,
+        )
         latency_ms = (time.monotonic() - t0) * 1000
 
         # HF returns list of embedding vectors
-        if not isinstance(raw, list):
+        if not isinstance(raw, (list, EmbeddingMatrix)):
             raise ProviderUnavailableError(
                 self.provider_name, f"Unexpected embedding response: {raw}"
             )
@@ -106,6 +113,9 @@ class HuggingFaceProvider(BaseProvider):
     def is_available(self) -> bool:
         return bool(self._api_key)
 
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
     # ------------------------------------------------------------------ #
     # Internal helpers                                                     #
     # ------------------------------------------------------------------ #
@@ -122,7 +132,7 @@ class HuggingFaceProvider(BaseProvider):
             return f"{request.system_prompt}\n\n{request.prompt}"
         return request.prompt
 
-    async def _post(self, model_id: str, payload: dict) -> list:
+    async def _post(self, model_id: str, payload: dict, *, compact: bool = False):
         try:
             response = await self._client.post(f"/{model_id}", json=payload)
         except httpx.TimeoutException as exc:
@@ -130,13 +140,17 @@ class HuggingFaceProvider(BaseProvider):
         except httpx.RequestError as exc:
             raise ProviderUnavailableError(self.provider_name, str(exc)) from exc
 
-        return self._parse_response(response)
+        return self._parse_response(response, compact=compact)
 
-    def _parse_response(self, response: httpx.Response) -> list:
+    def _parse_response(self, response: httpx.Response, *, compact: bool = False):
         if response.status_code == 401:
             raise ProviderAuthError(self.provider_name, "Invalid API token.")
         if response.status_code == 429:
-            raise ProviderRateLimitError(self.provider_name, "Rate limit exceeded.")
+            raise ProviderRateLimitError(
+                self.provider_name,
+                "Rate limit exceeded.",
+                retry_after=parse_retry_after(response.headers),
+            )
         if response.status_code == 503:
             # HF returns 503 when model is loading (cold start)
             raise ProviderUnavailableError(
@@ -154,4 +168,12 @@ class HuggingFaceProvider(BaseProvider):
                 f"Client error {response.status_code}: {response.text[:200]}",
             )
 
+        if compact:
+            # Parse 2-D embedding bodies straight into float32; anything
+            # else (errors, token-level outputs) goes through json below.
+            try:
+                return EmbeddingMatrix.from_json(response.text)
+            except ValueError:
+                pass
+
         return response.json()
\ No newline at end of file
@@ -1,9 +1,13 @@
+import json
 import time
+from typing import AsyncIterator
+
 import httpx
 
 from backend.core.config import settings
 from backend.ml.providers.base import (
     BaseProvider,
+    CompletionChunk,
     CompletionRequest,
     CompletionResponse,
     EmbeddingRequest,
@@ -12,7 +16,9 @@ from backend.ml.providers.base import (
     ProviderRateLimitError,
     ProviderTimeoutError,
     ProviderUnavailableError,
+    parse_retry_after,
 )
+from backend.ml.providers.registry import build_http_client
 
 
 _BASE_URL = "https://openrouter.ai/api/v1"
@@ -35,7 +41,7 @@ class OpenRouterProvider(BaseProvider):
 
     def __init__(self):
         self._api_key = settings.OPENROUTER_API_KEY
-        self._client = httpx.AsyncClient(
+        self._client = build_http_client(
             base_url=_BASE_URL,
             timeout=_TIMEOUT_SECONDS,
             headers={
@@ -76,6 +82,66 @@ class OpenRouterProvider(BaseProvider):
             latency_ms=latency_ms,
         )
 
+    async def stream_complete(self, request: CompletionRequest) -> AsyncIterator[CompletionChunk]:
+        """
+        `stream: true` on /chat/completions returns Server-Sent Events:
+        `data: {...delta...}` lines, `: comment` keep-alives, `data: [DONE]`.
+        """
+        payload = {
+            "model": request.model_id,
+            "messages": self._build_messages(request),
+            "max_tokens": request.max_tokens,
+            "temperature": request.temperature,
+            **request.extra_params,
+            "stream": True,
+        }
+
+        try:
+            async with self._client.stream("POST", "/chat/completions", json=payload) as response:
+                if response.status_code >= 400:
+                    await response.aread()
+                    self._parse_response(response)     # raises the mapped ProviderError
+
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+
+                    try:
+                        event = json.loads(data)
+                    except ValueError:
+                        event = None
+                    if not isinstance(event, dict):
+                        # Truncated or garbled event — a provider failure, so
+                        # the router can fall back / trip the breaker
+                        raise ProviderUnavailableError(
+                            self.provider_name,
+                            f"Malformed stream event: {data[:200]}",
+                        )
+                    if "error" in event:
+                        raise ProviderUnavailableError(
+                            self.provider_name,
+                            f"Stream error: {str(event['error'])[:200]}",
+                        )
+
+                    choices = event.get("choices") or [{}]
+                    usage = event.get("usage") or {}
+                    yield CompletionChunk(
+                        text=(choices[0].get("delta") or {}).get("content") or "",
+                        model_id=event.get("model", request.model_id),
+                        provider=self.provider_name,
+                        finish_reason=choices[0].get("finish_reason"),
+                        prompt_tokens=usage.get("prompt_tokens", 0),
+                        completion_tokens=usage.get("completion_tokens", 0),
+                    )
+
+        except httpx.TimeoutException as exc:
+            raise ProviderTimeoutError(self.provider_name, str(exc)) from exc
+        except httpx.RequestError as exc:
+            raise ProviderUnavailableError(self.provider_name, str(exc)) from exc
+
     async def embed(self, request: EmbeddingRequest) -> EmbeddingResponse:
         # OpenRouter does not provide an embeddings endpoint.
         # The router will catch this and delegate to HuggingFaceProvider.
@@ -87,6 +153,9 @@ class OpenRouterProvider(BaseProvider):
     def is_available(self) -> bool:
         return bool(self._api_key)
 
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
     # ------------------------------------------------------------------ #
     # Internal helpers                                                     #
     # ------------------------------------------------------------------ #
@@ -113,7 +182,11 @@ class OpenRouterProvider(BaseProvider):
         if response.status_code == 401:
             raise ProviderAuthError(self.provider_name, "Invalid API key.")
         if response.status_code == 429:
-            raise ProviderRateLimitError(self.provider_name, "Rate limit exceeded.")
+            raise ProviderRateLimitError(
+                self.provider_name,
+                "Rate limit exceeded.",
+                retry_after=parse_retry_after(response.headers),
+            )
         if response.status_code >= 500:
             raise ProviderUnavailableError(
                 self.provider_name,
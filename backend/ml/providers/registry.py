@@ -0,0 +1,94 @@
+import logging
+
+import httpx
+
+from backend.core.config import settings
+from backend.ml.providers.base import BaseProvider
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2 support)
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+
+# Process-wide provider instances, keyed by provider_name.
+_providers: dict[str, BaseProvider] = {}
+
+# Fallback order used by ModelService's router.
+_PROVIDER_ORDER = ("openrouter", "huggingface")
+
+
+# ------------------------------------------------------------------ #
+# HTTP client factory                                                  #
+# ------------------------------------------------------------------ #
+
+def build_http_client(
+    *,
+    base_url: str,
+    timeout: float,
+    headers: dict,
+) -> httpx.AsyncClient:
+    """
+    Keep-alive client with bounded connection limits.  HTTP/2 is used when
+    enabled in settings and the optional `h2` dependency is installed.
+    """
+    http2 = settings.PROVIDER_HTTP2 and _HTTP2_AVAILABLE
+    if settings.PROVIDER_HTTP2 and not _HTTP2_AVAILABLE:
+        logger.warning("provider.http2.unavailable", extra={"reason": "h2 not installed"})
+
+    return httpx.AsyncClient(
+        base_url=base_url,
+        timeout=timeout,
+        headers=headers,
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=settings.PROVIDER_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.PROVIDER_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.PROVIDER_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+    )
+
+
+# ------------------------------------------------------------------ #
+# Registry                                                             #
+# ------------------------------------------------------------------ #
+
+def _create_provider(name: str) -> BaseProvider:
+    if name == "openrouter":
+        from backend.ml.providers.openrouter import OpenRouterProvider
+        return OpenRouterProvider()
+
+    if name == "huggingface":
+        from backend.ml.providers.huggingface import HuggingFaceProvider
+        return HuggingFaceProvider()
+
+    raise ValueError(f"Unknown provider: {name}")
+
+
+def get_provider(name: str) -> BaseProvider:
+    provider = _providers.get(name)
+    if provider is None:
+        provider = _create_provider(name)
+        _providers[name] = provider
+    return provider
+
+
+def get_providers() -> list[BaseProvider]:
+    """Shared providers in fallback order (primary first)."""
+    return [get_provider(name) for name in _PROVIDER_ORDER]
+
+
+async def close_providers() -> None:
+    """
+    Close every shared HTTP client.
+    Called on FastAPI shutdown and Celery worker process shutdown.
+    """
+    while _providers:
+        name, provider = _providers.popitem()
+        try:
+            await provider.aclose()
+        except Exception:
+            logger.exception("provider.close.failed", extra={"provider": name})
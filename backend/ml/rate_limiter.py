@@ -0,0 +1,274 @@
+import asyncio
+import logging
+import random
+import time
+
+from backend.core.config import settings
+from backend.ml.providers.base import (
+    CompletionRequest,
+    EmbeddingRequest,
+    ProviderRateLimitError,
+)
+from backend.queue.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "taskforge:ratelimit:"
+_KEY_TTL_SECONDS = 3600
+
+# KEYS = bucket hashes (provider-wide and/or per model)
+# ARGV = now, cost_tokens, scale_recovery_per_second, ttl, then rpm, tpm per key
+#
+# Refills each bucket (requests and tokens, at rate * scale), and only if
+# every bucket has capacity and none is blocked by a Retry-After, takes one
+# request and `cost` tokens from all of them.  Returns the seconds to wait
+# before capacity is expected (0 = admitted).
+_ACQUIRE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local cost = tonumber(ARGV[2])
+local recovery = tonumber(ARGV[3])
+local ttl = tonumber(ARGV[4])
+local wait = 0
+local buckets = {}
+
+for i, key in ipairs(KEYS) do
+    local rpm = tonumber(ARGV[3 + 2 * i])
+    local tpm = tonumber(ARGV[4 + 2 * i])
+    local h = redis.call("HMGET", key, "req", "tok", "ts", "blocked_until", "scale")
+    local elapsed = math.max(now - (tonumber(h[3]) or now), 0)
+    local scale = math.min(1, (tonumber(h[5]) or 1) + elapsed * recovery)
+    local req = tonumber(h[1]) or rpm
+    local tok = tonumber(h[2]) or tpm
+
+    if rpm > 0 then
+        req = math.min(rpm * scale, req + elapsed * rpm * scale / 60)
+        if req < 1 then wait = math.max(wait, (1 - req) * 60 / (rpm * scale)) end
+    end
+    if tpm > 0 then
+        tok = math.min(tpm * scale, tok + elapsed * tpm * scale / 60)
+        -- a request larger than the bucket only waits for a full bucket
+        local need = math.min(cost, tpm * scale)
+        if tok < need then wait = math.max(wait, (need - tok) * 60 / (tpm * scale)) end
+    end
+
+    local blocked = tonumber(h[4]) or 0
+    if blocked > now then wait = math.max(wait, blocked - now) end
+
+    buckets[i] = {req, tok, scale, rpm, tpm}
+end
+
+for i, key in ipairs(KEYS) do
+    local b = buckets[i]
+    if wait == 0 then
+        if b[4] > 0 then b[1] = b[1] - 1 end
+        if b[5] > 0 then b[2] = b[2] - cost end
+    end
+    redis.call("HSET", key, "req", b[1], "tok", b[2], "ts", now, "scale", b[3])
+    redis.call("EXPIRE", key, ttl)
+end
+return tostring(wait)
+"""
+
+# KEYS = bucket hashes; ARGV = now, retry_after, backoff_factor, min_scale, ttl
+# A provider 429: block until Retry-After and shrink the admitted rate.
+_PENALIZE_SCRIPT = """
+local now = tonumber(ARGV[1])
+for _, key in ipairs(KEYS) do
+    local h = redis.call("HMGET", key, "blocked_until", "scale")
+    local blocked = math.max(tonumber(h[1]) or 0, now + tonumber(ARGV[2]))
+    local scale = math.max((tonumber(h[2]) or 1) * tonumber(ARGV[3]), tonumber(ARGV[4]))
+    redis.call("HSET", key, "blocked_until", blocked, "scale", scale, "req", 0, "ts", now)
+    redis.call("EXPIRE", key, ARGV[5])
+end
+return 1
+"""
+
+
+class RateLimiter:
+    """
+    Distributed token-bucket admission for provider calls, shared by every
+    API and worker process through Redis.
+
+    Budgets come from PROVIDER_RATE_LIMITS, keyed by provider name
+    (account-wide) or "provider:model_id" (per model):
+
+        {"openrouter": {"requests_per_minute": 200, "tokens_per_minute": 400000},
+         "openrouter:meta-llama/llama-3-70b-instruct": {"requests_per_minute": 20}}
+
+    A call must fit in both its provider bucket and its model bucket.  Token
+    cost is estimated up front (prompt length + max_tokens) and corrected
+    with the provider's reported usage afterwards.
+
+    Adaptive: a provider 429 blocks the model bucket until its Retry-After
+    and multiplies the admitted rate by RATE_LIMIT_BACKOFF_FACTOR; the rate
+    recovers linearly over RATE_LIMIT_RECOVERY_SECONDS.  This applies even
+    to models without a configured budget.
+
+    Callers wait with `asyncio.sleep`, so a waiting call never blocks the
+    event loop.  Waits longer than RATE_LIMIT_MAX_WAIT_SECONDS raise
+    ProviderRateLimitError with `retry_after` set, letting the router fall
+    back and the task be retried after that delay instead of holding its
+    worker.  Redis errors fail open.
+    """
+
+    # ------------------------------------------------------------------ #
+    # Public interface                                                     #
+    # ------------------------------------------------------------------ #
+
+    async def acquire(self, provider_name: str, model_id: str, cost_tokens: int) -> None:
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+
+        keys, args = self._buckets(provider_name, model_id)
+        deadline = time.monotonic() + settings.RATE_LIMIT_MAX_WAIT_SECONDS
+
+        while True:
+            try:
+                wait = float(await get_redis().eval(
+                    _ACQUIRE_SCRIPT,
+                    len(keys),
+                    *keys,
+                    time.time(),
+                    cost_tokens,
+                    1 / settings.RATE_LIMIT_RECOVERY_SECONDS,
+                    _KEY_TTL_SECONDS,
+                    *args,
+                ))
+            except Exception as exc:
+                logger.warning(
+                    "rate_limiter.redis.acquire_failed",
+                    extra={"provider": provider_name, "error": str(exc)},
+                )
+                return
+
+            if wait <= 0:
+                return
+
+            if time.monotonic() + wait > deadline:
+                logger.info(
+                    "rate_limiter.rejected",
+                    extra={"provider": provider_name, "model_id": model_id, "retry_after": round(wait, 2)},
+                )
+                raise ProviderRateLimitError(
+                    provider_name,
+                    f"Local rate limit: no capacity for {model_id} within "
+                    f"{settings.RATE_LIMIT_MAX_WAIT_SECONDS:g}s.",
+                    retry_after=wait,
+                )
+
+            # Jitter spreads waiters out so they do not retry in lockstep
+            await asyncio.sleep(wait * random.uniform(1.0, 1.2))
+
+    async def penalize(self, provider_name: str, model_id: str, retry_after: float | None) -> None:
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+
+        retry_after = retry_after if retry_after is not None else settings.RATE_LIMIT_DEFAULT_RETRY_AFTER_SECONDS
+        logger.warning(
+            "rate_limiter.provider_429",
+            extra={"provider": provider_name, "model_id": model_id, "retry_after": retry_after},
+        )
+        try:
+            await get_redis().eval(
+                _PENALIZE_SCRIPT,
+                1,
+                _model_key(provider_name, model_id),
+                time.time(),
+                retry_after,
+                settings.RATE_LIMIT_BACKOFF_FACTOR,
+                settings.RATE_LIMIT_MIN_SCALE,
+                _KEY_TTL_SECONDS,
+            )
+        except Exception as exc:
+            logger.warning(
+                "rate_limiter.redis.penalize_failed",
+                extra={"provider": provider_name, "error": str(exc)},
+            )
+
+    async def settle(self, provider_name: str, model_id: str, estimated: int, actual: int) -> None:
+        """Correct the token buckets once the provider reports real usage."""
+        if not settings.RATE_LIMIT_ENABLED or actual <= 0 or actual == estimated:
+            return
+
+        keys = [
+            key for key, limits in self._limits(provider_name, model_id)
+            if limits.get("tokens_per_minute")
+        ]
+        if not keys:
+            return
+        try:
+            async with get_redis().pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.hincrbyfloat(key, "tok", estimated - actual)
+                await pipe.execute()
+        except Exception as exc:
+            logger.warning(
+                "rate_limiter.redis.settle_failed",
+                extra={"provider": provider_name, "error": str(exc)},
+            )
+
+    # ------------------------------------------------------------------ #
+    # Internal helpers                                                     #
+    # ------------------------------------------------------------------ #
+
+    def _limits(self, provider_name: str, model_id: str) -> list[tuple[str, dict]]:
+        limits = settings.PROVIDER_RATE_LIMITS
+        buckets = []
+        if provider_name in limits:
+            buckets.append((f"{_KEY_PREFIX}{provider_name}", limits[provider_name]))
+        # The model bucket always exists — it carries Retry-After blocks
+        buckets.append((_model_key(provider_name, model_id), limits.get(f"{provider_name}:{model_id}", {})))
+        return buckets
+
+    def _buckets(self, provider_name: str, model_id: str) -> tuple[list[str], list[int]]:
+        keys, args = [], []
+        for key, limits in self._limits(provider_name, model_id):
+            keys.append(key)
+            args.extend((
+                limits.get("requests_per_minute", 0),
+                limits.get("tokens_per_minute", 0),
+            ))
+        return keys, args
+
+
+def estimate_tokens(request: CompletionRequest | EmbeddingRequest) -> int:
+    """Rough pre-call token cost (~4 characters per token)."""
+    if isinstance(request, EmbeddingRequest):
+        return sum(len(text) for text in request.texts) // 4 + 1
+    prompt_chars = len(request.prompt) + len(request.system_prompt or "")
+    return prompt_chars // 4 + request.max_tokens
+
+
+def retry_after_hint(exc: BaseException) -> float | None:
+    """
+    Longest provider-suggested delay found on a (chained) exception, e.g.
+    ModelInferenceError → AllProvidersFailedError → ProviderRateLimitError.
+    """
+    hints = []
+    seen = set()
+    stack = [exc]
+    while stack:
+        current = stack.pop()
+        if current is None or id(current) in seen:
+            continue
+        seen.add(id(current))
+        if isinstance(current, ProviderRateLimitError) and current.retry_after is not None:
+            hints.append(current.retry_after)
+        stack.extend(getattr(current, "errors", None) or [])
+        stack.append(current.__cause__)
+    return max(hints) if hints else None
+
+
+def _model_key(provider_name: str, model_id: str) -> str:
+    return f"{_KEY_PREFIX}{provider_name}:{model_id}"
+
+
+# Process-wide instance.
+_limiter: RateLimiter | None = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    global _limiter
+    if _limiter is None:
+        _limiter = RateLimiter()
+    return _limiter
@@ -1,13 +1,28 @@
+import asyncio
 import logging
+import time
+from dataclasses import asdict
+from typing import AsyncIterator
 
 from backend.ml.providers.base import (
     BaseProvider,
+    CompletionChunk,
     CompletionRequest,
     CompletionResponse,
     EmbeddingRequest,
     EmbeddingResponse,
-    ProviderError
+    ProviderError,
+    ProviderRateLimitError,
+    ProviderUnavailableError,
 )
+from backend.ml.cache import CachePolicy, CompletionCache, request_hash
+from backend.ml.circuit_breaker import CircuitBreaker
+from backend.ml.coalescing import RequestCoalescer
+from backend.ml.hedging import HedgeController, HedgePolicy
+from backend.ml.rate_limiter import RateLimiter, estimate_tokens
+from backend.ml.vectors import EmbeddingMatrix, embeddings_to_list
+from backend.monitoring.prometheus import observe_hedge, observe_provider_call
+from backend.monitoring.tracing import trace_annotate
 from backend.core.exceptions import AllProvidersFailedError
 
 logger = logging.getLogger(__name__)
@@ -21,21 +36,103 @@ class ProviderRouter:
     moves on to the next provider.  When every provider fails it raises
     AllProvidersFailedError with the full error list attached.
 
+    An optional CompletionCache sits in front of the chain; whether a given
+    request is cacheable is decided by the caller's CachePolicy.  An optional
+    RequestCoalescer makes identical in-flight requests share one provider
+    call (cache misses included, so a burst only fills the cache once).
+    Only deterministic (temperature 0) completions are coalesced — sampled
+    ones must give every caller its own draw.
+    An optional CircuitBreaker makes completions skip providers that are
+    currently failing instead of waiting out their timeout first.  An
+    optional HedgeController lets callers pass a HedgePolicy: when the
+    primary is slower than its recent latency percentile the same request
+    also goes to the next provider and the first answer wins.  An optional
+    RateLimiter admits completions against shared per-provider/per-model
+    budgets and backs off on provider 429s.
+
     Usage:
-        router = ProviderRouter(providers=[openrouter, huggingface])
-        response = await router.complete(request)
+        router = ProviderRouter(
+            providers=[openrouter, huggingface],
+            cache=cache,
+            coalescer=coalescer,
+            breaker=breaker,
+            hedger=hedger,
+            limiter=limiter,
+        )
+        response = await router.complete(request, cache_policy=policy, hedge_policy=hedge)
     """
 
-    def __init__(self, providers: list[BaseProvider]):
+    def __init__(
+        self,
+        providers: list[BaseProvider],
+        cache: CompletionCache | None = None,
+        coalescer: RequestCoalescer | None = None,
+        breaker: CircuitBreaker | None = None,
+        hedger: HedgeController | None = None,
+        limiter: RateLimiter | None = None,
+    ):
         if not providers:
             raise ValueError("ProviderRouter requires at least one provider.")
         self._providers = providers
+        self._cache = cache
+        self._coalescer = coalescer
+        self._breaker = breaker
+        self._hedger = hedger
+        self._limiter = limiter
+
+    @property
+    def providers(self) -> list[BaseProvider]:
+        return list(self._providers)
 
     # ------------------------------------------------------------------ #
     # Public interface                                                     #
     # ------------------------------------------------------------------ #
 
-    async def complete(self, request: CompletionRequest) -> CompletionResponse:
+    async def complete(
+        self,
+        request: CompletionRequest,
+        *,
+        cache_policy: CachePolicy | None = None,
+        hedge_policy: HedgePolicy | None = None,
+    ) -> CompletionResponse:
+        use_cache = (
+            self._cache is not None
+            and cache_policy is not None
+            and cache_policy.allows(request)
+        )
+
+        if use_cache:
+            cached = await self._cache.get(request)
+            if cached is not None:
+                logger.info(
+                    "provider.complete.cache_hit",
+                    extra={"model_id": cached.model_id},
+                )
+                return cached
+
+        store_policy = cache_policy if use_cache else None
+
+        if self._hedger is None or hedge_policy is None or not hedge_policy.enabled:
+            hedge_policy = None
+
+        # Sampled completions are independent draws, so they are never shared
+        if self._coalescer is None or request.temperature != 0:
+            return await self._complete_and_store(request, store_policy, hedge_policy)
+
+        return await self._coalescer.run(
+            f"complete:{request_hash(request)}",
+            lambda: self._complete_and_store(request, store_policy, hedge_policy),
+            encode=asdict,
+            decode=lambda data: CompletionResponse(**data),
+        )
+
+    async def stream_complete(self, request: CompletionRequest) -> AsyncIterator[CompletionChunk]:
+        """
+        Streams from the first provider that starts producing output.
+        Fallback only happens before the first chunk — once tokens have
+        been emitted a provider failure propagates to the caller.
+        Streaming bypasses the cache and coalescer.
+        """
         errors: list[ProviderError] = []
 
         for provider in self._providers:
@@ -45,22 +142,53 @@ class ProviderRouter:
                     extra={"provider": provider.provider_name, "reason": "not_available"},
                 )
                 continue
+            if not await self._circuit_allows(provider, errors):
+                continue
+            try:
+                cost = await self._admit(provider, request)
+            except ProviderRateLimitError as exc:
+                errors.append(exc)
+                continue
 
+            started = False
+            t0 = time.perf_counter()
+            prompt_tokens = completion_tokens = 0
             try:
-                response = await provider.complete(request)
-                logger.info(
-                    "provider.complete.success",
-                    extra={
-                        "provider": provider.provider_name,
-                        "model_id": response.model_id,
-                        "latency_ms": round(response.latency_ms, 1),
-                    },
+                async for chunk in provider.stream_complete(request):
+                    started = True
+                    prompt_tokens = max(prompt_tokens, chunk.prompt_tokens)
+                    completion_tokens = max(completion_tokens, chunk.completion_tokens)
+                    yield chunk
+                seconds = time.perf_counter() - t0
+                observe_provider_call(
+                    provider=provider.provider_name,
+                    model=request.model_id,
+                    operation="stream",
+                    seconds=seconds,
+                    ok=True,
+                    prompt_tokens=prompt_tokens,
+                    completion_tokens=completion_tokens,
                 )
-                return response
+                await self._on_success(
+                    provider, request, seconds=seconds, cost=cost,
+                    used_tokens=prompt_tokens + completion_tokens,
+                )
+                return
 
             except ProviderError as exc:
+                seconds = time.perf_counter() - t0
+                observe_provider_call(
+                    provider=provider.provider_name,
+                    model=request.model_id,
+                    operation="stream",
+                    seconds=seconds,
+                    ok=False,
+                )
+                await self._on_failure(provider, request, exc, seconds=seconds)
+                if started:
+                    raise
                 logger.warning(
-                    "provider.complete.failed",
+                    "provider.stream.failed",
                     extra={"provider": provider.provider_name, "error": str(exc)},
                 )
                 errors.append(exc)
@@ -68,6 +196,34 @@ class ProviderRouter:
         raise AllProvidersFailedError(errors)
 
     async def embed(self, request: EmbeddingRequest) -> EmbeddingResponse:
+        if self._coalescer is None:
+            return await self._embed_uncached(request)
+
+        return await self._coalescer.run(
+            f"embed:{request_hash(request)}",
+            lambda: self._embed_uncached(request),
+            encode=_encode_embedding_response,
+            decode=_decode_embedding_response,
+        )
+
+    # ------------------------------------------------------------------ #
+    # Internal helpers                                                     #
+    # ------------------------------------------------------------------ #
+
+    async def _complete_and_store(
+        self,
+        request: CompletionRequest,
+        cache_policy: CachePolicy | None,
+        hedge_policy: HedgePolicy | None = None,
+    ) -> CompletionResponse:
+        response = await self._complete_uncached(request, hedge_policy)
+
+        if cache_policy is not None:
+            await self._cache.set(request, response, cache_policy.ttl_seconds)
+
+        return response
+
+    async def _embed_uncached(self, request: EmbeddingRequest) -> EmbeddingResponse:
         errors: list[ProviderError] = []
 
         for provider in self._providers:
@@ -78,8 +234,17 @@ class ProviderRouter:
                 )
                 continue
 
+            t0 = time.perf_counter()
             try:
                 response = await provider.embed(request)
+                observe_provider_call(
+                    provider=provider.provider_name,
+                    model=request.model_id,
+                    operation="embed",
+                    seconds=time.perf_counter() - t0,
+                    ok=True,
+                    prompt_tokens=response.token_count,
+                )
                 logger.info(
                     "provider.embed.success",
                     extra={
@@ -91,10 +256,238 @@ class ProviderRouter:
                 return response
 
             except ProviderError as exc:
+                observe_provider_call(
+                    provider=provider.provider_name,
+                    model=request.model_id,
+                    operation="embed",
+                    seconds=time.perf_counter() - t0,
+                    ok=False,
+                )
                 logger.warning(
                     "provider.embed.failed",
                     extra={"provider": provider.provider_name, "error": str(exc)},
                 )
                 errors.append(exc)
 
-        raise AllProvidersFailedError(errors)
\ No newline at end of file
+        raise AllProvidersFailedError(errors)
+
+    async def _complete_uncached(
+        self,
+        request: CompletionRequest,
+        hedge_policy: HedgePolicy | None = None,
+    ) -> CompletionResponse:
+        errors: list[ProviderError] = []
+        candidates = []
+
+        for provider in self._providers:
+            if not provider.is_available():
+                logger.warning(
+                    "provider.skip",
+                    extra={"provider": provider.provider_name, "reason": "not_available"},
+                )
+                continue
+            if not await self._circuit_allows(provider, errors):
+                continue
+            candidates.append(provider)
+
+        if hedge_policy is not None and len(candidates) >= 2:
+            self._hedger.credit(hedge_policy)
+            response = await self._complete_hedged(
+                request, candidates[0], candidates[1], hedge_policy, errors
+            )
+            if response is not None:
+                return response
+            candidates = candidates[2:]
+
+        for provider in candidates:
+            try:
+                return await self._attempt_complete(provider, request)
+            except ProviderError as exc:
+                errors.append(exc)
+
+        raise AllProvidersFailedError(errors)
+
+    async def _complete_hedged(
+        self,
+        request: CompletionRequest,
+        primary: BaseProvider,
+        secondary: BaseProvider,
+        policy: HedgePolicy,
+        errors: list[ProviderError],
+    ) -> CompletionResponse | None:
+        """
+        Race `primary` against a delayed hedge on `secondary`.  Returns the
+        first successful response (the other call is cancelled), or None
+        with both failures appended to `errors`.
+        """
+        delay = self._hedger.delay_seconds(primary.provider_name, request.model_id, policy.percentile)
+        started = time.perf_counter()
+        primary_call = asyncio.create_task(self._attempt_complete(primary, request))
+
+        done, _ = await asyncio.wait({primary_call}, timeout=delay)
+        if done or not self._hedger.try_spend(policy):
+            if not done:
+                observe_hedge(model=request.model_id, outcome="budget_exhausted")
+            try:
+                return await primary_call
+            except ProviderError as exc:
+                # Primary failed on its own — plain sequential fallback
+                errors.append(exc)
+                try:
+                    return await self._attempt_complete(secondary, request)
+                except ProviderError as fallback_exc:
+                    errors.append(fallback_exc)
+                    return None
+
+        logger.info(
+            "provider.complete.hedged",
+            extra={
+                "provider": primary.provider_name,
+                "hedge_provider": secondary.provider_name,
+                "model_id": request.model_id,
+                "delay_ms": round(delay * 1000, 1),
+            },
+        )
+        hedge_call = asyncio.create_task(self._attempt_complete(secondary, request))
+        pending = {primary_call, hedge_call}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for call in done:
+                    try:
+                        response = call.result()
+                    except ProviderError as exc:
+                        errors.append(exc)
+                        continue
+                    winner = "hedge" if call is hedge_call else "primary"
+                    observe_hedge(model=request.model_id, outcome=f"{winner}_won")
+                    trace_annotate(hedged=True, hedge_winner=winner)
+                    return response
+            return None
+        finally:
+            for call in pending:
+                call.cancel()
+            if primary_call in pending:
+                # Cancelled primaries are the slow tail; leaving them out of
+                # the window would drag the percentile (and the delay) down.
+                # Elapsed time is a lower bound of their latency
+                self._hedger.observe(primary.provider_name, request.model_id, time.perf_counter() - started)
+
+    async def _attempt_complete(
+        self,
+        provider: BaseProvider,
+        request: CompletionRequest,
+    ) -> CompletionResponse:
+        cost = await self._admit(provider, request)
+
+        t0 = time.perf_counter()
+        try:
+            response = await provider.complete(request)
+        except ProviderError as exc:
+            seconds = time.perf_counter() - t0
+            observe_provider_call(
+                provider=provider.provider_name,
+                model=request.model_id,
+                operation="complete",
+                seconds=seconds,
+                ok=False,
+            )
+            await self._on_failure(provider, request, exc, seconds=seconds)
+            logger.warning(
+                "provider.complete.failed",
+                extra={"provider": provider.provider_name, "error": str(exc)},
+            )
+            raise
+
+        seconds = time.perf_counter() - t0
+        observe_provider_call(
+            provider=provider.provider_name,
+            model=request.model_id,
+            operation="complete",
+            seconds=seconds,
+            ok=True,
+            prompt_tokens=response.prompt_tokens,
+            completion_tokens=response.completion_tokens,
+        )
+        await self._on_success(
+            provider, request, seconds=seconds, cost=cost,
+            used_tokens=response.prompt_tokens + response.completion_tokens,
+        )
+        if self._hedger is not None:
+            self._hedger.observe(provider.provider_name, request.model_id, seconds)
+        logger.info(
+            "provider.complete.success",
+            extra={
+                "provider": provider.provider_name,
+                "model_id": response.model_id,
+                "latency_ms": round(response.latency_ms, 1),
+            },
+        )
+        return response
+
+    async def _circuit_allows(self, provider: BaseProvider, errors: list[ProviderError]) -> bool:
+        if self._breaker is None or await self._breaker.allow(provider):
+            return True
+        logger.warning(
+            "provider.skip",
+            extra={"provider": provider.provider_name, "reason": "circuit_open"},
+        )
+        errors.append(ProviderUnavailableError(provider.provider_name, "circuit breaker open"))
+        return False
+
+    async def _admit(self, provider: BaseProvider, request: CompletionRequest) -> int:
+        """
+        Wait for rate-limiter capacity; raises ProviderRateLimitError when
+        none is expected soon.  Returns the estimated token cost.
+        """
+        cost = estimate_tokens(request)
+        if self._limiter is not None:
+            await self._limiter.acquire(provider.provider_name, request.model_id, cost)
+        return cost
+
+    async def _on_success(
+        self,
+        provider: BaseProvider,
+        request: CompletionRequest,
+        *,
+        seconds: float,
+        cost: int,
+        used_tokens: int,
+    ) -> None:
+        if self._breaker is not None:
+            await self._breaker.record(provider, model_id=request.model_id, ok=True, seconds=seconds)
+        if self._limiter is not None:
+            await self._limiter.settle(provider.provider_name, request.model_id, cost, used_tokens)
+
+    async def _on_failure(
+        self,
+        provider: BaseProvider,
+        request: CompletionRequest,
+        exc: ProviderError,
+        *,
+        seconds: float,
+    ) -> None:
+        # A 429 is back-pressure, not an outage: slow down, keep the breaker closed
+        if isinstance(exc, ProviderRateLimitError):
+            if self._limiter is not None:
+                await self._limiter.penalize(provider.provider_name, request.model_id, exc.retry_after)
+            return
+        if self._breaker is not None:
+            await self._breaker.record(provider, model_id=request.model_id, ok=False, seconds=seconds)
+
+
+def _encode_embedding_response(response: EmbeddingResponse) -> dict:
+    return {
+        "embeddings": embeddings_to_list(response.embeddings),
+        "model_id": response.model_id,
+        "provider": response.provider,
+        "token_count": response.token_count,
+        "latency_ms": response.latency_ms,
+    }
+
+
+def _decode_embedding_response(data: dict) -> EmbeddingResponse:
+    response = EmbeddingResponse(**data)
+    if isinstance(response.embeddings, list) and response.embeddings:
+        response.embeddings = EmbeddingMatrix.from_nested(response.embeddings)
+    return response
\ No newline at end of file
@@ -0,0 +1,162 @@
+import re
+from array import array
+from typing import Iterator, Sequence
+
+try:
+    import numpy as np
+except ImportError:     # NumPy is optional — fall back to array('f') buffers
+    np = None
+
+
+_BRACKETS = str.maketrans("", "", "[] \n\r\t")
+_ROW_SEPARATOR = re.compile(r"\]\s*,\s*\[")
+
+
+class EmbeddingMatrix:
+    """
+    Compact row-major float32 matrix of embeddings.
+
+    Backed by a contiguous NumPy array when NumPy is installed, otherwise by
+    an `array('f')` buffer (which still supports the buffer protocol, so
+    `memoryview` / `np.frombuffer` work without copying).  A 1k x 768 batch
+    is ~3 MB instead of ~30 MB of Python float objects.
+
+    Behaves like the old `list[list[float]]` for reading:
+        len(m), m[i] (row view), m[a:b] (matrix view), iteration, m.tolist()
+    `tolist()` materialises nested lists lazily and caches the result.
+    """
+
+    __slots__ = ("_data", "_rows", "_dim", "_list")
+
+    def __init__(self, data, rows: int, dim: int):
+        self._data = data      # np.ndarray of shape (rows, dim) or flat array('f')
+        self._rows = rows
+        self._dim = dim
+        self._list: list[list[float]] | None = None
+
+    # ------------------------------------------------------------------ #
+    # Construction                                                         #
+    # ------------------------------------------------------------------ #
+
+    @classmethod
+    def from_nested(cls, vectors: Sequence[Sequence[float]]) -> "EmbeddingMatrix":
+        rows = len(vectors)
+        dim = len(vectors[0]) if rows else 0
+        if any(len(v) != dim for v in vectors):
+            raise ValueError("Embeddings must all have the same dimension.")
+
+        if np is not None:
+            data = np.asarray(vectors, dtype=np.float32).reshape(rows, dim)
+        else:
+            data = array("f", (x for v in vectors for x in v))
+        return cls(data, rows, dim)
+
+    @classmethod
+    def from_json(cls, text: str) -> "EmbeddingMatrix":
+        """
+        Parse a JSON `[[float, ...], ...]` body straight into float32 without
+        building a Python float per dimension.  Raises ValueError for any
+        other shape (e.g. token-level 3-D outputs) so callers can fall back.
+        """
+        body = text.strip()
+        if not body.startswith("[[") or not body.endswith("]]") or "[[[" in body:
+            raise ValueError("Expected a 2-D JSON array of embeddings.")
+
+        # Every row must have the first row's width — a flat count check
+        # alone would silently reshape ragged input into wrong rows
+        row_texts = _ROW_SEPARATOR.split(body[2:-2])
+        widths = {row.count(",") + 1 if row.strip() else 0 for row in row_texts}
+        if len(widths) != 1:
+            raise ValueError("Embeddings must all have the same dimension.")
+        dim = widths.pop()
+        rows = len(row_texts)
+
+        flat = body.translate(_BRACKETS)
+        if np is not None:
+            data = np.fromstring(flat, dtype=np.float32, sep=",") if flat else np.empty(0, np.float32)
+            count = data.size
+        else:
+            data = array("f", (float(x) for x in flat.split(",") if x))
+            count = len(data)
+
+        if count != rows * dim:
+            raise ValueError("Embeddings must all have the same dimension.")
+
+        if np is not None:
+            data = data.reshape(rows, dim)
+        return cls(data, rows, dim)
+
+    # ------------------------------------------------------------------ #
+    # Sequence interface                                                   #
+    # ------------------------------------------------------------------ #
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self._rows, self._dim
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._rows)
+            if step != 1:
+                raise ValueError("EmbeddingMatrix only supports contiguous slices.")
+            rows = max(stop - start, 0)
+            if np is not None:
+                return EmbeddingMatrix(self._data[start:stop], rows, self._dim)
+            view = memoryview(self._data)[start * self._dim:stop * self._dim]
+            return EmbeddingMatrix(view, rows, self._dim)
+
+        if index < 0:
+            index += self._rows
+        if not 0 <= index < self._rows:
+            raise IndexError("EmbeddingMatrix index out of range")
+
+        if np is not None:
+            return self._data[index]
+        return memoryview(self._data)[index * self._dim:(index + 1) * self._dim]
+
+    def __iter__(self) -> Iterator:
+        for i in range(self._rows):
+            yield self[i]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, EmbeddingMatrix):
+            other = other.tolist()
+        return self.tolist() == other
+
+    def __repr__(self) -> str:
+        return f"EmbeddingMatrix(rows={self._rows}, dim={self._dim})"
+
+    # ------------------------------------------------------------------ #
+    # Conversion                                                           #
+    # ------------------------------------------------------------------ #
+
+    def tolist(self) -> list[list[float]]:
+        if self._list is None:
+            if np is not None:
+                self._list = self._data.tolist()
+            else:
+                flat = self._data.tolist()
+                self._list = [flat[i * self._dim:(i + 1) * self._dim] for i in range(self._rows)]
+        return self._list
+
+    def as_numpy(self):
+        """Zero-copy (rows, dim) float32 ndarray. Requires NumPy."""
+        if np is None:
+            raise RuntimeError("NumPy is not installed.")
+        if isinstance(self._data, np.ndarray):
+            return self._data
+        return np.frombuffer(self._data, dtype=np.float32).reshape(self._rows, self._dim)
+
+    @property
+    def nbytes(self) -> int:
+        return self._rows * self._dim * 4
+
+
+def embeddings_to_list(embeddings) -> list[list[float]]:
+    """Plain nested lists for JSON / legacy callers, whichever representation."""
+    if isinstance(embeddings, EmbeddingMatrix):
+        return embeddings.tolist()
+    return embeddings
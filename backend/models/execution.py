@@ -7,6 +7,19 @@ from backend.core.enums import ExecutionStatus
 
 class Execution(Base):
     __tablename__ = "executions"
+    __table_args__ = (
+        # get_executions_by_task / get_worker_executions / list_executions_by_status;
+        # id is the keyset tiebreaker, so page boundaries stay in the index
+        sa.Index(
+            "ix_executions_task_id_created_at_id", "task_id", sa.text("created_at DESC"), sa.text("id DESC")
+        ),
+        sa.Index(
+            "ix_executions_worker_id_created_at_id", "worker_id", sa.text("created_at DESC"), sa.text("id DESC")
+        ),
+        sa.Index(
+            "ix_executions_status_created_at_id", "status", sa.text("created_at DESC"), sa.text("id DESC")
+        ),
+    )
 
     id: Mapped[str] = mapped_column(
         sa.UUID(as_uuid=True),
@@ -46,4 +59,15 @@ class Execution(Base):
     error_message: Mapped[str | None] = mapped_column(
         sa.Text,
         nullable=True
-    )
\ No newline at end of file
+    )
+
+    # Stage timings + provider attributes (monitoring/tracing.py)
+    metrics: Mapped[dict | None] = mapped_column(
+        sa.JSON,
+        nullable=True
+    )
+
+    created_at: Mapped[sa.DateTime] = mapped_column(
+        sa.DateTime,
+        server_default=sa.func.now()
+    )
@@ -5,6 +5,16 @@ from backend.db.base import Base, generate_uuid
 
 class ModelVersion(Base):
     __tablename__ = "model_versions"
+    __table_args__ = (
+        # get_default_for_task_type: at most a handful of rows match
+        sa.Index(
+            "ix_model_versions_default",
+            "task_type",
+            postgresql_where=sa.text("is_default AND is_active"),
+        ),
+        # list_by_task_type: WHERE task_type = ? ORDER BY created_at DESC
+        sa.Index("ix_model_versions_task_type_created_at", "task_type", sa.text("created_at DESC")),
+    )
 
     id: Mapped[str] = mapped_column(
         sa.UUID(as_uuid=True),
@@ -23,7 +23,8 @@ class Result(Base):
     execution_id: Mapped[str | None] = mapped_column(
         sa.UUID(as_uuid=True),
         sa.ForeignKey("executions.id"),
-        nullable=True
+        nullable=True,
+        index=True
     )
 
     storage_path: Mapped[str] = mapped_column(
@@ -7,6 +7,23 @@ from backend.core.enums import TaskType, TaskStatus
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # get_tasks_by_user: WHERE user_id = ? ORDER BY submitted_at DESC, id DESC
+        sa.Index(
+            "ix_tasks_user_id_submitted_at_id", "user_id", sa.text("submitted_at DESC"), sa.text("id DESC")
+        ),
+        # list_tasks_by_status on the scheduler's hot states only — terminal
+        # rows (the vast majority) never enter this index
+        sa.Index(
+            "ix_tasks_active_status_priority",
+            "status",
+            sa.text("priority DESC"),
+            "submitted_at",
+            postgresql_where=sa.text(
+                "status IN ('PENDING', 'QUEUED', 'RUNNING', 'RETRYING')"
+            ),
+        ),
+    )
 
     id: Mapped[str] = mapped_column(
         sa.UUID(as_uuid=True),
@@ -7,6 +7,10 @@ from backend.core.enums import UserRole
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # list_users: ORDER BY created_at DESC, id DESC
+        sa.Index("ix_users_created_at_id", sa.text("created_at DESC"), sa.text("id DESC")),
+    )
 
     id: Mapped[str] = mapped_column(
         sa.UUID(as_uuid=True),
@@ -0,0 +1,167 @@
+"""
+Incrementally maintained metrics counters (Redis hashes), so /metrics is a
+couple of HGETALLs instead of COUNT(*) scans over tasks and executions.
+
+  * Task status gauges move with the status snapshot kept for push
+    notifications (queue/notifications.py): a Lua script reads the previous
+    status from the snapshot, decrements it, increments the new one and
+    stores the new snapshot — atomically, and only after the DB commit.
+  * Execution deltas are staged on the session and only sent to Redis once
+    that session has committed; a rollback discards them.
+
+Anything that slips through (crashes between commit and flush, expired
+snapshots, manual SQL) is corrected by `reconcile_counters`, run
+periodically by Celery beat.
+"""
+import logging
+
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from backend.core.enums import ExecutionStatus, TaskStatus
+from backend.queue.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+TASKS_KEY = "taskforge:metrics:tasks"
+EXECUTIONS_KEY = "taskforge:metrics:executions"
+RUNTIME_SUM_FIELD = "runtime_ms_sum"        # over COMPLETED executions
+RUNTIME_COUNT_FIELD = "runtime_ms_count"
+
+# KEYS: snapshot, tasks hash   ARGV: snapshot json, new status, ttl
+_TRACK_TASK_STATUS = """
+local prev = redis.call('GET', KEYS[1])
+local prev_status = prev and cjson.decode(prev)['status'] or nil
+if prev_status ~= ARGV[2] then
+    if prev_status then redis.call('HINCRBY', KEYS[2], prev_status, -1) end
+    redis.call('HINCRBY', KEYS[2], ARGV[2], 1)
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[3])
+"""
+
+# KEYS: snapshot, tasks hash
+_FORGET_TASK = """
+local prev = redis.call('GET', KEYS[1])
+if prev then
+    redis.call('HINCRBY', KEYS[2], cjson.decode(prev)['status'], -1)
+    redis.call('DEL', KEYS[1])
+end
+"""
+
+
+# ------------------------------------------------------------------ #
+# Task status gauges                                                  #
+# ------------------------------------------------------------------ #
+
+def track_task_status(pipe, snapshot_key: str, message: str, status: str, ttl: int) -> None:
+    """Queue the snapshot swap + gauge move on an existing Redis pipeline."""
+    pipe.eval(_TRACK_TASK_STATUS, 2, snapshot_key, TASKS_KEY, message, status, ttl)
+
+
+async def forget_task(snapshot_key: str) -> None:
+    """Remove a deleted task from its status gauge."""
+    try:
+        await get_redis().eval(_FORGET_TASK, 2, snapshot_key, TASKS_KEY)
+    except Exception as exc:
+        logger.warning("metrics.counters.forget_failed", extra={"error": str(exc)})
+
+
+# ------------------------------------------------------------------ #
+# Execution counters (staged until commit)                            #
+# ------------------------------------------------------------------ #
+
+def record_execution_status(
+    db: AsyncSession,
+    *,
+    previous: ExecutionStatus | None,
+    new: ExecutionStatus,
+    runtime_ms: int | None = None,
+) -> None:
+    staged = db.info.setdefault("metrics_pending", [])
+    if previous is not None and previous != new:
+        staged.append((previous.value, -1))
+    if previous != new:
+        staged.append((new.value, 1))
+    if new == ExecutionStatus.COMPLETED and runtime_ms is not None:
+        staged.append((RUNTIME_SUM_FIELD, runtime_ms))
+        staged.append((RUNTIME_COUNT_FIELD, 1))
+
+
+async def flush_metrics(db: AsyncSession) -> None:
+    """Send the deltas of every commit since the last flush.  Never raises."""
+    committed = db.info.pop("metrics_committed", None)
+    if not committed:
+        return
+    try:
+        async with get_redis().pipeline(transaction=False) as pipe:
+            for field, delta in committed:
+                pipe.hincrby(EXECUTIONS_KEY, field, delta)
+            await pipe.execute()
+    except Exception as exc:
+        logger.warning("metrics.counters.flush_failed", extra={"error": str(exc)})
+
+
+@event.listens_for(Session, "after_commit")
+def _promote_pending(session: Session) -> None:
+    pending = session.info.pop("metrics_pending", None)
+    if pending:
+        session.info.setdefault("metrics_committed", []).extend(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop("metrics_pending", None)
+
+
+# ------------------------------------------------------------------ #
+# Reads and reconciliation                                            #
+# ------------------------------------------------------------------ #
+
+async def read_counters() -> tuple[dict, dict]:
+    async with get_redis().pipeline(transaction=False) as pipe:
+        pipe.hgetall(TASKS_KEY)
+        pipe.hgetall(EXECUTIONS_KEY)
+        tasks, executions = await pipe.execute()
+    return tasks, executions
+
+
+async def reconcile_counters(db: AsyncSession) -> dict:
+    """
+    Overwrite the counters with exact values from the DB — two GROUP BY
+    queries, run off the request path.  Returns the per-field drift that
+    was corrected.
+    """
+    from backend.models.execution import Execution
+    from backend.models.task import Task
+
+    task_rows = await db.execute(select(Task.status, func.count()).group_by(Task.status))
+    task_counts = {status.value: 0 for status in TaskStatus}
+    task_counts.update({status.value: count for status, count in task_rows.all()})
+
+    exec_rows = await db.execute(
+        select(Execution.status, func.count()).group_by(Execution.status)
+    )
+    exec_counts = {status.value: 0 for status in ExecutionStatus}
+    exec_counts.update({status.value: count for status, count in exec_rows.all()})
+
+    runtime = await db.execute(
+        select(func.coalesce(func.sum(Execution.runtime_ms), 0), func.count(Execution.runtime_ms))
+        .where(Execution.status == ExecutionStatus.COMPLETED)
+    )
+    runtime_sum, runtime_count = runtime.one()
+    exec_counts[RUNTIME_SUM_FIELD] = int(runtime_sum)
+    exec_counts[RUNTIME_COUNT_FIELD] = runtime_count
+
+    current_tasks, current_execs = await read_counters()
+    drift = {
+        **{f"tasks_{k.lower()}": v - int(current_tasks.get(k, 0)) for k, v in task_counts.items()},
+        **{f"executions_{k.lower()}": v - int(current_execs.get(k, 0)) for k, v in exec_counts.items()},
+    }
+
+    async with get_redis().pipeline(transaction=True) as pipe:
+        pipe.hset(TASKS_KEY, mapping=task_counts)
+        pipe.hset(EXECUTIONS_KEY, mapping=exec_counts)
+        await pipe.execute()
+
+    return {k: v for k, v in drift.items() if v}
@@ -4,6 +4,8 @@ from sqlalchemy import text
 
 from backend.db.session import get_async_db
 from backend.queue.redis_client import get_redis
+from backend.ml.circuit_breaker import get_circuit_breaker
+from backend.ml.providers.registry import get_providers
 
 router = APIRouter(prefix="/health", tags=["Monitoring"])
 
@@ -37,4 +39,15 @@ async def health_check(
         health["redis"] = f"error: {str(e)}"
         health["status"] = "degraded"
 
+    # Provider circuit breakers (shared state in Redis)
+    try:
+        providers = await get_circuit_breaker().snapshot(
+            [provider.provider_name for provider in get_providers()]
+        )
+        health["providers"] = providers
+        if any(p["state"] != "closed" for p in providers.values()):
+            health["status"] = "degraded"
+    except Exception as e:
+        health["providers"] = f"error: {str(e)}"
+
     return health
\ No newline at end of file
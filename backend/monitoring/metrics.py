@@ -1,13 +1,18 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from fastapi import APIRouter, Response
 
-from backend.db.session import get_async_db
+from backend.db.session import AsyncSessionLocal
 from backend.queue.redis_client import get_redis
+from backend.queue.routing import BROKER_PRIORITY_STEPS
 from backend.core.config import settings
 from backend.core.enums import TaskStatus, ExecutionStatus
-from backend.models.task import Task
-from backend.models.execution import Execution
+from backend.ml.cache import METRICS_KEY as COMPLETION_CACHE_METRICS_KEY
+from backend.monitoring.counters import (
+    RUNTIME_COUNT_FIELD,
+    RUNTIME_SUM_FIELD,
+    read_counters,
+    reconcile_counters,
+)
+from backend.monitoring.prometheus import render_latest
 
 router = APIRouter(prefix="/metrics", tags=["Monitoring"])
 
@@ -17,60 +22,88 @@ router = APIRouter(prefix="/metrics", tags=["Monitoring"])
 # ------------------------------------------------------------------ #
 
 @router.get("/")
-async def get_metrics(
-    db: AsyncSession = Depends(get_async_db),
-):
+async def get_metrics():
+    """
+    O(1) regardless of history: counters are maintained on every lifecycle
+    transition (monitoring/counters.py) instead of being counted here.
+    """
     metrics = {}
 
     # ------------------------------------------------------------------ #
-    # Task Status Counts                                                   #
+    # Task / Execution Counters (Redis hashes)                             #
     # ------------------------------------------------------------------ #
     try:
+        task_counts, exec_counts = await read_counters()
+
+        # Nothing tracked yet (fresh Redis) — seed from the DB once
+        if not task_counts and not exec_counts:
+            async with AsyncSessionLocal() as db:
+                await reconcile_counters(db)
+            task_counts, exec_counts = await read_counters()
+
         for task_status in TaskStatus:
-            result = await db.execute(
-                select(func.count(Task.id)).where(Task.status == task_status)
-            )
-            metrics[f"tasks_{task_status.value.lower()}"] = result.scalar()
-    except Exception as e:
-        metrics["tasks_error"] = str(e)
+            metrics[f"tasks_{task_status.value.lower()}"] = int(task_counts.get(task_status.value, 0))
 
-    # ------------------------------------------------------------------ #
-    # Execution Status Counts                                              #
-    # ------------------------------------------------------------------ #
-    try:
         for exec_status in ExecutionStatus:
-            result = await db.execute(
-                select(func.count(Execution.id)).where(Execution.status == exec_status)
-            )
-            metrics[f"executions_{exec_status.value.lower()}"] = result.scalar()
+            metrics[f"executions_{exec_status.value.lower()}"] = int(exec_counts.get(exec_status.value, 0))
+
+        runtime_sum = int(exec_counts.get(RUNTIME_SUM_FIELD, 0))
+        runtime_count = int(exec_counts.get(RUNTIME_COUNT_FIELD, 0))
+        metrics["avg_runtime_ms"] = round(runtime_sum / runtime_count, 2) if runtime_count else 0
     except Exception as e:
-        metrics["executions_error"] = str(e)
+        metrics["counters_error"] = str(e)
 
     # ------------------------------------------------------------------ #
-    # Execution Latency (avg runtime_ms)                                   #
+    # Queue Depth (Redis, summed over broker priority steps)               #
     # ------------------------------------------------------------------ #
     try:
-        result = await db.execute(
-            select(func.avg(Execution.runtime_ms)).where(
-                Execution.status == ExecutionStatus.COMPLETED
-            )
+        queues = (
+            settings.CELERY_DEFAULT_QUEUE,
+            settings.CELERY_HIGH_PRIORITY_QUEUE,
+            settings.CELERY_LOW_PRIORITY_QUEUE,
         )
-        avg_runtime = result.scalar()
-        metrics["avg_runtime_ms"] = round(avg_runtime, 2) if avg_runtime else 0
+        async with get_redis().pipeline(transaction=False) as pipe:
+            for queue in queues:
+                for step in BROKER_PRIORITY_STEPS:
+                    # kombu's Redis transport: step 0 is the bare queue name
+                    pipe.llen(f"{queue}:{step}" if step else queue)
+            lengths = await pipe.execute()
+
+        per_queue = len(BROKER_PRIORITY_STEPS)
+        metrics["queue_depth"] = {
+            queue: sum(lengths[i * per_queue:(i + 1) * per_queue])
+            for i, queue in enumerate(queues)
+        }
     except Exception as e:
-        metrics["avg_runtime_ms_error"] = str(e)
+        metrics["queue_depth_error"] = str(e)
 
     # ------------------------------------------------------------------ #
-    # Queue Depth (Redis)                                                  #
+    # Completion Cache (aggregated across workers in Redis)                #
     # ------------------------------------------------------------------ #
     try:
         redis = get_redis()
-        metrics["queue_depth"] = {
-            settings.CELERY_DEFAULT_QUEUE: await redis.llen(settings.CELERY_DEFAULT_QUEUE),
-            settings.CELERY_HIGH_PRIORITY_QUEUE: await redis.llen(settings.CELERY_HIGH_PRIORITY_QUEUE),
-            settings.CELERY_LOW_PRIORITY_QUEUE: await redis.llen(settings.CELERY_LOW_PRIORITY_QUEUE),
+        counters = await redis.hgetall(COMPLETION_CACHE_METRICS_KEY)
+        hits = int(counters.get("hits", 0))
+        misses = int(counters.get("misses", 0))
+        metrics["completion_cache"] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else 0,
         }
     except Exception as e:
-        metrics["queue_depth_error"] = str(e)
+        metrics["completion_cache_error"] = str(e)
+
+    return metrics
+
+# ------------------------------------------------------------------ #
+# Prometheus Exposition (latency histograms, text format)             #
+# ------------------------------------------------------------------ #
 
-    return metrics
\ No newline at end of file
+@router.get("/prometheus")
+async def get_prometheus_metrics():
+    """
+    Histograms and counters from monitoring/prometheus.py, aggregated across
+    API and worker processes when PROMETHEUS_MULTIPROC_DIR is set.
+    """
+    body, content_type = render_latest()
+    return Response(content=body, media_type=content_type)
@@ -0,0 +1,156 @@
+"""
+Prometheus instrumentation shared by the API and the Celery workers.
+
+With several processes per host (uvicorn workers, Celery prefork) each
+process only sees its own samples.  Set PROMETHEUS_MULTIPROC_DIR to a
+directory shared by all processes on the host and wiped on every deploy;
+samples are then written there and `render_latest` aggregates every
+process's files, so histograms and p50/p99 are exact across the pool.
+Without it, the endpoint reports the serving process only.
+"""
+import functools
+import inspect
+import os
+import time
+
+from backend.core.config import settings
+
+# prometheus_client picks its storage mode at import time
+if settings.PROMETHEUS_MULTIPROC_DIR:
+    os.makedirs(settings.PROMETHEUS_MULTIPROC_DIR, exist_ok=True)
+    os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", settings.PROMETHEUS_MULTIPROC_DIR)
+
+from prometheus_client import (  # noqa: E402
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# Seconds → hours: queue waits and long generations need the wide tail
+_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 900, 3600)
+_DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+
+
+TASK_QUEUE_WAIT = Histogram(
+    "taskforge_task_queue_wait_seconds",
+    "Time from submission to first execution start (submitted_at → started_at).",
+    ["task_type"],
+    buckets=_LATENCY_BUCKETS,
+)
+
+TASK_LATENCY = Histogram(
+    "taskforge_task_latency_seconds",
+    "End-to-end task latency (submitted_at → completed_at), by final status.",
+    ["task_type", "status"],
+    buckets=_LATENCY_BUCKETS,
+)
+
+PROVIDER_LATENCY = Histogram(
+    "taskforge_provider_request_seconds",
+    "Latency of individual provider calls, including failed attempts.",
+    ["provider", "model", "operation", "outcome"],
+    buckets=_LATENCY_BUCKETS,
+)
+
+PROVIDER_TOKENS = Counter(
+    "taskforge_provider_tokens",
+    "Tokens processed by providers.",
+    ["provider", "model", "kind"],
+)
+
+PROVIDER_HEDGES = Counter(
+    "taskforge_provider_hedges",
+    "Hedged completion requests by outcome (primary_won, hedge_won, budget_exhausted).",
+    ["model", "outcome"],
+)
+
+DB_QUERY_TIME = Histogram(
+    "taskforge_db_method_seconds",
+    "Wall time spent in repository methods (queries + commits).",
+    ["method"],
+    buckets=_DB_BUCKETS,
+)
+
+
+# ------------------------------------------------------------------ #
+# Helpers                                                              #
+# ------------------------------------------------------------------ #
+
+def observe_task_started(task) -> None:
+    if task.submitted_at and task.started_at:
+        TASK_QUEUE_WAIT.labels(_enum_value(task.task_type)).observe(
+            max((task.started_at - task.submitted_at).total_seconds(), 0)
+        )
+
+
+def observe_task_finished(task) -> None:
+    if task.submitted_at and task.completed_at:
+        TASK_LATENCY.labels(_enum_value(task.task_type), _enum_value(task.status)).observe(
+            max((task.completed_at - task.submitted_at).total_seconds(), 0)
+        )
+
+
+def observe_provider_call(
+    *,
+    provider: str,
+    model: str,
+    operation: str,
+    seconds: float,
+    ok: bool,
+    prompt_tokens: int = 0,
+    completion_tokens: int = 0,
+) -> None:
+    PROVIDER_LATENCY.labels(provider, model, operation, "success" if ok else "error").observe(seconds)
+    if prompt_tokens:
+        PROVIDER_TOKENS.labels(provider, model, "prompt").inc(prompt_tokens)
+    if completion_tokens:
+        PROVIDER_TOKENS.labels(provider, model, "completion").inc(completion_tokens)
+
+
+def observe_hedge(*, model: str, outcome: str) -> None:
+    PROVIDER_HEDGES.labels(model, outcome).inc()
+
+
+def instrument_repository(cls):
+    """Class decorator: time every public coroutine method under `Class.method`."""
+    for name, method in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.iscoroutinefunction(method):
+            continue
+        setattr(cls, name, _timed(method, DB_QUERY_TIME.labels(f"{cls.__name__}.{name}")))
+    return cls
+
+
+def _timed(method, histogram):
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        t0 = time.perf_counter()
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            histogram.observe(time.perf_counter() - t0)
+    return wrapper
+
+
+def _enum_value(value) -> str:
+    return value.value if hasattr(value, "value") else str(value)
+
+
+# ------------------------------------------------------------------ #
+# Exposition                                                           #
+# ------------------------------------------------------------------ #
+
+def render_latest() -> tuple[bytes, str]:
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: int) -> None:
+    """Drop a dead worker's live gauges (histograms/counters are kept)."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,99 @@
+"""
+In-process execution tracing for the worker path.
+
+`_run_task` opens an ExecutionTrace and activates it for the current asyncio
+context; code further down the call chain (ModelService) adds stages and
+attributes through the module-level helpers without the trace being threaded
+through every signature.  Outside an active trace (API requests) the helpers
+are no-ops.
+
+The compact dict from `as_dict()` is persisted on `Execution.metrics` and
+served by GET /executions/{id}/trace:
+
+    {
+        "v": 1,
+        "total_ms": 1843.2,
+        "stages": {"db_setup": 6.1, "model_resolution": 1.4,
+                   "provider_call": 1821.7, "result_persistence": 9.8},
+        "attrs": {"provider": "openrouter", "model_id": "...",
+                  "prompt_tokens": 57, "completion_tokens": 412}
+    }
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+TRACE_FORMAT_VERSION = 1
+
+# Canonical stage names, in pipeline order
+STAGE_DB_SETUP = "db_setup"
+STAGE_MODEL_RESOLUTION = "model_resolution"
+STAGE_PROVIDER_CALL = "provider_call"
+STAGE_RESULT_PERSISTENCE = "result_persistence"
+
+_current: ContextVar["ExecutionTrace | None"] = ContextVar("execution_trace", default=None)
+
+
+class ExecutionTrace:
+    """Wall-clock stage timings plus a few flat attributes for one attempt."""
+
+    __slots__ = ("_t0", "_stages", "_attrs")
+
+    def __init__(self):
+        self._t0 = time.perf_counter()
+        self._stages: dict[str, float] = {}
+        self._attrs: dict = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        # Repeated stages (e.g. a retried provider call) accumulate
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - t0) * 1000
+            self._stages[name] = self._stages.get(name, 0.0) + elapsed
+
+    def annotate(self, **attrs) -> None:
+        self._attrs.update({k: v for k, v in attrs.items() if v is not None})
+
+    @contextmanager
+    def activate(self) -> Iterator["ExecutionTrace"]:
+        token = _current.set(self)
+        try:
+            yield self
+        finally:
+            _current.reset(token)
+
+    def as_dict(self) -> dict:
+        return {
+            "v": TRACE_FORMAT_VERSION,
+            "total_ms": round((time.perf_counter() - self._t0) * 1000, 1),
+            "stages": {name: round(ms, 1) for name, ms in self._stages.items()},
+            "attrs": dict(self._attrs),
+        }
+
+
+# ------------------------------------------------------------------ #
+# Context helpers (no-ops without an active trace)                     #
+# ------------------------------------------------------------------ #
+
+def current_trace() -> ExecutionTrace | None:
+    return _current.get()
+
+
+@contextmanager
+def trace_stage(name: str) -> Iterator[None]:
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+    with trace.stage(name):
+        yield
+
+
+def trace_annotate(**attrs) -> None:
+    trace = _current.get()
+    if trace is not None:
+        trace.annotate(**attrs)
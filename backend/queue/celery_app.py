@@ -1,6 +1,7 @@
 from celery import Celery
 from kombu import Queue
 from backend.core.config import settings
+from backend.queue.routing import BROKER_DEFAULT_PRIORITY, BROKER_PRIORITY_STEPS
 
 
 # Create Celery application instance
@@ -22,6 +23,14 @@ celery_app.conf.update(
         Queue(settings.CELERY_LOW_PRIORITY_QUEUE),
     ),
 
+    # Priority (Redis emulates it with one list per step; 0 = most urgent)
+    broker_transport_options={
+        "priority_steps": BROKER_PRIORITY_STEPS,
+        "sep": ":",
+        "queue_order_strategy": "priority",  # -Q order is strict preference
+    },
+    task_default_priority=BROKER_DEFAULT_PRIORITY,
+
     # Serialization (Security Critical)
     task_serializer="json",
     result_serializer="json",
@@ -32,6 +41,15 @@ celery_app.conf.update(
     worker_prefetch_multiplier=1,     # Prevents worker hoarding tasks
     task_reject_on_worker_lost=True,  # Re-queue if worker crashes
 
+    # Periodic jobs (run `celery -A backend.queue.celery_app:celery_app beat`)
+    beat_schedule={
+        "reconcile-metrics": {
+            "task": "app.queue.tasks.reconcile_metrics",
+            "schedule": settings.METRICS_RECONCILE_INTERVAL_SECONDS,
+            "options": {"queue": settings.CELERY_LOW_PRIORITY_QUEUE},
+        },
+    },
+
     # Result Expiry
     result_expires=3600,  # 1 hour
 
@@ -0,0 +1,112 @@
+import json
+import logging
+from typing import AsyncIterator
+
+from backend.core.config import settings
+from backend.queue.redis_client import get_redis
+from backend.monitoring.counters import track_task_status
+
+logger = logging.getLogger(__name__)
+
+
+def user_channel(user_id: str) -> str:
+    return f"taskforge:task-events:user:{user_id}"
+
+
+def task_channel(task_id: str) -> str:
+    return f"taskforge:task-events:task:{task_id}"
+
+
+def snapshot_key(task_id: str) -> str:
+    return f"taskforge:task-status:{task_id}"
+
+
+def task_event(task) -> dict:
+    """Wire format shared by pub/sub messages and the status snapshot."""
+    return {
+        "task_id": str(task.id),
+        "user_id": str(task.user_id),
+        "status": task.status.value if hasattr(task.status, "value") else task.status,
+        "retry_count": task.retry_count,
+        "error_message": task.error_message,
+        "started_at": task.started_at.isoformat() if task.started_at else None,
+        "completed_at": task.completed_at.isoformat() if task.completed_at else None,
+    }
+
+
+async def publish_task_status(task) -> None:
+    """
+    Push a status transition to the owner's channel and the task's channel,
+    and refresh the last-known snapshot that new subscribers start from.
+    Called after the transition is committed; never raises.
+    """
+    await publish_task_events([task_event(task)])
+
+
+async def publish_task_events(events: list[dict]) -> None:
+    """Bulk variant — one pipelined round trip for any number of events."""
+    if not events:
+        return
+    try:
+        async with get_redis().pipeline(transaction=False) as pipe:
+            for event in events:
+                message = json.dumps(event)
+                # Swaps the snapshot and moves the status gauges (/metrics)
+                track_task_status(
+                    pipe,
+                    snapshot_key(event["task_id"]),
+                    message,
+                    event["status"],
+                    settings.TASK_STATUS_SNAPSHOT_TTL_SECONDS,
+                )
+                pipe.publish(user_channel(event["user_id"]), message)
+                pipe.publish(task_channel(event["task_id"]), message)
+            await pipe.execute()
+    except Exception as exc:
+        logger.warning(
+            "task_events.publish_failed",
+            extra={"count": len(events), "error": str(exc)},
+        )
+
+
+async def get_task_snapshot(task_id: str) -> dict | None:
+    raw = await get_redis().get(snapshot_key(task_id))
+    return json.loads(raw) if raw else None
+
+
+async def subscribe_task_events(
+    *,
+    user_id: str,
+    task_id: str | None = None,
+    initial: dict | None = None,
+    heartbeat_seconds: float | None = None,
+) -> AsyncIterator[dict | None]:
+    """
+    Yield status events for one task, or for every task of `user_id`.
+
+    For a single task the current snapshot (or `initial` when none is
+    cached) is yielded first, after subscribing so no transition can fall
+    in between.  Yields None
+    every `heartbeat_seconds` without traffic so callers can keep the
+    connection alive and notice disconnects.
+    """
+    heartbeat_seconds = heartbeat_seconds or settings.TASK_EVENTS_HEARTBEAT_SECONDS
+    channel = task_channel(task_id) if task_id else user_channel(user_id)
+
+    pubsub = get_redis().pubsub(ignore_subscribe_messages=True)
+    await pubsub.subscribe(channel)
+    try:
+        if task_id:
+            snapshot = await get_task_snapshot(task_id) or initial
+            if snapshot:
+                yield snapshot
+
+        while True:
+            message = await pubsub.get_message(timeout=heartbeat_seconds)
+            if message is None:
+                yield None
+                continue
+            yield json.loads(message["data"])
+    finally:
+        await pubsub.unsubscribe(channel)
+        await pubsub.aclose()
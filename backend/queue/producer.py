@@ -1,5 +1,6 @@
-from backend.queue.celery_app import celery_app
 from backend.core.config import settings
+from backend.queue.celery_app import celery_app
+from backend.queue.routing import broker_priority, select_queue
 
 
 class Producer:
@@ -9,11 +10,97 @@ class Producer:
         *,
         task_id: str,
         payload: dict,
+        task_type: str | None = None,
         priority: int | None = None,
+        countdown: float | None = None,
     ):
+        priority = priority or 0
         return celery_app.send_task(
             "app.queue.tasks.execute_ai_task",
             args=[task_id, payload],
-            queue=settings.CELERY_DEFAULT_QUEUE,
-            priority=priority,
-        )
\ No newline at end of file
+            queue=select_queue(task_type=task_type, priority=priority),
+            priority=broker_priority(priority),
+            countdown=countdown,
+        )
+
+    def enqueue_tasks(self, items: list[dict]) -> dict[str, str]:
+        """
+        Publish many tasks over one broker connection/channel instead of
+        acquiring one per message.  Each item has the enqueue_task kwargs.
+        Returns {task_id: error} for the messages that could not be sent —
+        every unsent one when the connection itself fails.  Never raises.
+        """
+        errors: dict[str, str] = {}
+        sent: set[str] = set()
+        try:
+            with celery_app.producer_or_acquire() as producer:
+                for item in items:
+                    priority = item.get("priority") or 0
+                    try:
+                        celery_app.send_task(
+                            "app.queue.tasks.execute_ai_task",
+                            args=[item["task_id"], item["payload"]],
+                            queue=select_queue(task_type=item.get("task_type"), priority=priority),
+                            priority=broker_priority(priority),
+                            countdown=item.get("countdown"),
+                            producer=producer,
+                        )
+                        sent.add(item["task_id"])
+                    except Exception as exc:
+                        errors[item["task_id"]] = str(exc)
+        except Exception as exc:
+            _fail_unsent(errors, [item["task_id"] for item in items], sent, exc)
+        return errors
+
+    def enqueue_batch(self, items: list[dict], *, batch_size: int | None = None) -> dict[str, str]:
+        """
+        Publish tasks as `execute_ai_task_batch` messages carrying up to
+        `batch_size` tasks each (TASK_BATCH_MESSAGE_SIZE by default), so the
+        broker round trip, ack and worker session setup are paid per batch.
+        Items are grouped by destination queue and broker priority first.
+        Each item has the enqueue_task kwargs.  Returns {task_id: error}
+        for every task whose message could not be sent, as enqueue_tasks.
+        Never raises.
+        """
+        batch_size = batch_size or settings.TASK_BATCH_MESSAGE_SIZE
+
+        groups: dict[tuple[str, int], list[dict]] = {}
+        for item in items:
+            priority = item.get("priority") or 0
+            key = (
+                select_queue(task_type=item.get("task_type"), priority=priority),
+                broker_priority(priority),
+            )
+            groups.setdefault(key, []).append(
+                {"task_id": item["task_id"], "payload": item["payload"]}
+            )
+
+        errors: dict[str, str] = {}
+        sent: set[str] = set()
+        try:
+            with celery_app.producer_or_acquire() as producer:
+                for (queue, priority), group in groups.items():
+                    for start in range(0, len(group), batch_size):
+                        chunk = group[start:start + batch_size]
+                        try:
+                            celery_app.send_task(
+                                "app.queue.tasks.execute_ai_task_batch",
+                                args=[chunk],
+                                queue=queue,
+                                priority=priority,
+                                producer=producer,
+                            )
+                            sent.update(item["task_id"] for item in chunk)
+                        except Exception as exc:
+                            for item in chunk:
+                                errors[item["task_id"]] = str(exc)
+        except Exception as exc:
+            _fail_unsent(errors, [item["task_id"] for item in items], sent, exc)
+        return errors
+
+
+def _fail_unsent(errors: dict[str, str], task_ids: list[str], sent: set[str], exc: Exception) -> None:
+    # Connection-level failure (acquire or release): nothing unsent went out
+    for task_id in task_ids:
+        if task_id not in sent:
+            errors.setdefault(task_id, str(exc))
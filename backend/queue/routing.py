@@ -0,0 +1,41 @@
+from backend.core.config import settings
+from backend.core.enums import TaskType
+
+# Redis transport: 0 is the highest broker priority, 9 the lowest
+BROKER_PRIORITY_STEPS = list(range(10))
+BROKER_DEFAULT_PRIORITY = 5
+
+# Queue a task type lands on when its priority is in the normal band
+_TASK_TYPE_QUEUES = {
+    TaskType.INFERENCE: lambda: settings.CELERY_DEFAULT_QUEUE,
+    TaskType.ANALYSIS: lambda: settings.CELERY_LOW_PRIORITY_QUEUE,
+    TaskType.TRAINING: lambda: settings.CELERY_LOW_PRIORITY_QUEUE,
+}
+
+
+def select_queue(*, task_type: str, priority: int = 0) -> str:
+    """
+    Pick the broker queue for a task.
+
+    Explicit priority bands win: `priority >= TASK_PRIORITY_HIGH_THRESHOLD`
+    goes to the high queue, `priority <= TASK_PRIORITY_LOW_THRESHOLD` to the
+    low queue.  Everything in between is routed by task type, keeping bulk
+    ANALYSIS/TRAINING work away from latency-sensitive INFERENCE jobs.
+    """
+    if priority >= settings.TASK_PRIORITY_HIGH_THRESHOLD:
+        return settings.CELERY_HIGH_PRIORITY_QUEUE
+    if priority <= settings.TASK_PRIORITY_LOW_THRESHOLD:
+        return settings.CELERY_LOW_PRIORITY_QUEUE
+
+    resolve = _TASK_TYPE_QUEUES.get(task_type)
+    return resolve() if resolve else settings.CELERY_DEFAULT_QUEUE
+
+
+def broker_priority(priority: int = 0) -> int:
+    """
+    Map `Task.priority` (higher = more urgent, 0 = normal) onto the Redis
+    broker's priority steps (0 = most urgent), so ordering also holds
+    within a single queue.
+    """
+    step = BROKER_DEFAULT_PRIORITY - priority
+    return max(BROKER_PRIORITY_STEPS[0], min(BROKER_PRIORITY_STEPS[-1], step))
@@ -0,0 +1,98 @@
+import json
+import logging
+from typing import AsyncIterator
+
+from backend.core.config import settings
+from backend.queue.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Event names written to the stream — the SSE endpoint relays them verbatim
+EVENT_CHUNK = "chunk"
+EVENT_RETRY = "retry"
+EVENT_DONE = "done"
+EVENT_ERROR = "error"
+
+TERMINAL_EVENTS = frozenset({EVENT_DONE, EVENT_ERROR})
+
+
+def stream_key(task_id: str) -> str:
+    return f"taskforge:stream:{task_id}"
+
+
+class TaskStream:
+    """
+    Worker-side publisher for incremental task output.
+
+    Each event is one XADD entry `{event, data}` on `taskforge:stream:<id>`.
+    The stream is capped and expires on its own, so readers that arrive late
+    still replay everything from the start.  Publishing never raises — a
+    Redis hiccup must not fail the inference it is reporting on.
+    """
+
+    def __init__(self, task_id: str):
+        self.task_id = task_id
+        self.key = stream_key(task_id)
+
+    async def publish_chunk(self, text: str) -> None:
+        await self._publish(EVENT_CHUNK, {"text": text})
+
+    async def publish_retry(self, error_message: str) -> None:
+        # Clients discard text received so far; the next attempt restarts it
+        await self._publish(EVENT_RETRY, {"error": error_message})
+
+    async def publish_done(self, result: dict) -> None:
+        await self._publish(EVENT_DONE, result)
+
+    async def publish_error(self, error_message: str) -> None:
+        await self._publish(EVENT_ERROR, {"error": error_message})
+
+    async def _publish(self, event: str, data: dict) -> None:
+        try:
+            async with get_redis().pipeline(transaction=False) as pipe:
+                pipe.xadd(
+                    self.key,
+                    {"event": event, "data": json.dumps(data, default=str)},
+                    maxlen=settings.TASK_STREAM_MAXLEN,
+                    approximate=True,
+                )
+                pipe.expire(self.key, settings.TASK_STREAM_TTL_SECONDS)
+                await pipe.execute()
+        except Exception as exc:
+            logger.warning(
+                "task_stream.publish_failed",
+                extra={"task_id": self.task_id, "event": event, "error": str(exc)},
+            )
+
+
+async def stream_exists(task_id: str) -> bool:
+    return bool(await get_redis().exists(stream_key(task_id)))
+
+
+async def read_task_stream(
+    task_id: str,
+    last_id: str = "0",
+    block_ms: int | None = None,
+) -> AsyncIterator[tuple[str, str, dict] | None]:
+    """
+    Yield `(entry_id, event, data)` for every entry after `last_id`, stopping
+    after a terminal event.  Yields None whenever XREAD times out so callers
+    can emit heartbeats and check for disconnects.
+    """
+    redis = get_redis()
+    key = stream_key(task_id)
+    block_ms = block_ms or settings.TASK_STREAM_BLOCK_MS
+
+    while True:
+        response = await redis.xread({key: last_id}, count=100, block=block_ms)
+        if not response:
+            yield None
+            continue
+
+        for _, entries in response:
+            for entry_id, fields in entries:
+                last_id = entry_id
+                event = fields.get("event", EVENT_CHUNK)
+                yield entry_id, event, json.loads(fields.get("data") or "{}")
+                if event in TERMINAL_EVENTS:
+                    return
@@ -1,15 +1,31 @@
 import asyncio
+import logging
+import random
 import time
-
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from typing import NamedTuple
 
 from backend.queue.celery_app import celery_app
 from backend.core.config import settings
-from backend.core.enums import TaskStatus
+from backend.core.enums import ExecutionStatus, TaskStatus
 from backend.services.execution_service import ExecutionService
 from backend.services.task_service import TaskService
 from backend.services.result_service import ResultService
+from backend.queue.streams import TaskStream
+from backend.queue.notifications import publish_task_events, publish_task_status, task_event
+from backend.queue.producer import Producer
+from backend.monitoring.counters import flush_metrics, reconcile_counters
+from backend.monitoring.prometheus import observe_task_finished, observe_task_started
+from backend.monitoring.tracing import (
+    STAGE_DB_SETUP,
+    STAGE_RESULT_PERSISTENCE,
+    ExecutionTrace,
+)
+from backend.core.exceptions import TaskExecutionError, TaskRetryLimitError
+from backend.ml.rate_limiter import retry_after_hint
 from backend.workers.worker_app.job_runner import JobRunner
+from backend.workers.worker_app.runtime import runtime
+
+logger = logging.getLogger(__name__)
 
 
 @celery_app.task(
@@ -19,106 +35,507 @@ from backend.workers.worker_app.job_runner import JobRunner
     default_retry_delay=5,
 )
 def execute_ai_task(self, task_id: str, payload: dict):
-    asyncio.run(_run_task(self, task_id, payload))
+    # Runs on the process-wide loop — engine and provider clients are reused
+    # across tasks and retries (see workers/worker_app/runtime.py)
+    runtime.run(_run_task(self, task_id, payload))
 
 
-async def _run_task(task_self, task_id: str, payload: dict):
+@celery_app.task(
+    bind=True,
+    name="app.queue.tasks.execute_ai_task_batch",
+    max_retries=3,
+    default_retry_delay=5,
+)
+def execute_ai_task_batch(self, items: list[dict]):
+    # items: [{"task_id": ..., "payload": ...}] (see Producer.enqueue_batch)
+    runtime.run(_run_task_batch(self, items))
 
-    # Fresh engine per task run — avoids event loop conflicts on retry
-    engine = create_async_engine(settings.DATABASE_ASYNC_URL, pool_pre_ping=True)
-    session_factory = async_sessionmaker(
-        bind=engine,
-        expire_on_commit=False,
-        class_=AsyncSession,
-    )
 
-    try:
-        async with session_factory() as db:
+@celery_app.task(name="app.queue.tasks.reconcile_metrics")
+def reconcile_metrics():
+    # Scheduled by celery beat (see celery_app.py); corrects counter drift
+    return runtime.run(_reconcile_metrics())
 
-            task_service = TaskService()
-            execution_service = ExecutionService()
-            result_service = ResultService()
 
-            # worker_id is None until worker registration is implemented
-            execution = await execution_service.create_execution(
-                db,
-                task_id=task_id,
-                worker_id=None,
-            )
+async def _reconcile_metrics() -> dict:
+    async with runtime.session_factory() as db:
+        return await reconcile_counters(db)
 
-            start_time = time.time()
 
-            try:
-                # Fetch current task status before transitioning
-                task = await task_service.get_task(db, task_id)
+async def _run_task(task_self, task_id: str, payload: dict):
+    """
+    Unit of work: one transaction writes the pre-execution state (task
+    RUNNING + execution STARTED), one writes the outcome (task SUCCESS +
+    execution COMPLETED + result row, or the failure/retry equivalent).
+    Status events are published only after each commit.
 
-                # Only transition to RUNNING if not already RUNNING (handles retries)
-                if task.status != TaskStatus.RUNNING:
-                    await task_service.start_task_execution(db, task_id=task_id)
+    Stage timings are collected in an ExecutionTrace and stored on the
+    execution row in the outcome transaction (GET /executions/{id}/trace).
+    """
+    trace = ExecutionTrace()
+    with trace.activate():
+        return await _run_traced_task(task_self, task_id, payload, trace)
 
-                await execution_service.mark_execution_running(
-                    db,
-                    execution_id=str(execution.id),
-                )
 
-                # Delegate compute to job runner
-                task = await task_service.get_task(db, task_id)
+async def _run_traced_task(task_self, task_id: str, payload: dict, trace: ExecutionTrace):
+    async with runtime.session_factory() as db:
 
-                result = await JobRunner.get_coroutine(
-                    task_type=task.task_type,
-                    payload=payload,
-                    model_version_id=str(task.model_version_id) if task.model_version_id else None,
-                )
+        task_service = TaskService()
+        execution_service = ExecutionService()
+        result_service = ResultService()
+
+        # Opt-in per task: `"stream": true` in the input payload relays
+        # provider deltas to GET /tasks/{id}/stream as they arrive
+        stream = TaskStream(task_id) if payload.get("stream") else None
+
+        execution_id = None
+        start_time = time.time()
 
-                runtime_ms = int((time.time() - start_time) * 1000)
+        try:
+            # ---- Transaction 1: pre-execution state ------------------- #
+            with trace.stage(STAGE_DB_SETUP):
+                try:
+                    task = await task_service.start_task_execution(db, task_id=task_id, commit=False)
+                except TaskExecutionError:
+                    # Redelivered after a worker crash (acks_late) — already RUNNING
+                    task = await task_service.get_task(db, task_id)
+                    if task is None or task.status != TaskStatus.RUNNING:
+                        raise
 
-                # Transition task → SUCCESS
-                await task_service.complete_task_execution(db, task_id=task_id)
-                await execution_service.mark_execution_success(
+                # worker_id is None until worker registration is implemented
+                execution = await execution_service.create_execution(
                     db,
-                    execution_id=str(execution.id),
-                    runtime_ms=runtime_ms,
+                    task_id=task_id,
+                    worker_id=None,
+                    task=task,
+                    started=True,
+                    commit=False,
                 )
-                
-                # Store result
+                await db.commit()
+            execution_id = str(execution.id)
+            trace.annotate(task_type=task.task_type.value, attempt=task.retry_count + 1)
+            await publish_task_status(task)
+            await flush_metrics(db)
+            if task.retry_count == 0:
+                observe_task_started(task)   # queue wait: first attempt only
+
+            # Delegate compute to job runner
+            result = await JobRunner.get_coroutine(
+                task_type=task.task_type,
+                payload=payload,
+                model_version_id=str(task.model_version_id) if task.model_version_id else None,
+                on_chunk=stream.publish_chunk if stream else None,
+            )
+            output = result if isinstance(result, dict) else {"output": result}
+
+            runtime_ms = int((time.time() - start_time) * 1000)
+
+            # ---- Transaction 2: outcome (all or nothing) --------------- #
+            with trace.stage(STAGE_RESULT_PERSISTENCE):
+                task = await task_service.complete_task_execution(db, task_id=task_id, commit=False)
                 await result_service.store_result(
                     db,
                     task_id=task_id,
-                    execution_id=str(execution.id),
-                    output_summary=result if isinstance(result, dict) else {"output": result},
+                    execution_id=execution_id,
+                    output_summary=output,
+                    commit=False,
                 )
+                await db.flush()
+            await execution_service.mark_execution_success(
+                db,
+                execution_id=execution_id,
+                runtime_ms=runtime_ms,
+                metrics=trace.as_dict(),
+                commit=False,
+            )
+            await db.commit()
+            await publish_task_status(task)
+            await flush_metrics(db)
+            observe_task_finished(task)
+
+            # Terminal event goes out only after the result is persisted
+            if stream:
+                await stream.publish_done(output)
+
+            return result
 
-                return result
+        except Exception as exc:
+            await db.rollback()
 
-            except task_self.MaxRetriesExceededError as exc:
-                runtime_ms = int((time.time() - start_time) * 1000)
+            if execution_id is None and await _handle_setup_failure(
+                task_self, task_service, db, task_id, stream, exc
+            ):
+                return None
 
+            runtime_ms = int((time.time() - start_time) * 1000)
+            exhausted = (
+                isinstance(exc, task_self.MaxRetriesExceededError)
+                or task_self.request.retries >= task_self.max_retries
+            )
+
+            # ---- Failure transaction ----------------------------------- #
+            if execution_id is not None:
+                trace.annotate(error_type=type(exc).__name__)
                 await execution_service.mark_execution_failed(
                     db,
-                    execution_id=str(execution.id),
+                    execution_id=execution_id,
                     error_message=str(exc),
                     runtime_ms=runtime_ms,
+                    metrics=trace.as_dict(),
+                    commit=False,
                 )
-                await task_service.fail_task_execution(
+
+            if not exhausted:
+                # Transition task → RETRYING before handing back to Celery
+                try:
+                    task = await task_service.retry_task(db, task_id=task_id, commit=False)
+                except TaskRetryLimitError:
+                    # Task-level retry budget is spent even if Celery's is not
+                    exhausted = True
+
+            if exhausted:
+                task = await task_service.fail_task_execution(
                     db,
                     task_id=task_id,
                     error_message=str(exc),
+                    commit=False,
                 )
+
+            await db.commit()
+            await publish_task_status(task)
+            await flush_metrics(db)
+
+            if exhausted:
+                observe_task_finished(task)
+                if stream:
+                    await stream.publish_error(str(exc))
                 raise
 
-            except Exception as exc:
-                runtime_ms = int((time.time() - start_time) * 1000)
+            if stream:
+                await stream.publish_retry(str(exc))
+            raise task_self.retry(exc=exc, countdown=_retry_countdown(task_self, exc))
 
-                await execution_service.mark_execution_failed(
-                    db,
-                    execution_id=str(execution.id),
-                    error_message=str(exc),
-                    runtime_ms=runtime_ms,
-                )
 
-                # Transition task → RETRYING before handing back to Celery
-                await task_service.retry_task(db, task_id=task_id)
-                raise task_self.retry(exc=exc)
+async def _handle_setup_failure(task_self, task_service: TaskService, db, task_id: str, stream, exc) -> bool:
+    """
+    Transaction 1 never committed, so this attempt has no execution.
+
+    Returns True for a duplicate delivery (the task finished or was deleted
+    meanwhile) — the message is acked without retrying.  Returns False when
+    the task is RUNNING anyway (a redelivery after a worker crash); the
+    caller then handles it like any failed attempt.  Otherwise the task is
+    QUEUED or RETRYING: the message is retried while Celery's budget lasts,
+    then the task is failed.  Raises in both of those cases.
+    """
+    try:
+        task = await task_service.get_task(db, task_id)
+    except Exception:
+        status = None   # database unreachable — treat as not started
+    else:
+        if task is None or task_service.engine.is_terminal(task.status):
+            logger.info(
+                "tasks.duplicate_delivery",
+                extra={"task_id": task_id, "status": task.status.value if task else None},
+            )
+            return True
+        status = task.status
+
+    if status == TaskStatus.RUNNING:
+        return False
+
+    if task_self.request.retries < task_self.max_retries:
+        logger.warning("tasks.setup_failed", extra={"task_id": task_id, "error": str(exc)})
+        if stream:
+            await stream.publish_retry(str(exc))
+        raise task_self.retry(exc=exc, countdown=_retry_countdown(task_self, exc))
+
+    # Out of retries: fail it rather than leave it QUEUED / RETRYING forever
+    try:
+        failed = await task_service.fail_unstarted_tasks(
+            db, task_ids=[task_id], error_message=str(exc), commit=False
+        )
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        logger.exception("tasks.setup_fail_failed", extra={"task_id": task_id})
+        raise exc
+
+    for task in failed:
+        await publish_task_status(task)
+        observe_task_finished(task)
+    await flush_metrics(db)
+    if stream:
+        await stream.publish_error(str(exc))
+    logger.error("tasks.setup_exhausted", extra={"task_id": task_id, "error": str(exc)})
+    raise exc
+
+
+def _retry_countdown(task_self, exc: BaseException) -> float:
+    # Honour the provider's Retry-After when rate limited; jitter keeps
+    # workers that failed together from retrying together
+    delay = retry_after_hint(exc) or task_self.default_retry_delay
+    return delay * random.uniform(1.0, 1.5)
+
+
+# ------------------------------------------------------------------ #
+# Batch messages                                                       #
+# ------------------------------------------------------------------ #
+
+class _ItemOutcome(NamedTuple):
+    output: dict | None
+    error: Exception | None
+    runtime_ms: int
+    trace: dict
+
+
+async def _run_task_batch(task_self, items: list[dict]):
+    """
+    Many tasks per message, same two-transaction shape as `_run_task`:
+
+      1. every task → RUNNING (one UPDATE) + one STARTED execution each
+         (one INSERT), one commit;
+      2. inferences run concurrently, at most TASK_BATCH_CONCURRENCY at once;
+      3. every execution → COMPLETED / FAILED (one executemany UPDATE),
+         successes → SUCCESS (one UPDATE) + results (one INSERT), failures
+         → FAILED or RETRYING, all in one commit.
+
+    Failed tasks with retry budget left are re-enqueued individually as
+    `execute_ai_task` messages; the rest of the batch is not re-run.  If
+    either transaction itself fails, the whole message is retried — tasks
+    already RUNNING are picked up again — and once the message's retries
+    are spent every task still RUNNING is failed (see `_retry_or_fail_batch`).
+    Streaming is not supported here: tasks created with `"stream": true`
+    are always sent as single `execute_ai_task` messages.
+    """
+    payloads = {item["task_id"]: item["payload"] for item in items}
+
+    async with runtime.session_factory() as db:
+
+        task_service = TaskService()
+        execution_service = ExecutionService()
+        result_service = ResultService()
+
+        # ---- Transaction 1: pre-execution state ----------------------- #
+        try:
+            tasks = await task_service.start_tasks_execution(db, task_ids=list(payloads), commit=False)
+            executions = await execution_service.create_started_executions(db, tasks=tasks, commit=False)
+            await db.commit()
+        except Exception as exc:
+            await db.rollback()
+            await _retry_or_fail_batch(task_self, db, list(payloads), [], exc)
+
+        # Plain ids: a rollback of transaction 2 expires the ORM rows
+        started_ids = [str(task.id) for task in tasks]
+        execution_ids = [str(execution.id) for execution in executions]
+
+        await publish_task_events([task_event(task) for task in tasks])
+        await flush_metrics(db)
+        for task in tasks:
+            if task.retry_count == 0:
+                observe_task_started(task)
+
+        skipped = set(payloads) - {str(task.id) for task in tasks}
+        if skipped:
+            # Finished, deleted or picked up elsewhere since enqueue
+            logger.info("tasks.batch.skipped", extra={"task_ids": sorted(skipped)})
+
+        # ---- Compute ---------------------------------------------------- #
+        semaphore = asyncio.Semaphore(settings.TASK_BATCH_CONCURRENCY)
+        outcomes = await asyncio.gather(*(
+            _run_batch_item(semaphore, task, payloads[str(task.id)]) for task in tasks
+        ))
+
+        # ---- Transaction 2: outcomes ------------------------------------ #
+        succeeded = [
+            (task, execution, outcome)
+            for task, execution, outcome in zip(tasks, executions, outcomes)
+            if outcome.error is None
+        ]
+        failed = [
+            (task, execution, outcome)
+            for task, execution, outcome in zip(tasks, executions, outcomes)
+            if outcome.error is not None
+        ]
+
+        try:
+            await execution_service.finish_started_executions(
+                db,
+                rows=[
+                    {
+                        "id": execution_id,
+                        "status": ExecutionStatus.COMPLETED if outcome.error is None else ExecutionStatus.FAILED,
+                        "runtime_ms": outcome.runtime_ms,
+                        "metrics": outcome.trace,
+                        "error_message": None if outcome.error is None else str(outcome.error),
+                    }
+                    for execution_id, outcome in zip(execution_ids, outcomes)
+                ],
+                commit=False,
+            )
+            updated = await task_service.complete_tasks_execution(
+                db, task_ids=[str(task.id) for task, _, _ in succeeded], commit=False
+            )
+            await result_service.store_results(
+                db,
+                rows=[
+                    {"task_id": task.id, "execution_id": execution.id, "output_summary": outcome.output}
+                    for task, execution, outcome in succeeded
+                ],
+                commit=False,
+            )
+
+            retries, final_failures = [], []
+            for task, _, outcome in failed:
+                try:
+                    retried = await task_service.retry_task(db, task_id=str(task.id), commit=False)
+                    retries.append((retried, outcome.error))
+                except TaskRetryLimitError:
+                    final_failures.append(await task_service.fail_task_execution(
+                        db,
+                        task_id=str(task.id),
+                        error_message=str(outcome.error),
+                        commit=False,
+                    ))
+            await db.commit()
+        except Exception as exc:
+            await db.rollback()
+            await _retry_or_fail_batch(
+                task_self,
+                db,
+                started_ids,
+                [(execution_id, outcome.runtime_ms) for execution_id, outcome in zip(execution_ids, outcomes)],
+                exc,
+            )
+
+        await publish_task_events(
+            [task_event(task) for task in (*updated, *final_failures, *(t for t, _ in retries))]
+        )
+        await flush_metrics(db)
+        for task in (*updated, *final_failures):
+            observe_task_finished(task)
+
+        # Individual retries, published only once RETRYING is durable
+        if retries:
+            errors = await asyncio.to_thread(
+                Producer().enqueue_tasks,
+                [
+                    {
+                        "task_id": str(task.id),
+                        "payload": payloads[str(task.id)],
+                        "task_type": task.task_type,
+                        "priority": task.priority,
+                        "countdown": _retry_countdown(task_self, error),
+                    }
+                    for task, error in retries
+                ],
+            )
+            if errors:
+                logger.error("tasks.batch.retry_enqueue_failed", extra={"errors": errors})
+                await _fail_unscheduled_retries(db, errors)
+
+        logger.info(
+            "tasks.batch.done",
+            extra={
+                "tasks": len(items),
+                "succeeded": len(updated),
+                "retrying": len(retries),
+                "failed": len(final_failures),
+                "skipped": len(skipped),
+            },
+        )
+
+
+async def _retry_or_fail_batch(
+    task_self,
+    db,
+    task_ids: list[str],
+    executions: list[tuple[str, int]],
+    exc: Exception,
+):
+    """
+    A batch transaction failed.  Retry the whole message while its budget
+    lasts; after that fail every task not finished yet (QUEUED, RUNNING or
+    RETRYING) and the executions of this attempt, so none is left behind.
+    Always raises.
+    """
+    if task_self.request.retries < task_self.max_retries:
+        raise task_self.retry(exc=exc, countdown=_retry_countdown(task_self, exc))
+
+    try:
+        failed = await TaskService().fail_tasks_execution(
+            db, task_ids=task_ids, error_message=str(exc), commit=False
+        )
+        await ExecutionService().finish_started_executions(
+            db,
+            rows=[
+                {
+                    "id": execution_id,
+                    "status": ExecutionStatus.FAILED,
+                    "runtime_ms": runtime_ms,
+                    "metrics": None,
+                    "error_message": str(exc),
+                }
+                for execution_id, runtime_ms in executions
+            ],
+            commit=False,
+        )
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        logger.exception("tasks.batch.fail_failed", extra={"tasks": len(task_ids)})
+        raise exc
+
+    await publish_task_events([task_event(task) for task in failed])
+    await flush_metrics(db)
+    for task in failed:
+        observe_task_finished(task)
+    logger.error(
+        "tasks.batch.exhausted",
+        extra={"tasks": len(task_ids), "failed": len(failed), "error": str(exc)},
+    )
+    raise exc
+
+
+async def _fail_unscheduled_retries(db, errors: dict[str, str]) -> None:
+    """RETRYING tasks whose message never went out would wait forever."""
+    task_service = TaskService()
+    try:
+        failed = [
+            await task_service.fail_task_execution(
+                db,
+                task_id=task_id,
+                error_message=f"Retry could not be scheduled: {error}",
+                commit=False,
+            )
+            for task_id, error in errors.items()
+        ]
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        logger.exception("tasks.batch.unscheduled_fail_failed", extra={"task_ids": sorted(errors)})
+        return
+
+    await publish_task_events([task_event(task) for task in failed])
+    await flush_metrics(db)
+    for task in failed:
+        observe_task_finished(task)
+
+
+async def _run_batch_item(semaphore: asyncio.Semaphore, task, payload: dict) -> _ItemOutcome:
+    trace = ExecutionTrace()
+    async with semaphore:
+        start_time = time.time()
+        with trace.activate():
+            trace.annotate(task_type=task.task_type.value, attempt=task.retry_count + 1, batched=True)
+            try:
+                result = await JobRunner.get_coroutine(
+                    task_type=task.task_type,
+                    payload=payload,
+                    model_version_id=str(task.model_version_id) if task.model_version_id else None,
+                )
+            except Exception as exc:
+                trace.annotate(error_type=type(exc).__name__)
+                return _ItemOutcome(None, exc, int((time.time() - start_time) * 1000), trace.as_dict())
 
-    finally:
-        await engine.dispose()
\ No newline at end of file
+        output = result if isinstance(result, dict) else {"output": result}
+        return _ItemOutcome(output, None, int((time.time() - start_time) * 1000), trace.as_dict())
@@ -1,11 +1,16 @@
+import uuid
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
 
 from backend.models.execution import Execution
+from backend.db.base import generate_uuid
+from backend.db.pagination import Page, keyset_paginate
 from backend.core.enums import ExecutionStatus
+from backend.monitoring.prometheus import instrument_repository
 
 
+@instrument_repository
 class ExecutionRepository:
 
     # ------------------------------------------------------------------ #
@@ -21,9 +26,11 @@ class ExecutionRepository:
         status: ExecutionStatus = ExecutionStatus.PENDING,
         started_at: datetime | None = None,
         completed_at: datetime | None = None,
+        commit: bool = True,
     ) -> Execution:
 
         execution = Execution(
+            id=generate_uuid(),   # known up front, no flush needed to read it
             task_id=task_id,
             worker_id=worker_id,
             status=status,
@@ -32,11 +39,31 @@ class ExecutionRepository:
         )
 
         db.add(execution)
-        await db.commit()
-        await db.refresh(execution)
+        if commit:
+            await db.commit()
+            await db.refresh(execution)
 
         return execution
 
+    async def create_executions(
+        self,
+        db: AsyncSession,
+        *,
+        rows: list[dict],
+        commit: bool = True,
+    ) -> list[Execution]:
+        """
+        Add many executions at once; the flush sends them as one
+        multi-row INSERT (ids are assigned client-side).
+        """
+        # uuid.UUID (not generate_uuid's str): the batched INSERT ... RETURNING
+        # matches returned rows to parameter sets by exact id value
+        executions = [Execution(id=uuid.uuid4(), **row) for row in rows]
+        db.add_all(executions)
+        if commit:
+            await db.commit()
+        return executions
+
     # ------------------------------------------------------------------ #
     # Queries                                                             #
     # ------------------------------------------------------------------ #
@@ -46,56 +73,64 @@ class ExecutionRepository:
         db: AsyncSession,
         execution_id: str,
     ) -> Execution | None:
-        result = await db.execute(select(Execution).where(Execution.id == execution_id))
-        return result.scalars().first()
+        # Identity-map aware: no round trip when the session already holds it.
+        # The map is keyed by uuid.UUID, so a str id would always miss
+        try:
+            execution_id = uuid.UUID(str(execution_id))
+        except ValueError:
+            return None
+        return await db.get(Execution, execution_id)
 
     async def get_executions_by_task(
         self,
         db: AsyncSession,
         task_id: str,
-        skip: int = 0,
+        *,
+        cursor: str | None = None,
         limit: int = 100,
-    ):
-        result = await db.execute(
-            select(Execution)
-            .where(Execution.task_id == task_id)
-            .order_by(Execution.created_at.desc())
-            .offset(skip)
-            .limit(limit)
+    ) -> Page:
+        return await keyset_paginate(
+            db,
+            select(Execution).where(Execution.task_id == task_id),
+            sort_column=Execution.created_at,
+            id_column=Execution.id,
+            cursor=cursor,
+            limit=limit,
         )
-        return result.scalars().all()
 
     async def get_worker_executions(
         self,
         db: AsyncSession,
         worker_id: str,
-        skip: int = 0,
+        *,
+        cursor: str | None = None,
         limit: int = 100,
-    ):
-        result = await db.execute(
-            select(Execution)
-            .where(Execution.worker_id == worker_id)
-            .order_by(Execution.created_at.desc())
-            .offset(skip)
-            .limit(limit)
+    ) -> Page:
+        return await keyset_paginate(
+            db,
+            select(Execution).where(Execution.worker_id == worker_id),
+            sort_column=Execution.created_at,
+            id_column=Execution.id,
+            cursor=cursor,
+            limit=limit,
         )
-        return result.scalars().all()
 
     async def list_executions_by_status(
         self,
         db: AsyncSession,
         status: ExecutionStatus,
-        skip: int = 0,
+        *,
+        cursor: str | None = None,
         limit: int = 100,
-    ):
-        result = await db.execute(
-            select(Execution)
-            .where(Execution.status == status)
-            .order_by(Execution.created_at.desc())
-            .offset(skip)
-            .limit(limit)
+    ) -> Page:
+        return await keyset_paginate(
+            db,
+            select(Execution).where(Execution.status == status),
+            sort_column=Execution.created_at,
+            id_column=Execution.id,
+            cursor=cursor,
+            limit=limit,
         )
-        return result.scalars().all()
 
     # ------------------------------------------------------------------ #
     # State Updates                                                        #
@@ -125,6 +160,24 @@ class ExecutionRepository:
 
         return execution
 
+    async def update_executions(
+        self,
+        db: AsyncSession,
+        *,
+        rows: list[dict],
+        commit: bool = True,
+    ) -> None:
+        """
+        Different values for many executions in one executemany
+        UPDATE ... WHERE id = :id.  Every row carries "id" (a uuid.UUID)
+        and the same set of columns.  Loaded instances are not refreshed.
+        """
+        if not rows:
+            return
+        await db.execute(update(Execution), rows)
+        if commit:
+            await db.commit()
+
     async def update_execution_metrics(
         self,
         db: AsyncSession,
@@ -2,8 +2,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from backend.models.model_version import ModelVersion
+from backend.ml.model_version_cache import publish_model_version_invalidation
+from backend.monitoring.prometheus import instrument_repository
 
 
+@instrument_repository
 class ModelVersionRepository:
 
     async def get_by_id(
@@ -16,6 +19,18 @@ class ModelVersionRepository:
         )
         return result.scalars().first()
 
+    async def get_existing_ids(
+        self,
+        db: AsyncSession,
+        model_version_ids: set[str],
+    ) -> set[str]:
+        if not model_version_ids:
+            return set()
+        result = await db.execute(
+            select(ModelVersion.id).where(ModelVersion.id.in_(model_version_ids))
+        )
+        return {str(mv_id) for mv_id in result.scalars().all()}
+
     async def get_default_for_task_type(
         self,
         db: AsyncSession,
@@ -66,4 +81,6 @@ class ModelVersionRepository:
         model_version.is_active = False
         await db.commit()
         await db.refresh(model_version)
+        # Every process caches resolved versions (ModelService)
+        await publish_model_version_invalidation(model_version.id)
         return model_version
\ No newline at end of file
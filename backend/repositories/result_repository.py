@@ -1,9 +1,13 @@
+import uuid
+
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from backend.models.result import Result
+from backend.monitoring.prometheus import instrument_repository
 
 
+@instrument_repository
 class ResultRepository:
 
     async def create_result(
@@ -14,6 +18,7 @@ class ResultRepository:
         execution_id: str | None = None,
         output_summary: dict | None = None,
         storage_path: str | None = None,
+        commit: bool = True,
     ) -> Result:
 
         result = Result(
@@ -24,11 +29,26 @@ class ResultRepository:
         )
 
         db.add(result)
-        await db.commit()
-        await db.refresh(result)
+        if commit:
+            await db.commit()
+            await db.refresh(result)
 
         return result
 
+    async def create_results(
+        self,
+        db: AsyncSession,
+        *,
+        rows: list[dict],
+        commit: bool = True,
+    ) -> list[Result]:
+        # uuid.UUID ids, see ExecutionRepository.create_executions
+        results = [Result(id=uuid.uuid4(), **row) for row in rows]
+        db.add_all(results)
+        if commit:
+            await db.commit()
+        return results
+
     async def get_by_task_id(self, db: AsyncSession, task_id: str) -> Result | None:
         result = await db.execute(select(Result).where(Result.task_id == task_id))
         return result.scalars().first()
@@ -1,11 +1,23 @@
 from datetime import datetime
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+import sqlalchemy as sa
+from sqlalchemy import insert, select, update
 from backend.models.task import Task
+from backend.db.base import generate_uuid
+from backend.db.pagination import Page, keyset_paginate
 from backend.core.enums import TaskStatus
+from backend.queue.notifications import (
+    publish_task_events,
+    publish_task_status,
+    snapshot_key,
+    task_event,
+)
+from backend.monitoring.counters import forget_task
+from backend.monitoring.prometheus import instrument_repository
 
 
+@instrument_repository
 class TaskRepository:
 
     async def create_task(
@@ -35,9 +47,41 @@ class TaskRepository:
         await db.commit()
         await db.refresh(task)
 
+        await publish_task_status(task)
         return task
 
 
+    async def create_tasks_bulk(
+        self,
+        db: AsyncSession,
+        *,
+        rows: list[dict],
+        status: TaskStatus = TaskStatus.QUEUED,
+    ) -> list[dict]:
+        """
+        Insert many tasks in one transaction, straight into `status`.
+
+        Ids and timestamps are assigned here so nothing needs to be read
+        back; SQLAlchemy sends the executemany as multi-row INSERT
+        statements.  Returns the inserted rows (with id/status/submitted_at).
+        """
+        now = datetime.utcnow()
+        rows = [
+            {
+                "id": generate_uuid(),
+                "status": status,
+                "submitted_at": now,
+                "retry_count": 0,
+                **row,
+            }
+            for row in rows
+        ]
+        if rows:
+            await db.execute(insert(Task), rows)
+            await db.commit()
+        return rows
+
+
     async def get_task_by_id(self, db: AsyncSession, task_id: str) -> Task | None:
         result = await db.execute(select(Task).where(Task.id == task_id))
         return result.scalars().first()
@@ -47,17 +91,18 @@ class TaskRepository:
         self,
         db: AsyncSession,
         user_id: str,
-        skip: int = 0,
+        *,
+        cursor: str | None = None,
         limit: int = 50,
-    ):
-        result = await db.execute(
-            select(Task)
-            .where(Task.user_id == user_id)
-            .order_by(Task.submitted_at.desc())
-            .offset(skip)
-            .limit(limit)
+    ) -> Page:
+        return await keyset_paginate(
+            db,
+            select(Task).where(Task.user_id == user_id),
+            sort_column=Task.submitted_at,
+            id_column=Task.id,
+            cursor=cursor,
+            limit=limit,
         )
-        return result.scalars().all()
 
 
     async def list_tasks_by_status(
@@ -87,24 +132,93 @@ class TaskRepository:
         task_id: str,
         status: TaskStatus,
     ) -> Task | None:
+        """Unconditional status write; prefer `transition_status`."""
+        return await self.transition_status(db, task_id, to_status=status)
 
-        task = await self.get_task_by_id(db, task_id)
-        if not task:
-            return None
 
-        task.status = status
+    async def transition_status(
+        self,
+        db: AsyncSession,
+        task_id: str,
+        *,
+        to_status: TaskStatus,
+        from_statuses: list[TaskStatus] | None = None,
+        where: tuple = (),
+        values: dict | None = None,
+        commit: bool = True,
+    ) -> Task | None:
+        """
+        Move a task to `to_status` in one round trip:
+
+            UPDATE tasks SET status = :to, ...
+            WHERE id = :id AND status IN (:from_statuses) [AND <where>]
+            RETURNING *
 
-        if status == TaskStatus.RUNNING and task.started_at is None:
-            task.started_at = datetime.utcnow()
+        Returns None when no row matched — the task is missing, or it was
+        not in an allowed source state (including when a concurrent worker
+        won the race).  `values` are extra columns written in the same UPDATE.
 
-        if status in (TaskStatus.SUCCESS, TaskStatus.FAILED):
-            task.completed_at = datetime.utcnow()
+        With `commit=False` the UPDATE joins the caller's transaction, and
+        the caller publishes the status event once it has committed.
+        """
+        result = await db.execute(
+            _transition_stmt(
+                Task.id == task_id,
+                to_status=to_status,
+                from_statuses=from_statuses,
+                where=where,
+                values=values,
+            )
+        )
+        task = result.scalars().first()
+        if not commit:
+            return task
 
         await db.commit()
-        await db.refresh(task)
+
+        if task is not None:
+            # Push to subscribers only once the transition is durable
+            await publish_task_status(task)
         return task
 
 
+    async def transition_status_bulk(
+        self,
+        db: AsyncSession,
+        task_ids: list[str],
+        *,
+        to_status: TaskStatus,
+        from_statuses: list[TaskStatus] | None = None,
+        where: tuple = (),
+        values: dict | None = None,
+        commit: bool = True,
+    ) -> list[Task]:
+        """
+        `transition_status` for many tasks in one UPDATE ... WHERE id IN
+        (...) RETURNING.  Returns only the rows that moved; ids that were
+        missing or not in an allowed source state are simply absent.
+        """
+        if not task_ids:
+            return []
+
+        result = await db.execute(
+            _transition_stmt(
+                Task.id.in_(task_ids),
+                to_status=to_status,
+                from_statuses=from_statuses,
+                where=where,
+                values=values,
+            )
+        )
+        tasks = list(result.scalars().all())
+        if not commit:
+            return tasks
+
+        await db.commit()
+        await publish_task_events([task_event(task) for task in tasks])
+        return tasks
+
+
     async def increment_retry_count(self, db: AsyncSession, task_id: str) -> Task | None:
         task = await self.get_task_by_id(db, task_id)
         if not task:
@@ -123,5 +237,34 @@ class TaskRepository:
 
         await db.delete(task)
         await db.commit()
-        
-        return True
\ No newline at end of file
+
+        await forget_task(snapshot_key(task_id))
+        return True
+
+
+def _transition_stmt(
+    match,
+    *,
+    to_status: TaskStatus,
+    from_statuses: list[TaskStatus] | None,
+    where: tuple,
+    values: dict | None,
+):
+    now = datetime.utcnow()
+    values = {"status": to_status, **(values or {})}
+
+    if to_status == TaskStatus.RUNNING:
+        values["started_at"] = sa.func.coalesce(Task.started_at, now)
+
+    if to_status in (TaskStatus.SUCCESS, TaskStatus.FAILED):
+        values["completed_at"] = now
+
+    stmt = update(Task).where(match, *where)
+    if from_statuses is not None:
+        stmt = stmt.where(Task.status.in_(from_statuses))
+
+    return (
+        stmt.values(**values)
+        .returning(Task)
+        .execution_options(populate_existing=True)
+    )
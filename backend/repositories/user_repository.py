@@ -1,8 +1,12 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from backend.models.user import User
+from backend.db.pagination import Page, keyset_paginate
+from backend.core.user_cache import get_user_cache
+from backend.monitoring.prometheus import instrument_repository
 
 
+@instrument_repository
 class UserRepository:
 
     async def get_by_email(self, db: AsyncSession, email: str) -> User | None:
@@ -34,12 +38,27 @@ class UserRepository:
 
         await db.commit()
         await db.refresh(user)
+        await get_user_cache().invalidate(user.id)
         return user
     
     async def delete_user(self, db: AsyncSession, user: User):
+        user_id = user.id
         await db.delete(user)
         await db.commit()
+        await get_user_cache().invalidate(user_id)
 
-    async def list_users(self, db: AsyncSession, skip: int = 0, limit: int = 100):
-        result = await db.execute(select(User).offset(skip).limit(limit))
-        return result.scalars().all()
\ No newline at end of file
+    async def list_users(
+        self,
+        db: AsyncSession,
+        *,
+        cursor: str | None = None,
+        limit: int = 100,
+    ) -> Page:
+        return await keyset_paginate(
+            db,
+            select(User),
+            sort_column=User.created_at,
+            id_column=User.id,
+            cursor=cursor,
+            limit=limit,
+        )
\ No newline at end of file
@@ -0,0 +1,33 @@
+from pydantic import BaseModel, Field
+
+
+class EmbeddingIndexRequest(BaseModel):
+    texts: list[str] = Field(..., min_length=1, max_length=1000)
+    model_version_id: str | None = None
+
+
+class EmbeddingIndexResponse(BaseModel):
+    model_version_id: str
+    indexed: int
+    skipped: int
+    total: int
+
+
+class EmbeddingSearchRequest(BaseModel):
+    query: str
+    k: int = Field(default=10, ge=1, le=100)
+    model_version_id: str | None = None
+
+
+class EmbeddingSearchHit(BaseModel):
+    id: str
+    text: str
+    score: float
+
+    class Config:
+        from_attributes = True
+
+
+class EmbeddingSearchResponse(BaseModel):
+    model_version_id: str
+    hits: list[EmbeddingSearchHit]
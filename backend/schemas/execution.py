@@ -15,4 +15,14 @@ class ExecutionResponse(BaseModel):
     completed_at: datetime | None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class ExecutionTraceResponse(BaseModel):
+    execution_id: str
+    task_id: str
+    status: ExecutionStatus
+    runtime_ms: int | None
+    total_ms: float | None = None
+    stages: dict[str, float] = {}
+    unaccounted_ms: float | None = None    # total minus the sum of stages
+    attrs: dict = {}
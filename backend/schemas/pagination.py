@@ -0,0 +1,13 @@
+from typing import Generic, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    items: list[T]
+    next_cursor: str | None = None   # pass back as ?cursor= for the next page
+
+    class Config:
+        from_attributes = True
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 from backend.core.enums import TaskType, TaskStatus
 from uuid import UUID
@@ -12,6 +12,22 @@ class TaskCreate(BaseModel):
     input_payload: dict
 
 
+class TaskBatchCreate(BaseModel):
+    tasks: list[TaskCreate] = Field(..., min_length=1, max_length=10000)
+
+
+class TaskBatchItemResult(BaseModel):
+    index: int                   # position in the submitted list
+    id: UUID | None = None
+    error: str | None = None
+
+
+class TaskBatchResponse(BaseModel):
+    created: int
+    failed: int
+    items: list[TaskBatchItemResult]
+
+
 class TaskStatusResponse(BaseModel):
     id: str
     status: TaskStatus
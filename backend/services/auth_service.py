@@ -11,6 +11,8 @@ from backend.core.security import (
     validate_token_type,
 )
 from backend.core.config import settings
+from backend.core.exceptions import InvalidTokenError
+from backend.core.user_cache import Principal
 
 
 class AuthService:
@@ -44,7 +46,7 @@ class AuthService:
         )
 
         # Generate tokens
-        access_token = create_access_token(str(user.id))
+        access_token = _access_token(user)
         refresh_token = create_refresh_token(str(user.id))
 
         return {
@@ -70,7 +72,7 @@ class AuthService:
         if not verify_password(password, user.password_hash):
             raise ValueError("Invalid credentials")
 
-        access_token = create_access_token(str(user.id))
+        access_token = _access_token(user)
         refresh_token = create_refresh_token(str(user.id))
 
         return {
@@ -81,18 +83,28 @@ class AuthService:
         }
 
     # Token Refresh
-    def refresh_tokens(self, refresh_token: str):
-        payload = decode_token(refresh_token)
-
-        validate_token_type(payload, "refresh")
-
-        user_id = payload.get("sub")
+    async def refresh_tokens(self, db: AsyncSession, *, refresh_token: str):
+        try:
+            payload = decode_token(refresh_token)
+            validate_token_type(payload, "refresh")
+        except ValueError as e:
+            raise InvalidTokenError(str(e)) from e
+
+        # Re-read the user so a new access token carries current claims
+        user = await self.user_repo.get_by_id(db, payload.get("sub"))
+        if not user:
+            raise InvalidTokenError("User not found")
 
-        access_token = create_access_token(str(user_id))
-        new_refresh_token = create_refresh_token(str(user_id))
+        access_token = _access_token(user)
+        new_refresh_token = create_refresh_token(str(user.id))
 
         return {
             "access_token": access_token,
             "refresh_token": new_refresh_token,
             "token_type": "bearer",
-        }
\ No newline at end of file
+        }
+
+
+def _access_token(user) -> str:
+    # Role claims let get_current_user skip the lookup (AUTH_TRUST_TOKEN_CLAIMS)
+    return create_access_token(str(user.id), claims=Principal.from_user(user).as_claims())
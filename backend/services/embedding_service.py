@@ -0,0 +1,95 @@
+import asyncio
+
+import numpy as np
+
+from backend.ml.vectors import EmbeddingMatrix
+from backend.services.model_service import ModelService
+from backend.vectorstore.store import SearchHit, get_vector_store, text_hash
+
+
+class EmbeddingService:
+    """
+    Persists embeddings in the caller's VectorStore for the model version
+    and serves similarity search over them.  Texts already in the store are
+    never sent to a provider again.  File and NumPy work runs in a thread so the event
+    loop is not blocked by large scans.
+    """
+
+    def __init__(self, model_service: ModelService | None = None):
+        self.model_service = model_service or ModelService()
+
+    # ------------------------------------------------------------------ #
+    # Indexing                                                             #
+    # ------------------------------------------------------------------ #
+
+    async def index_texts(
+        self,
+        *,
+        texts: list[str],
+        user_id: str,
+        model_version_id: str | None = None,
+    ) -> dict:
+        model_version = await self._resolve(model_version_id)
+        store = get_vector_store(str(model_version.id), user_id, model_id=model_version.model_id)
+
+        unique = list(dict.fromkeys(texts))
+        missing = set(await asyncio.to_thread(store.missing, [text_hash(t) for t in unique]))
+        to_embed = [t for t in unique if text_hash(t) in missing]
+
+        added = 0
+        if to_embed:
+            response = await self.model_service.embed(
+                texts=to_embed,
+                model_version_id=str(model_version.id),
+            )
+            added = await asyncio.to_thread(store.add, to_embed, _as_array(response.embeddings))
+
+        return {
+            "model_version_id": str(model_version.id),
+            "indexed": added,
+            "skipped": len(unique) - len(to_embed),
+            "total": len(store),
+        }
+
+    # ------------------------------------------------------------------ #
+    # Search                                                               #
+    # ------------------------------------------------------------------ #
+
+    async def search(
+        self,
+        *,
+        query: str,
+        user_id: str,
+        k: int = 10,
+        model_version_id: str | None = None,
+    ) -> tuple[str, list[SearchHit]]:
+        model_version = await self._resolve(model_version_id)
+        store = get_vector_store(str(model_version.id), user_id, model_id=model_version.model_id)
+
+        # Reuse the stored vector when the query text itself is indexed
+        vector = await asyncio.to_thread(store.get, text_hash(query))
+        if vector is None:
+            response = await self.model_service.embed(
+                texts=[query],
+                model_version_id=str(model_version.id),
+            )
+            vector = _as_array(response.embeddings)[0]
+
+        hits = await asyncio.to_thread(store.search, vector, k)
+        return str(model_version.id), hits
+
+    # ------------------------------------------------------------------ #
+    # Internal helpers                                                    #
+    # ------------------------------------------------------------------ #
+
+    async def _resolve(self, model_version_id: str | None):
+        return await self.model_service.resolve_model_version(
+            model_version_id=model_version_id,
+            task_type="embedding",
+        )
+
+
+def _as_array(embeddings) -> np.ndarray:
+    if isinstance(embeddings, EmbeddingMatrix):
+        return embeddings.as_numpy()
+    return np.asarray(embeddings, dtype=np.float32)
@@ -1,4 +1,5 @@
 import time
+import uuid
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -6,6 +7,7 @@ from backend.repositories.execution_repository import ExecutionRepository
 from backend.repositories.task_repository import TaskRepository
 from backend.workers.worker_app.job_runner import JobRunner
 from backend.core.enums import ExecutionStatus
+from backend.monitoring.counters import flush_metrics, record_execution_status
 from backend.core.exceptions import (
     ExecutionNotFoundError,
     TaskNotFoundError,
@@ -30,19 +32,64 @@ class ExecutionService:
         *,
         task_id: str,
         worker_id: str,
+        task=None,
+        started: bool = False,
+        commit: bool = True,
     ):
-        task = await self.task_repo.get_task_by_id(db, task_id)
+        """
+        Pass `task` when the caller already holds the row to skip the
+        lookup; `started=True` creates the execution directly as STARTED.
+        """
+        if task is None:
+            task = await self.task_repo.get_task_by_id(db, task_id)
         if not task:
             raise TaskNotFoundError(f"Task {task_id} not found")
 
-        return await self.execution_repo.create_execution(
+        status = ExecutionStatus.STARTED if started else ExecutionStatus.PENDING
+        record_execution_status(db, previous=None, new=status)
+
+        execution = await self.execution_repo.create_execution(
             db,
             task_id=task_id,
             worker_id=worker_id,
-            status=ExecutionStatus.PENDING,
-            started_at=None,
+            status=status,
+            started_at=datetime.utcnow() if started else None,
             completed_at=None,
+            commit=commit,
+        )
+        if commit:
+            await flush_metrics(db)
+        return execution
+
+    async def create_started_executions(
+        self,
+        db: AsyncSession,
+        *,
+        tasks: list,
+        worker_id: str | None = None,
+        commit: bool = True,
+    ):
+        """One STARTED execution per task (batch messages), in one INSERT."""
+        now = datetime.utcnow()
+        for _ in tasks:
+            record_execution_status(db, previous=None, new=ExecutionStatus.STARTED)
+
+        executions = await self.execution_repo.create_executions(
+            db,
+            rows=[
+                {
+                    "task_id": task.id,
+                    "worker_id": worker_id,
+                    "status": ExecutionStatus.STARTED,
+                    "started_at": now,
+                }
+                for task in tasks
+            ],
+            commit=commit,
         )
+        if commit:
+            await flush_metrics(db)
+        return executions
 
     # ------------------------------------------------------------------ #
     # Execution State                                                     #
@@ -55,12 +102,13 @@ class ExecutionService:
         execution_id: str,
     ):
         execution = await self._get_or_raise(db, execution_id)
+        record_execution_status(db, previous=execution.status, new=ExecutionStatus.STARTED)
 
         execution.status = ExecutionStatus.STARTED
         execution.started_at = datetime.utcnow()
 
         await db.commit()
-        await db.refresh(execution)
+        await flush_metrics(db)
 
         return execution
 
@@ -71,16 +119,25 @@ class ExecutionService:
         execution_id: str,
         runtime_ms: int | None = None,
         metrics: dict | None = None,
+        commit: bool = True,
     ):
         execution = await self._get_or_raise(db, execution_id)
+        record_execution_status(
+            db,
+            previous=execution.status,
+            new=ExecutionStatus.COMPLETED,
+            runtime_ms=runtime_ms,
+        )
 
         execution.status = ExecutionStatus.COMPLETED
         execution.completed_at = datetime.utcnow()
         execution.runtime_ms = runtime_ms
         execution.metrics = metrics
 
-        await db.commit()
-        await db.refresh(execution)
+        # Every column was just set here — a refresh would only re-read them
+        if commit:
+            await db.commit()
+            await flush_metrics(db)
 
         return execution
 
@@ -91,19 +148,54 @@ class ExecutionService:
         execution_id: str,
         error_message: str,
         runtime_ms: int | None = None,
+        metrics: dict | None = None,
+        commit: bool = True,
     ):
         execution = await self._get_or_raise(db, execution_id)
+        record_execution_status(db, previous=execution.status, new=ExecutionStatus.FAILED)
 
         execution.status = ExecutionStatus.FAILED
         execution.completed_at = datetime.utcnow()
         execution.runtime_ms = runtime_ms
         execution.error_message = error_message
+        execution.metrics = metrics
 
-        await db.commit()
-        await db.refresh(execution)
+        if commit:
+            await db.commit()
+            await flush_metrics(db)
 
         return execution
 
+    async def finish_started_executions(
+        self,
+        db: AsyncSession,
+        *,
+        rows: list[dict],
+        commit: bool = True,
+    ):
+        """
+        Outcome write for batch messages: executions created STARTED by
+        `create_started_executions` move to COMPLETED or FAILED in one
+        UPDATE, without being loaded first.  Each row is
+        {"id", "status", "runtime_ms", "metrics", "error_message"}.
+        """
+        now = datetime.utcnow()
+        for row in rows:
+            record_execution_status(
+                db,
+                previous=ExecutionStatus.STARTED,
+                new=row["status"],
+                runtime_ms=row["runtime_ms"],
+            )
+
+        await self.execution_repo.update_executions(
+            db,
+            rows=[{**row, "id": uuid.UUID(str(row["id"])), "completed_at": now} for row in rows],
+            commit=commit,
+        )
+        if commit:
+            await flush_metrics(db)
+
     # ------------------------------------------------------------------ #
     # Core Compute                                                        #
     # ------------------------------------------------------------------ #
@@ -141,10 +233,19 @@ class ExecutionService:
             execution_id,
         )
 
-    async def get_task_executions(self, db: AsyncSession, task_id: str):
+    async def get_task_executions(
+        self,
+        db: AsyncSession,
+        task_id: str,
+        *,
+        cursor: str | None = None,
+        limit: int = 100,
+    ):
         return await self.execution_repo.get_executions_by_task(
             db,
             task_id,
+            cursor=cursor,
+            limit=limit,
         )
 
     # ------------------------------------------------------------------ #
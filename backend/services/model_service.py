@@ -1,12 +1,20 @@
 import logging
+import time
+from typing import Awaitable, Callable
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from backend.core.config import settings
 from backend.repositories.model_version_repository import ModelVersionRepository
-from backend.ml.providers.openrouter import OpenRouterProvider
-from backend.ml.providers.huggingface import HuggingFaceProvider
+from backend.ml.providers.registry import get_providers
 from backend.ml.router import ProviderRouter
+from backend.ml.cache import CachePolicy, get_completion_cache
+from backend.ml.circuit_breaker import get_circuit_breaker
+from backend.ml.coalescing import get_request_coalescer
+from backend.ml.hedging import HedgePolicy, get_hedge_controller
+from backend.ml.model_version_cache import get_model_version_cache
+from backend.ml.rate_limiter import get_rate_limiter
+from backend.ml.batching import EmbeddingBatcher
 from backend.ml.providers.base import (
     CompletionRequest,
     CompletionResponse,
@@ -14,6 +22,12 @@ from backend.ml.providers.base import (
     EmbeddingResponse
 )
 from backend.core.exceptions import AllProvidersFailedError
+from backend.monitoring.tracing import (
+    STAGE_MODEL_RESOLUTION,
+    STAGE_PROVIDER_CALL,
+    trace_annotate,
+    trace_stage,
+)
 
 from backend.core.enums import TaskType
 from backend.core.exceptions import (
@@ -25,15 +39,30 @@ logger = logging.getLogger(__name__)
 
 
 class ModelService:
+    """
+    Resolves a ModelVersion and runs inference through the provider chain.
+
+    Providers come from the process-wide registry (OpenRouter primary,
+    HuggingFace fallback), so constructing a ModelService is cheap and never
+    opens new HTTP pools.  DB access goes through `session_factory`; the
+    worker runtime passes its own, the API falls back to AsyncSessionLocal.
+    Resolved ModelVersions come from the process-wide ModelVersionCache, so
+    a session is only opened on a cache miss.
+    """
 
-    def __init__(self):
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession] | None = None):
         self.model_version_repo = ModelVersionRepository()
+        self._model_versions = get_model_version_cache()
+        self._session_factory = session_factory
         self._router = ProviderRouter(
-            providers=[
-                OpenRouterProvider(),     # primary
-                HuggingFaceProvider(),    # fallback
-            ]
+            providers=get_providers(),
+            cache=get_completion_cache(),
+            coalescer=get_request_coalescer(),
+            breaker=get_circuit_breaker(),
+            hedger=get_hedge_controller(),
+            limiter=get_rate_limiter(),
         )
+        self._embedding_batcher = EmbeddingBatcher(self._router.embed)
 
     # ------------------------------------------------------------------ #
     # Inference entry points (called by job_runner)                       #
@@ -45,18 +74,22 @@ class ModelService:
         task_type: str,
         input_payload: dict,
         model_version_id: str | None = None,
+        on_chunk: Callable[[str], Awaitable[None]] | None = None,
     ) -> dict:
         """
-        Opens its own DB session — called directly from job_runner as a
-        coroutine, awaited inside tasks.py's single asyncio.run() loop.
+        Called directly from job_runner as a coroutine, awaited on the
+        worker runtime's event loop; opens a DB session only to resolve an
+        uncached model version.
         Returns a plain dict that result_service stores as output_payload.
+
+        When `on_chunk` is given the completion is streamed and each text
+        delta is awaited through it; the returned dict is the same.
         """
-        async with self._make_session() as db:
-            if task_type == TaskType.INFERENCE:
-                return await self._run_completion(db, input_payload, model_version_id)
+        if task_type == TaskType.INFERENCE:
+            return await self._run_completion(input_payload, model_version_id, on_chunk)
 
-            if task_type == TaskType.ANALYSIS:
-                return await self._run_analysis(db, input_payload, model_version_id)
+        if task_type == TaskType.ANALYSIS:
+            return await self._run_analysis(input_payload, model_version_id, on_chunk)
 
         raise ModelInferenceError(
             f"Unsupported task type for ML inference: {task_type}"
@@ -68,11 +101,11 @@ class ModelService:
 
     async def _run_completion(
         self,
-        db: AsyncSession,
         input_payload: dict,
         model_version_id: str | None,
+        on_chunk: Callable[[str], Awaitable[None]] | None = None,
     ) -> dict:
-        model_version = await self._resolve_model(db, model_version_id, TaskType.INFERENCE)
+        model_version = await self._resolve_model(model_version_id, TaskType.INFERENCE)
 
         request = CompletionRequest(
             prompt=input_payload["prompt"],
@@ -83,7 +116,8 @@ class ModelService:
             extra_params=input_payload.get("extra_params", {}),
         )
 
-        response = await self._complete_or_raise(request)
+        # Latency-sensitive path: the only one that may hedge
+        response = await self._complete_or_raise(request, model_version, on_chunk, hedge=True)
 
         return {
             "text": response.text,
@@ -96,16 +130,16 @@ class ModelService:
 
     async def _run_analysis(
         self,
-        db: AsyncSession,
         input_payload: dict,
         model_version_id: str | None,
+        on_chunk: Callable[[str], Awaitable[None]] | None = None,
     ) -> dict:
         """
         Analysis tasks send a structured prompt and expect a JSON-parseable
         response from the model. Expand as needed (classification,
         summarisation, extraction, etc.).
         """
-        model_version = await self._resolve_model(db, model_version_id, TaskType.ANALYSIS)
+        model_version = await self._resolve_model(model_version_id, TaskType.ANALYSIS)
 
         system_prompt = input_payload.get(
             "system_prompt",
@@ -120,7 +154,7 @@ class ModelService:
             extra_params=input_payload.get("extra_params", {}),
         )
 
-        response = await self._complete_or_raise(request)
+        response = await self._complete_or_raise(request, model_version, on_chunk)
 
         return {
             "analysis": response.text,
@@ -139,8 +173,7 @@ class ModelService:
         texts: list[str],
         model_version_id: str | None = None,
     ) -> EmbeddingResponse:
-        async with self._make_session() as db:
-            model_version = await self._resolve_model(db, model_version_id, task_type="embedding")
+        model_version = await self._resolve_model(model_version_id, task_type="embedding")
 
         request = EmbeddingRequest(
             texts=texts,
@@ -148,6 +181,8 @@ class ModelService:
         )
 
         try:
+            if settings.EMBEDDING_BATCHING_ENABLED:
+                return await self._embedding_batcher.embed(request)
             return await self._router.embed(request)
         except AllProvidersFailedError as exc:
             raise ModelInferenceError(
@@ -158,22 +193,42 @@ class ModelService:
     # Model version resolution                                            #
     # ------------------------------------------------------------------ #
 
+    async def resolve_model_version(
+        self,
+        *,
+        model_version_id: str | None,
+        task_type: str,
+    ):
+        """Public variant of `_resolve_model`."""
+        return await self._resolve_model(model_version_id, task_type)
+
     async def _resolve_model(
         self,
-        db: AsyncSession,
+        model_version_id: str | None,
+        task_type: str,
+    ):
+        with trace_stage(STAGE_MODEL_RESOLUTION):
+            return await self._lookup_model(model_version_id, task_type)
+
+    async def _lookup_model(
+        self,
         model_version_id: str | None,
         task_type: str,
     ):
         if model_version_id:
-            model_version = await self.model_version_repo.get_by_id(db, model_version_id)
+            model_version = await self._model_versions.get_by_id(
+                model_version_id,
+                lambda: self._load(self.model_version_repo.get_by_id, model_version_id),
+            )
             if not model_version:
                 raise ModelNotFoundError(
                     f"ModelVersion {model_version_id} not found."
                 )
             return model_version
 
-        model_version = await self.model_version_repo.get_default_for_task_type(
-            db, task_type
+        model_version = await self._model_versions.get_default(
+            task_type,
+            lambda: self._load(self.model_version_repo.get_default_for_task_type, task_type),
         )
         if not model_version:
             raise ModelNotFoundError(
@@ -182,13 +237,33 @@ class ModelService:
             )
         return model_version
 
+    async def _load(self, query, *args):
+        # Cache miss: a short-lived session, closed before the provider call
+        async with self._make_session() as db:
+            return await query(db, *args)
+
     # ------------------------------------------------------------------ #
     # Internal helpers                                                    #
     # ------------------------------------------------------------------ #
 
-    async def _complete_or_raise(self, request: CompletionRequest) -> CompletionResponse:
+    async def _complete_or_raise(
+        self,
+        request: CompletionRequest,
+        model_version,
+        on_chunk: Callable[[str], Awaitable[None]] | None = None,
+        *,
+        hedge: bool = False,
+    ) -> CompletionResponse:
         try:
-            return await self._router.complete(request)
+            with trace_stage(STAGE_PROVIDER_CALL):
+                if on_chunk is not None:
+                    response = await self._stream_completion(request, on_chunk)
+                else:
+                    response = await self._router.complete(
+                        request,
+                        cache_policy=CachePolicy.from_model_version(model_version),
+                        hedge_policy=HedgePolicy.from_model_version(model_version) if hedge else None,
+                    )
         except AllProvidersFailedError as exc:
             logger.error(
                 "model_service.inference.all_failed",
@@ -198,8 +273,45 @@ class ModelService:
                 f"Inference failed across all providers: {exc}"
             ) from exc
 
-    @staticmethod
-    def _make_session():
-        engine = create_async_engine(settings.DATABASE_ASYNC_URL, pool_pre_ping=True)
-        factory = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
-        return factory()
\ No newline at end of file
+        trace_annotate(
+            provider=response.provider,
+            model_id=response.model_id,
+            prompt_tokens=response.prompt_tokens,
+            completion_tokens=response.completion_tokens,
+            provider_latency_ms=round(response.latency_ms, 1),
+        )
+        return response
+
+    async def _stream_completion(
+        self,
+        request: CompletionRequest,
+        on_chunk: Callable[[str], Awaitable[None]],
+    ) -> CompletionResponse:
+        """Relay deltas through `on_chunk` and assemble the full response."""
+        t0 = time.monotonic()
+        parts: list[str] = []
+        model_id, provider = request.model_id, ""
+        prompt_tokens = completion_tokens = 0
+
+        async for chunk in self._router.stream_complete(request):
+            if chunk.text:
+                parts.append(chunk.text)
+                await on_chunk(chunk.text)
+            model_id, provider = chunk.model_id, chunk.provider
+            prompt_tokens = max(prompt_tokens, chunk.prompt_tokens)
+            completion_tokens = max(completion_tokens, chunk.completion_tokens)
+
+        return CompletionResponse(
+            text="".join(parts),
+            model_id=model_id,
+            provider=provider,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            latency_ms=(time.monotonic() - t0) * 1000,
+        )
+
+    def _make_session(self) -> AsyncSession:
+        if self._session_factory is None:
+            from backend.db.session import AsyncSessionLocal
+            self._session_factory = AsyncSessionLocal
+        return self._session_factory()
\ No newline at end of file
@@ -24,6 +24,7 @@ class ResultService:
         execution_id: str | None = None,
         output_summary: dict | None = None,
         storage_path: str | None = None,
+        commit: bool = True,
     ):
         return await self.result_repo.create_result(
             db,
@@ -31,8 +32,19 @@ class ResultService:
             execution_id=execution_id,
             output_summary=output_summary,
             storage_path=storage_path,
+            commit=commit,
         )
 
+    async def store_results(
+        self,
+        db: AsyncSession,
+        *,
+        rows: list[dict],
+        commit: bool = True,
+    ):
+        """Bulk store_result: rows of {task_id, execution_id, output_summary}."""
+        return await self.result_repo.create_results(db, rows=rows, commit=commit)
+
     # ------------------------------------------------------------------ #
     # Queries                                                             #
     # ------------------------------------------------------------------ #
@@ -7,17 +7,26 @@ class TaskLifecycleEngine:
     def __init__(self):
         self.valid_transitions = {
             TaskStatus.PENDING: [TaskStatus.QUEUED],
-            TaskStatus.QUEUED:  [TaskStatus.RUNNING],
+            # FAILED: setup failed on every delivery, or the message was never published
+            TaskStatus.QUEUED:  [TaskStatus.RUNNING, TaskStatus.FAILED],
             TaskStatus.RUNNING: [
                 TaskStatus.SUCCESS,
                 TaskStatus.FAILED,
                 TaskStatus.RETRYING,
             ],
-            TaskStatus.RETRYING: [TaskStatus.RUNNING],
+            # FAILED: the retry message could not be published
+            TaskStatus.RETRYING: [TaskStatus.RUNNING, TaskStatus.FAILED],
             TaskStatus.SUCCESS:  [],
             TaskStatus.FAILED:   [],
         }
 
+        # Inverse map compiled once: target → statuses it may be entered from.
+        # Used as the `status IN (...)` guard of conditional UPDATEs.
+        self.allowed_sources = {status: [] for status in TaskStatus}
+        for source, targets in self.valid_transitions.items():
+            for target in targets:
+                self.allowed_sources[target].append(source)
+
     def validate_transition(self, current_status, new_status):
         allowed = self.valid_transitions.get(current_status, [])
         if new_status not in allowed:
@@ -26,5 +35,8 @@ class TaskLifecycleEngine:
                 f"Allowed: {[s.value for s in allowed]}"
             )
 
+    def sources_for(self, new_status) -> list:
+        return self.allowed_sources.get(new_status, [])
+
     def is_terminal(self, status):
         return status in [TaskStatus.SUCCESS, TaskStatus.FAILED]
\ No newline at end of file
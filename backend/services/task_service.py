@@ -1,13 +1,21 @@
+import asyncio
+import uuid
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.models.task import Task
 from backend.repositories.task_repository import TaskRepository
-from backend.core.enums import TaskStatus
+from backend.repositories.model_version_repository import ModelVersionRepository
+from backend.core.config import settings
+from backend.core.enums import TaskStatus, TaskType
 from backend.services.task_lifecycle_engine import TaskLifecycleEngine
 from backend.queue.producer import Producer
+from backend.queue.notifications import publish_task_events, task_event
 from backend.core.exceptions import (
     TaskNotFoundError,
     TaskExecutionError,
-    TaskPermissionError
+    TaskPermissionError,
+    TaskRetryLimitError,
 )
 
 
@@ -15,6 +23,7 @@ class TaskService:
 
     def __init__(self):
         self.task_repo = TaskRepository()
+        self.model_version_repo = ModelVersionRepository()
         self.engine = TaskLifecycleEngine()
         self.producer = Producer()
 
@@ -51,53 +60,216 @@ class TaskService:
         self.producer.enqueue_task(
             task_id=task.id,
             payload=input_payload,
+            task_type=task_type,
             priority=priority,
         )
 
         return task
 
+    async def create_tasks_batch(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: str,
+        items: list[dict],
+    ) -> list[dict]:
+        """
+        Bulk variant of create_task: one INSERT (rows go straight to QUEUED),
+        one commit, one broker connection for all messages.  Invalid items
+        are reported per index and not persisted; items whose message could
+        not be published are marked FAILED and reported with their id and
+        the error.  Returns [{index, id, error}] in input order.
+        """
+        # PENDING → QUEUED is applied in the INSERT itself
+        self.engine.validate_transition(TaskStatus.PENDING, TaskStatus.QUEUED)
+
+        results = [{"index": i, "id": None, "error": None} for i in range(len(items))]
+
+        # Step 1 — Validate referenced model versions with a single query
+        requested = set()
+        for result, item in zip(results, items):
+            mv_id = item.get("model_version_id")
+            if mv_id is None:
+                continue
+            try:
+                requested.add(str(uuid.UUID(str(mv_id))))
+            except ValueError:
+                result["error"] = f"Invalid model_version_id: {mv_id}"
+        existing = await self.model_version_repo.get_existing_ids(db, requested)
+
+        valid: list[int] = []
+        for result, item in zip(results, items):
+            mv_id = item.get("model_version_id")
+            if result["error"] is None and mv_id is not None and str(uuid.UUID(str(mv_id))) not in existing:
+                result["error"] = f"ModelVersion {mv_id} not found."
+            if result["error"] is None:
+                valid.append(result["index"])
+
+        # Step 2 — Persist all valid tasks as QUEUED in one transaction
+        rows = await self.task_repo.create_tasks_bulk(
+            db,
+            rows=[
+                {
+                    "user_id": user_id,
+                    "name": items[i]["name"],
+                    "task_type": items[i]["task_type"],
+                    "input_payload": items[i]["input_payload"],
+                    "priority": items[i].get("priority", 0),
+                    "model_version_id": items[i].get("model_version_id"),
+                }
+                for i in valid
+            ],
+        )
+
+        # Step 3 — Publish every message over one broker connection.
+        # Bulk ANALYSIS work is packed into batch messages (many tasks each);
+        # streaming tasks stay single — only execute_ai_task feeds a TaskStream
+        messages = [
+            {
+                "task_id": str(row["id"]),
+                "payload": row["input_payload"],
+                "task_type": row["task_type"],
+                "priority": row["priority"],
+            }
+            for row in rows
+        ]
+        single, batched = [], []
+        for message in messages:
+            if (
+                settings.TASK_BATCH_MESSAGE_SIZE > 1
+                and message["task_type"] == TaskType.ANALYSIS
+                and not (message["payload"] or {}).get("stream")
+            ):
+                batched.append(message)
+            else:
+                single.append(message)
+
+        enqueue_errors = {}
+        if single:
+            enqueue_errors.update(await asyncio.to_thread(self.producer.enqueue_tasks, single))
+        if batched:
+            enqueue_errors.update(await asyncio.to_thread(self.producer.enqueue_batch, batched))
+
+        # Unpublished rows would sit in QUEUED forever — fail them.  A publish
+        # that raised may still have reached the broker; a task a worker has
+        # already picked up is no longer QUEUED and is left alone
+        by_error: dict[str, list[str]] = {}
+        for task_id, error in enqueue_errors.items():
+            by_error.setdefault(f"Enqueue failed: {error}", []).append(task_id)
+        failed = {}
+        for error, task_ids in by_error.items():
+            for task in await self.fail_unstarted_tasks(
+                db, task_ids=task_ids, error_message=error, commit=False
+            ):
+                failed[str(task.id)] = task
+        if failed:
+            await db.commit()
+
+        events = []
+        for i, row in zip(valid, rows):
+            task_id = str(row["id"])
+            results[i]["id"] = task_id
+            if task_id in failed:
+                results[i]["error"] = failed[task_id].error_message
+                events.append(task_event(failed[task_id]))
+            elif task_id not in enqueue_errors:
+                events.append(task_event(Task(**row)))
+
+        await publish_task_events(events)
+        return results
+
     # ------------------------------------------------------------------ #
     # Lifecycle Transitions (called internally or by Celery workers)      #
     # ------------------------------------------------------------------ #
 
     async def queue_task(self, db: AsyncSession, *, task_id: str):
-        task = await self._get_or_raise(db, task_id)
-        self.engine.validate_transition(task.status, TaskStatus.QUEUED)
-        return await self.task_repo.update_task_status(db, task_id, TaskStatus.QUEUED)
+        return await self._transition(db, task_id, TaskStatus.QUEUED)
 
-    async def start_task_execution(self, db: AsyncSession, *, task_id: str):
-        task = await self._get_or_raise(db, task_id)
-        self.engine.validate_transition(task.status, TaskStatus.RUNNING)
-        return await self.task_repo.update_task_status(db, task_id, TaskStatus.RUNNING)
+    # `commit=False` lets the worker group transitions with its execution
+    # and result writes into one transaction (see queue/tasks.py)
 
-    async def complete_task_execution(self, db: AsyncSession, *, task_id: str):
-        task = await self._get_or_raise(db, task_id)
-        self.engine.validate_transition(task.status, TaskStatus.SUCCESS)
-        return await self.task_repo.update_task_status(db, task_id, TaskStatus.SUCCESS)
+    async def start_task_execution(
+        self, db: AsyncSession, *, task_id: str, commit: bool = True
+    ):
+        return await self._transition(db, task_id, TaskStatus.RUNNING, commit=commit)
+
+    async def complete_task_execution(
+        self, db: AsyncSession, *, task_id: str, commit: bool = True
+    ):
+        return await self._transition(db, task_id, TaskStatus.SUCCESS, commit=commit)
 
     async def fail_task_execution(
-        self, db: AsyncSession, *, task_id: str, error_message: str
+        self, db: AsyncSession, *, task_id: str, error_message: str, commit: bool = True
     ):
-        task = await self._get_or_raise(db, task_id)
-        self.engine.validate_transition(task.status, TaskStatus.FAILED)
+        return await self._transition(
+            db,
+            task_id,
+            TaskStatus.FAILED,
+            values={"error_message": error_message},
+            commit=commit,
+        )
 
-        task.error_message = error_message
-        await db.commit()
-        await db.refresh(task)
+    # Bulk variants for batch messages (execute_ai_task_batch).  Tasks that
+    # cannot make the transition are left out of the returned list.
 
-        return await self.task_repo.update_task_status(db, task_id, TaskStatus.FAILED)
+    async def start_tasks_execution(
+        self, db: AsyncSession, *, task_ids: list[str], commit: bool = True
+    ):
+        # RUNNING is accepted too: a batch redelivered after a worker crash
+        return await self.task_repo.transition_status_bulk(
+            db,
+            task_ids,
+            to_status=TaskStatus.RUNNING,
+            from_statuses=[*self.engine.sources_for(TaskStatus.RUNNING), TaskStatus.RUNNING],
+            commit=commit,
+        )
 
-    async def retry_task(self, db: AsyncSession, *, task_id: str):
-        task = await self._get_or_raise(db, task_id)
+    async def complete_tasks_execution(
+        self, db: AsyncSession, *, task_ids: list[str], commit: bool = True
+    ):
+        return await self.task_repo.transition_status_bulk(
+            db,
+            task_ids,
+            to_status=TaskStatus.SUCCESS,
+            from_statuses=self.engine.sources_for(TaskStatus.SUCCESS),
+            commit=commit,
+        )
 
-        if task.retry_count >= task.max_retries:
-            raise TaskExecutionError(
-                f"Task {task_id} has reached max retries ({task.max_retries})"
-            )
+    async def fail_tasks_execution(
+        self, db: AsyncSession, *, task_ids: list[str], error_message: str, commit: bool = True
+    ):
+        return await self.task_repo.transition_status_bulk(
+            db,
+            task_ids,
+            to_status=TaskStatus.FAILED,
+            from_statuses=self.engine.sources_for(TaskStatus.FAILED),
+            values={"error_message": error_message},
+            commit=commit,
+        )
+
+    async def fail_unstarted_tasks(
+        self, db: AsyncSession, *, task_ids: list[str], error_message: str, commit: bool = True
+    ):
+        # QUEUED / RETRYING only: tasks no worker holds.  One a worker did
+        # pick up (RUNNING) is never failed from here
+        return await self.task_repo.transition_status_bulk(
+            db,
+            task_ids,
+            to_status=TaskStatus.FAILED,
+            from_statuses=[TaskStatus.QUEUED, TaskStatus.RETRYING],
+            values={"error_message": error_message},
+            commit=commit,
+        )
 
-        self.engine.validate_transition(task.status, TaskStatus.RETRYING)
-        await self.task_repo.increment_retry_count(db, task_id)
-        return await self.task_repo.update_task_status(db, task_id, TaskStatus.RETRYING)
+    async def retry_task(self, db: AsyncSession, *, task_id: str, commit: bool = True):
+        return await self._transition(
+            db,
+            task_id,
+            TaskStatus.RETRYING,
+            where=(Task.retry_count < Task.max_retries,),
+            values={"retry_count": Task.retry_count + 1},
+            commit=commit,
+        )
 
     # ------------------------------------------------------------------ #
     # Queries                                                             #
@@ -106,13 +278,60 @@ class TaskService:
     async def get_task(self, db: AsyncSession, task_id: str):
         return await self.task_repo.get_task_by_id(db, task_id)
 
-    async def get_user_tasks(self, db: AsyncSession, user_id: str):
-        return await self.task_repo.get_tasks_by_user(db, user_id)
+    async def get_user_tasks(
+        self,
+        db: AsyncSession,
+        user_id: str,
+        *,
+        cursor: str | None = None,
+        limit: int = 50,
+    ):
+        return await self.task_repo.get_tasks_by_user(db, user_id, cursor=cursor, limit=limit)
 
     # ------------------------------------------------------------------ #
     # Internal helpers                                                    #
     # ------------------------------------------------------------------ #
 
+    async def _transition(
+        self,
+        db: AsyncSession,
+        task_id: str,
+        new_status: TaskStatus,
+        *,
+        where: tuple = (),
+        values: dict | None = None,
+        commit: bool = True,
+    ):
+        """
+        One conditional UPDATE ... RETURNING guarded by the lifecycle
+        engine's allowed source states.  Only when no row matched is the
+        task read back, to report why.
+        """
+        task = await self.task_repo.transition_status(
+            db,
+            task_id,
+            to_status=new_status,
+            from_statuses=self.engine.sources_for(new_status),
+            where=where,
+            values=values,
+            commit=commit,
+        )
+        if task is not None:
+            return task
+
+        current = await self._get_or_raise(db, task_id)
+        self.engine.validate_transition(current.status, new_status)
+
+        # Status was allowed, so the extra guard is what failed
+        if new_status == TaskStatus.RETRYING:
+            raise TaskRetryLimitError(
+                f"Task {task_id} has reached max retries ({current.max_retries})"
+            )
+        raise TaskExecutionError(
+            f"Transition {current.status} → {new_status} for task {task_id} "
+            "lost a race with a concurrent update."
+        )
+
     async def _get_or_raise(self, db: AsyncSession, task_id: str):
         task = await self.task_repo.get_task_by_id(db, task_id)
         if not task:
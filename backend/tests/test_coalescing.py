@@ -0,0 +1,113 @@
+import asyncio
+
+from backend.ml.coalescing import RequestCoalescer
+from backend.ml.providers.base import (
+    BaseProvider,
+    CompletionRequest,
+    CompletionResponse,
+    EmbeddingRequest,
+    EmbeddingResponse,
+)
+from backend.ml.router import ProviderRouter
+
+CONCURRENCY = 50
+
+
+class SlowProvider(BaseProvider):
+    """Counts calls and holds each one open long enough for callers to pile up."""
+
+    provider_name = "slow"
+
+    def __init__(self):
+        self.completions = 0
+        self.embeddings = 0
+
+    async def complete(self, request: CompletionRequest) -> CompletionResponse:
+        self.completions += 1
+        call = self.completions
+        await asyncio.sleep(0.05)
+        return CompletionResponse(
+            text=f"answer {call}",
+            model_id=request.model_id,
+            provider=self.provider_name,
+            prompt_tokens=1,
+            completion_tokens=1,
+            latency_ms=50.0,
+        )
+
+    async def embed(self, request: EmbeddingRequest) -> EmbeddingResponse:
+        self.embeddings += 1
+        await asyncio.sleep(0.05)
+        return EmbeddingResponse(
+            embeddings=[[0.0, 1.0] for _ in request.texts],
+            model_id=request.model_id,
+            provider=self.provider_name,
+            token_count=len(request.texts),
+            latency_ms=50.0,
+        )
+
+    def is_available(self) -> bool:
+        return True
+
+
+def _router(provider: SlowProvider) -> ProviderRouter:
+    return ProviderRouter(providers=[provider], coalescer=RequestCoalescer(distributed=False))
+
+
+async def _burst(call):
+    return await asyncio.gather(*(call() for _ in range(CONCURRENCY)))
+
+
+def test_identical_deterministic_completions_make_one_provider_call():
+    provider = SlowProvider()
+    router = _router(provider)
+    request = CompletionRequest(prompt="hello", model_id="m", temperature=0)
+
+    responses = asyncio.run(_burst(lambda: router.complete(request)))
+
+    assert provider.completions == 1
+    assert {response.text for response in responses} == {"answer 1"}
+
+
+def test_sampled_completions_are_not_coalesced():
+    provider = SlowProvider()
+    router = _router(provider)
+    request = CompletionRequest(prompt="hello", model_id="m", temperature=0.7)
+
+    responses = asyncio.run(_burst(lambda: router.complete(request)))
+
+    assert provider.completions == CONCURRENCY
+    assert len({response.text for response in responses}) == CONCURRENCY
+
+
+def test_identical_embeddings_make_one_provider_call():
+    provider = SlowProvider()
+    router = _router(provider)
+    request = EmbeddingRequest(texts=["a", "b"], model_id="m")
+
+    asyncio.run(_burst(lambda: router.embed(request)))
+
+    assert provider.embeddings == 1
+
+
+def test_leader_failure_reaches_every_follower():
+    calls = 0
+
+    async def failing():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        raise RuntimeError("provider down")
+
+    coalescer = RequestCoalescer(distributed=False)
+
+    async def burst():
+        return await asyncio.gather(
+            *(coalescer.run("key", failing) for _ in range(CONCURRENCY)),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(burst())
+
+    assert calls == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
@@ -0,0 +1,48 @@
+"""
+Train IVF indexes for the vector stores of one model version.
+
+    python -m backend.vectorstore.build_index <model_version_id> [--user ID] [--pq-m 16]
+
+Stores below --min-rows are skipped; an exact scan is fast enough there.
+Search picks up a rebuilt index on its next call, and rows added after the
+build are still scanned exactly, so re-run this as stores grow (e.g. from
+cron).
+"""
+import argparse
+from pathlib import Path
+
+from backend.core.config import settings
+from backend.vectorstore.store import get_vector_store
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="build IVF indexes for TaskForge vector stores")
+    parser.add_argument("model_version_id")
+    parser.add_argument("--user", help="only this user's store (default: every store of the model version)")
+    parser.add_argument(
+        "--min-rows",
+        type=int,
+        default=settings.VECTOR_STORE_IVF_MIN_ROWS,
+        help="skip stores with fewer rows",
+    )
+    parser.add_argument("--nlist", type=int, help="IVF buckets (default: sqrt(rows))")
+    parser.add_argument("--pq-m", type=int, help="product-quantisation sub-vectors (default: no PQ)")
+    options = parser.parse_args(argv)
+
+    root = Path(settings.VECTOR_STORE_DIR) / options.model_version_id
+    if options.user:
+        user_ids = [options.user]
+    else:
+        user_ids = sorted(p.name for p in root.iterdir() if p.is_dir()) if root.is_dir() else []
+
+    for user_id in user_ids:
+        store = get_vector_store(options.model_version_id, user_id)
+        if len(store) < options.min_rows:
+            print(f"{user_id}: {len(store)} rows, skipped")
+            continue
+        index = store.build_ivf(nlist=options.nlist, pq_m=options.pq_m)
+        print(f"{user_id}: indexed {index.n_indexed} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+from pathlib import Path
+
+import numpy as np
+
+
+_PQ_CENTROIDS = 256         # one uint8 code per sub-vector
+_TRAIN_SAMPLE_ROWS = 50_000
+
+
+# ------------------------------------------------------------------ #
+# k-means                                                              #
+# ------------------------------------------------------------------ #
+
+def _kmeans(data: np.ndarray, k: int, *, iterations: int, seed: int, spherical: bool) -> np.ndarray:
+    """Plain Lloyd's k-means.  `spherical` keeps centroids unit-length (cosine)."""
+    rng = np.random.default_rng(seed)
+    k = min(k, len(data))
+    centroids = data[rng.choice(len(data), size=k, replace=False)].copy()
+
+    for _ in range(iterations):
+        if spherical:
+            assign = np.argmax(data @ centroids.T, axis=1)
+        else:
+            # ||x - c||^2 = ||x||^2 - 2 x.c + ||c||^2 ; ||x||^2 is constant per row
+            dists = -2 * data @ centroids.T + np.sum(centroids ** 2, axis=1)
+            assign = np.argmin(dists, axis=1)
+
+        for c in range(k):
+            members = data[assign == c]
+            if len(members):
+                centroids[c] = members.mean(axis=0)
+            else:
+                centroids[c] = data[rng.integers(len(data))]
+
+        if spherical:
+            centroids /= np.linalg.norm(centroids, axis=1, keepdims=True) + 1e-12
+
+    return centroids.astype(np.float32)
+
+
+# ------------------------------------------------------------------ #
+# Product quantisation                                                 #
+# ------------------------------------------------------------------ #
+
+class ProductQuantizer:
+    """
+    Splits each vector into `m` sub-vectors and encodes each one as the id
+    of its nearest of 256 sub-centroids — `m` bytes per vector.  Inner
+    products against a query are approximated with one table lookup per
+    sub-vector (asymmetric distance computation).
+    """
+
+    def __init__(self, codebooks: np.ndarray):
+        self.codebooks = codebooks          # (m, 256, dim / m)
+        self.m, _, self.sub_dim = codebooks.shape
+
+    @classmethod
+    def train(cls, data: np.ndarray, m: int, *, iterations: int = 10, seed: int = 0):
+        dim = data.shape[1]
+        if dim % m:
+            raise ValueError(f"PQ sub-vector count {m} must divide dimension {dim}.")
+        sub_dim = dim // m
+        codebooks = np.stack([
+            _kmeans(
+                data[:, j * sub_dim:(j + 1) * sub_dim],
+                _PQ_CENTROIDS,
+                iterations=iterations,
+                seed=seed + j,
+                spherical=False,
+            )
+            for j in range(m)
+        ])
+        if codebooks.shape[1] < _PQ_CENTROIDS:
+            pad = _PQ_CENTROIDS - codebooks.shape[1]
+            codebooks = np.pad(codebooks, ((0, 0), (0, pad), (0, 0)))
+        return cls(codebooks)
+
+    def encode(self, data: np.ndarray) -> np.ndarray:
+        codes = np.empty((len(data), self.m), dtype=np.uint8)
+        for j in range(self.m):
+            sub = data[:, j * self.sub_dim:(j + 1) * self.sub_dim]
+            book = self.codebooks[j]
+            dists = -2 * sub @ book.T + np.sum(book ** 2, axis=1)
+            codes[:, j] = np.argmin(dists, axis=1)
+        return codes
+
+    def inner_products(self, query: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        sub_queries = query.reshape(self.m, self.sub_dim)
+        table = np.einsum("md,mkd->mk", sub_queries, self.codebooks)    # (m, 256)
+        return table[np.arange(self.m), codes].sum(axis=1)
+
+
+# ------------------------------------------------------------------ #
+# Inverted file index                                                  #
+# ------------------------------------------------------------------ #
+
+class IVFIndex:
+    """
+    Inverted-file index over the first `n_indexed` rows of a VectorStore.
+
+    Rows are bucketed by their nearest coarse centroid; a query only scans
+    the `nprobe` closest buckets.  With PQ enabled, buckets are scored on
+    compact codes and the best candidates are re-ranked exactly against
+    the memory-mapped vectors, so only those rows are paged in.
+    """
+
+    def __init__(
+        self,
+        centroids: np.ndarray,
+        list_rows: list[np.ndarray],
+        n_indexed: int,
+        pq: ProductQuantizer | None = None,
+        list_codes: list[np.ndarray] | None = None,
+    ):
+        self.centroids = centroids
+        self.list_rows = list_rows
+        self.n_indexed = n_indexed
+        self.pq = pq
+        self.list_codes = list_codes
+
+    @classmethod
+    def train(
+        cls,
+        matrix: np.ndarray,
+        *,
+        nlist: int,
+        pq_m: int | None = None,
+        iterations: int = 10,
+        seed: int = 0,
+    ) -> "IVFIndex":
+        n = len(matrix)
+        rng = np.random.default_rng(seed)
+        sample_rows = rng.choice(n, size=min(n, _TRAIN_SAMPLE_ROWS), replace=False)
+        sample = np.asarray(matrix[np.sort(sample_rows)])
+
+        centroids = _kmeans(sample, nlist, iterations=iterations, seed=seed, spherical=True)
+        pq = ProductQuantizer.train(sample, pq_m, seed=seed) if pq_m else None
+
+        assign = np.empty(n, dtype=np.int32)
+        codes = np.empty((n, pq.m), dtype=np.uint8) if pq else None
+        for start in range(0, n, _TRAIN_SAMPLE_ROWS):
+            chunk = np.asarray(matrix[start:start + _TRAIN_SAMPLE_ROWS])
+            assign[start:start + len(chunk)] = np.argmax(chunk @ centroids.T, axis=1)
+            if pq:
+                codes[start:start + len(chunk)] = pq.encode(chunk)
+
+        list_rows = [np.flatnonzero(assign == c).astype(np.int64) for c in range(len(centroids))]
+        list_codes = [codes[rows] for rows in list_rows] if pq else None
+        return cls(centroids, list_rows, n, pq, list_codes)
+
+    def search(
+        self,
+        matrix: np.ndarray,
+        query: np.ndarray,
+        k: int,
+        *,
+        nprobe: int,
+        rerank: int = 4,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        probe = np.argsort(-(self.centroids @ query))[:nprobe]
+        rows = np.concatenate([self.list_rows[c] for c in probe])
+        if not len(rows):
+            return rows, np.empty(0, dtype=np.float32)
+
+        if self.pq:
+            codes = np.concatenate([self.list_codes[c] for c in probe])
+            approx = self.pq.inner_products(query, codes)
+            keep = min(len(rows), k * rerank)
+            rows = rows[np.argpartition(-approx, keep - 1)[:keep]]
+
+        rows = np.sort(rows)      # sequential memmap access
+        scores = np.asarray(matrix[rows]) @ query
+        return rows, scores
+
+    # ------------------------------------------------------------------ #
+    # Persistence                                                          #
+    # ------------------------------------------------------------------ #
+
+    def save(self, path: Path) -> None:
+        sizes = np.array([len(r) for r in self.list_rows], dtype=np.int64)
+        arrays = {
+            "centroids": self.centroids,
+            "sizes": sizes,
+            "rows": np.concatenate(self.list_rows) if self.list_rows else np.empty(0, np.int64),
+            "n_indexed": np.array(self.n_indexed),
+        }
+        if self.pq:
+            arrays["codebooks"] = self.pq.codebooks
+            arrays["codes"] = np.concatenate(self.list_codes)
+
+        tmp = path.with_suffix(".tmp.npz")
+        np.savez(tmp, **arrays)
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "IVFIndex":
+        with np.load(path) as data:
+            offsets = np.cumsum(data["sizes"])[:-1]
+            list_rows = np.split(data["rows"], offsets)
+            pq = None
+            list_codes = None
+            if "codebooks" in data:
+                pq = ProductQuantizer(data["codebooks"])
+                list_codes = np.split(data["codes"], offsets)
+            return cls(data["centroids"], list_rows, int(data["n_indexed"]), pq, list_codes)
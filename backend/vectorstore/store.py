@@ -0,0 +1,325 @@
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from backend.core.config import settings
+from backend.vectorstore.ivf import IVFIndex
+
+logger = logging.getLogger(__name__)
+
+_VECTORS_FILE = "vectors.f32"
+_IDS_FILE = "ids.jsonl"
+_META_FILE = "meta.json"
+_IVF_FILE = "ivf.npz"
+_LOCK_FILE = ".lock"
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class SearchHit:
+    id: str
+    text: str
+    score: float
+
+
+class VectorStore:
+    """
+    Append-only embedding store for one owner and one model version.
+
+    Layout under <VECTOR_STORE_DIR>/<model_version_id>/<user_id>/:
+        vectors.f32   row-major float32, L2-normalised, memory-mapped for reads
+        ids.jsonl     sidecar, one {"id": <sha256 of text>, "text": ...} per row
+        meta.json     {"dim": ..., "model_id": ...}
+        ivf.npz       optional IVF / PQ index (see ivf.py)
+
+    Writers serialise on an flock so several API / worker processes can
+    share one directory; readers pick up rows appended by other processes
+    on their next call.  Vectors are normalised on write, so cosine
+    similarity is a plain dot product.
+
+    Each user gets their own store, so a search can only ever return texts
+    its caller indexed.
+    """
+
+    def __init__(self, path: Path, *, model_id: str | None = None):
+        self._path = path
+        self._path.mkdir(parents=True, exist_ok=True)
+        self._model_id = model_id
+        self._lock = threading.Lock()
+
+        self._unload()
+        self._refresh()
+
+    # ------------------------------------------------------------------ #
+    # Reads                                                                #
+    # ------------------------------------------------------------------ #
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @property
+    def dim(self) -> int | None:
+        return self._dim
+
+    def missing(self, ids: list[str]) -> list[str]:
+        with self._lock:
+            self._refresh()
+            return [i for i in ids if i not in self._rows_by_id]
+
+    def get(self, id: str) -> np.ndarray | None:
+        with self._lock:
+            self._refresh()
+            row = self._rows_by_id.get(id)
+            return None if row is None else np.asarray(self._matrix[row])
+
+    def search(self, query, k: int = 10, *, nprobe: int | None = None) -> list[SearchHit]:
+        query = _normalise(np.asarray(query, dtype=np.float32).reshape(1, -1))[0]
+
+        with self._lock:
+            self._refresh()
+            if not self._ids:
+                return []
+            if query.shape[0] != self._dim:
+                raise ValueError(f"Query has dimension {query.shape[0]}, store has {self._dim}.")
+
+            matrix = self._matrix
+            ivf = self._ivf if self._ivf and self._ivf.n_indexed <= len(self._ids) else None
+
+            if ivf is None:
+                rows = np.arange(len(self._ids))
+                scores = matrix @ query
+            else:
+                rows, scores = ivf.search(
+                    matrix, query, k, nprobe=nprobe or settings.VECTOR_STORE_IVF_NPROBE
+                )
+                # Rows appended after the index was built are scanned exactly
+                if ivf.n_indexed < len(self._ids):
+                    tail = np.arange(ivf.n_indexed, len(self._ids))
+                    rows = np.concatenate([rows, tail])
+                    scores = np.concatenate([scores, matrix[ivf.n_indexed:] @ query])
+
+            top = _top_k(scores, k)
+            return [
+                SearchHit(id=self._ids[rows[i]], text=self._texts[rows[i]], score=float(scores[i]))
+                for i in top
+            ]
+
+    # ------------------------------------------------------------------ #
+    # Writes                                                               #
+    # ------------------------------------------------------------------ #
+
+    def add(self, texts: list[str], vectors) -> int:
+        """Append vectors for texts not stored yet. Returns the number added."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if len(texts) != len(vectors):
+            raise ValueError("texts and vectors must have the same length.")
+        if not len(texts):
+            return 0
+
+        with self._lock, self._file_lock():
+            self._refresh()
+            self._truncate_partial_writes()
+
+            if self._dim is None:
+                self._dim = int(vectors.shape[1])
+                meta = {"dim": self._dim, "model_id": self._model_id}
+                (self._path / _META_FILE).write_text(json.dumps(meta))
+            elif vectors.shape[1] != self._dim:
+                raise ValueError(f"Vectors have dimension {vectors.shape[1]}, store has {self._dim}.")
+
+            seen = set()
+            keep = []
+            for i, text in enumerate(texts):
+                id = text_hash(text)
+                if id not in self._rows_by_id and id not in seen:
+                    seen.add(id)
+                    keep.append(i)
+            if not keep:
+                return 0
+
+            # Vectors first, sidecar second: a reader never sees an id
+            # without its row.
+            with open(self._path / _VECTORS_FILE, "ab") as f:
+                f.write(_normalise(vectors[keep]).tobytes())
+            with open(self._path / _IDS_FILE, "a", encoding="utf-8") as f:
+                for i in keep:
+                    f.write(json.dumps({"id": text_hash(texts[i]), "text": texts[i]}) + "\n")
+
+            self._refresh()
+            return len(keep)
+
+    def close(self) -> None:
+        """
+        Release the loaded ids, texts, memmap and index.  Callers still
+        holding the store can keep using it; it reloads from disk.
+        """
+        with self._lock:
+            self._unload()
+
+    def build_ivf(self, *, nlist: int | None = None, pq_m: int | None = None) -> IVFIndex:
+        """Train and persist an IVF (optionally PQ) index over current rows."""
+        with self._lock:
+            self._refresh()
+            if not self._ids:
+                raise ValueError("Cannot build an index over an empty store.")
+            matrix = self._matrix
+
+        nlist = nlist or max(1, int(np.sqrt(len(matrix))))
+        index = IVFIndex.train(matrix, nlist=nlist, pq_m=pq_m)
+
+        with self._lock, self._file_lock():
+            index.save(self._path / _IVF_FILE)
+            self._ivf = index
+            self._ivf_mtime = (self._path / _IVF_FILE).stat().st_mtime
+
+        logger.info(
+            "vector_store.ivf.built",
+            extra={"path": str(self._path), "rows": index.n_indexed, "nlist": nlist, "pq_m": pq_m},
+        )
+        return index
+
+    # ------------------------------------------------------------------ #
+    # Internal helpers                                                     #
+    # ------------------------------------------------------------------ #
+
+    def _unload(self) -> None:
+        self._dim: int | None = None
+        self._ids: list[str] = []
+        self._texts: list[str] = []
+        self._rows_by_id: dict[str, int] = {}
+        self._sidecar_offset = 0
+        self._matrix: np.memmap | None = None
+        self._ivf: IVFIndex | None = None
+        self._ivf_mtime: float | None = None
+
+    @contextmanager
+    def _file_lock(self):
+        with open(self._path / _LOCK_FILE, "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _truncate_partial_writes(self) -> None:
+        """
+        Cut both files back to the last complete row.  A writer that died
+        between the two appends leaves vector bytes without an id, which
+        would shift every later row onto the wrong id.  Caller holds the
+        file lock, so nothing past that point is still being written.
+        """
+        if self._dim is None:
+            return
+
+        expected = (
+            (self._path / _VECTORS_FILE, len(self._ids) * self._dim * np.dtype(np.float32).itemsize),
+            (self._path / _IDS_FILE, self._sidecar_offset),
+        )
+        for path, size in expected:
+            if path.exists() and path.stat().st_size > size:
+                logger.warning(
+                    "vector_store.partial_write.truncated",
+                    extra={"path": str(path), "size": path.stat().st_size, "expected": size},
+                )
+                os.truncate(path, size)
+
+    def _refresh(self) -> None:
+        """Pick up rows (and a rebuilt index) written by any process."""
+        meta_path = self._path / _META_FILE
+        if self._dim is None:
+            if not meta_path.exists():
+                return
+            meta = json.loads(meta_path.read_text())
+            self._dim = meta["dim"]
+            self._model_id = self._model_id or meta.get("model_id")
+
+        ids_path = self._path / _IDS_FILE
+        if ids_path.exists() and ids_path.stat().st_size > self._sidecar_offset:
+            with open(ids_path, "r", encoding="utf-8") as f:
+                f.seek(self._sidecar_offset)
+                for line in f:
+                    if not line.endswith("\n"):
+                        break           # partial line from a concurrent writer
+                    entry = json.loads(line)
+                    self._rows_by_id[entry["id"]] = len(self._ids)
+                    self._ids.append(entry["id"])
+                    self._texts.append(entry["text"])
+                    self._sidecar_offset += len(line.encode("utf-8"))
+
+        rows = len(self._ids)
+        if rows and (self._matrix is None or len(self._matrix) != rows):
+            self._matrix = np.memmap(
+                self._path / _VECTORS_FILE,
+                dtype=np.float32,
+                mode="r",
+                shape=(rows, self._dim),
+            )
+
+        ivf_path = self._path / _IVF_FILE
+        if ivf_path.exists():
+            mtime = ivf_path.stat().st_mtime
+            if mtime != self._ivf_mtime:
+                self._ivf = IVFIndex.load(ivf_path)
+                self._ivf_mtime = mtime
+
+
+def _normalise(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return (vectors / np.maximum(norms, 1e-12)).astype(np.float32)
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+# ------------------------------------------------------------------ #
+# Per-process registry                                                 #
+# ------------------------------------------------------------------ #
+
+# LRU of loaded stores: each holds its owner's ids and texts in memory, so
+# only the VECTOR_STORE_MAX_OPEN most recently used stay loaded
+_stores: OrderedDict[tuple[str, str], VectorStore] = OrderedDict()
+_stores_lock = threading.Lock()
+
+
+def store_path(model_version_id: str, user_id: str) -> Path:
+    return Path(settings.VECTOR_STORE_DIR) / str(model_version_id) / str(user_id)
+
+
+def get_vector_store(
+    model_version_id: str,
+    user_id: str,
+    *,
+    model_id: str | None = None,
+) -> VectorStore:
+    key = (str(model_version_id), str(user_id))
+    evicted = []
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = VectorStore(store_path(*key), model_id=model_id)
+            _stores[key] = store
+        _stores.move_to_end(key)
+        while len(_stores) > max(1, settings.VECTOR_STORE_MAX_OPEN):
+            evicted.append(_stores.popitem(last=False)[1])
+
+    # Outside the registry lock: close() waits for searches on that store
+    for old in evicted:
+        old.close()
+    return store
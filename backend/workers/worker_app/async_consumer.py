@@ -0,0 +1,309 @@
+"""
+asyncio worker mode: one process, many concurrent tasks.
+
+A prefork child runs one task at a time and spends nearly all of it
+awaiting provider HTTP responses.  This consumer reads the same broker
+queues as `celery worker` and runs up to `--concurrency` task coroutines
+at once on the process-wide WorkerRuntime loop, so a single process can
+keep hundreds of I/O-bound inference tasks in flight.
+
+    python -m backend.workers.worker_app.async_consumer -Q high,default -c 200
+
+Semantics match the Celery worker configuration (celery_app.py):
+
+  * acks_late — a message is acked only after its task finished (success
+    or final failure); unacked messages of a crashed process are restored
+    by the broker.
+  * back-pressure — the broker prefetch equals the concurrency, and a
+    semaphore bounds running tasks, so the process never holds more
+    messages than it can run.  Messages with a future ETA (Celery retries
+    with a countdown) wait outside the semaphore and raise the prefetch
+    by one while they wait, as the Celery worker does.
+  * retries — `task.retry()` re-publishes the message with `retries + 1`
+    and the requested countdown, then acks the original; past the task's
+    `max_retries` it yields the final error instead.
+
+Tasks use the same `_run_task` coroutine as the Celery tasks.  kombu is
+synchronous, so broker I/O runs on one dedicated thread; acks, rejects and
+QoS changes are handed back to that thread, which owns the channel.
+"""
+import argparse
+import asyncio
+import logging
+import queue
+import signal
+import socket
+import threading
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from celery.exceptions import MaxRetriesExceededError, Retry
+from kombu import Consumer
+
+from backend.core.config import settings
+from backend.queue import tasks as celery_tasks
+from backend.queue.celery_app import celery_app
+from backend.workers.worker_app.runtime import runtime
+
+logger = logging.getLogger(__name__)
+
+_DRAIN_TIMEOUT_SECONDS = 0.2      # Upper bound on ack/QoS latency
+
+
+class AsyncTaskContext:
+    """
+    Stand-in for a bound Celery task (`self` in `execute_ai_task`) exposing
+    what `_run_task` uses: `request.retries`, `max_retries`,
+    `default_retry_delay`, `MaxRetriesExceededError` and `retry()`.
+    """
+
+    MaxRetriesExceededError = MaxRetriesExceededError
+
+    def __init__(self, task, *, task_id: str, retries: int):
+        self.name = task.name
+        self.max_retries = task.max_retries
+        self.default_retry_delay = task.default_retry_delay
+        self.request = SimpleNamespace(id=task_id, retries=retries)
+
+    def retry(self, exc: BaseException | None = None, countdown: float | None = None) -> BaseException:
+        # Returned, not raised — callers do `raise task_self.retry(...)`.
+        # Past max_retries this is the final error, as Task.retry raises it.
+        if self.max_retries is not None and self.request.retries >= self.max_retries:
+            if exc is not None:
+                return exc
+            return self.MaxRetriesExceededError(
+                f"Can't retry {self.name}[{self.request.id}]: max retries ({self.max_retries}) exceeded"
+            )
+        return Retry(exc=exc, when=countdown if countdown is not None else self.default_retry_delay)
+
+
+class AsyncConsumer:
+
+    def __init__(self, queues: list[str], *, concurrency: int):
+        self._queues = queues
+        self._concurrency = concurrency
+        self._slots: asyncio.Semaphore | None = None
+        self._inflight: set[asyncio.Task] = set()
+        self._commands: queue.SimpleQueue = queue.SimpleQueue()
+        self._stopping = threading.Event()
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+        # Task name → coroutine factory(context, args, kwargs)
+        self._handlers = {
+            celery_tasks.execute_ai_task.name: self._execute_ai_task,
+            celery_tasks.execute_ai_task_batch.name: self._execute_ai_task_batch,
+            celery_tasks.reconcile_metrics.name: self._reconcile_metrics,
+        }
+
+    # ------------------------------------------------------------------ #
+    # Lifecycle                                                            #
+    # ------------------------------------------------------------------ #
+
+    def run(self) -> None:
+        runtime.start()
+        self._loop = runtime.loop
+        try:
+            self._loop.run_until_complete(self._serve())
+        finally:
+            runtime.shutdown()
+
+    async def _serve(self) -> None:
+        self._slots = asyncio.Semaphore(self._concurrency)
+        stop = asyncio.Event()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            self._loop.add_signal_handler(sig, stop.set)
+
+        broker = threading.Thread(target=self._broker_loop, name="async-consumer-broker", daemon=True)
+        broker.start()
+        logger.info(
+            "async_consumer.started",
+            extra={"queues": self._queues, "concurrency": self._concurrency},
+        )
+
+        await stop.wait()
+        logger.info("async_consumer.stopping", extra={"inflight": len(self._inflight)})
+
+        # Stop fetching, let running tasks finish, leave the rest unacked
+        self._command(lambda consumer: consumer.cancel())
+        if self._inflight:
+            await asyncio.wait(self._inflight, timeout=settings.ASYNC_WORKER_SHUTDOWN_TIMEOUT_SECONDS)
+        for task in self._inflight:
+            task.cancel()
+        await asyncio.gather(*self._inflight, return_exceptions=True)
+
+        self._stopping.set()
+        await asyncio.to_thread(broker.join)
+        logger.info("async_consumer.stopped")
+
+    # ------------------------------------------------------------------ #
+    # Broker thread (owns the kombu connection and channel)                #
+    # ------------------------------------------------------------------ #
+
+    def _broker_loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                with celery_app.connection_for_read() as conn:
+                    consumer = Consumer(
+                        conn.default_channel,
+                        queues=[celery_app.amqp.queues[name] for name in self._queues],
+                        callbacks=[self._on_message],
+                        accept=["json"],
+                    )
+                    consumer.qos(prefetch_count=self._concurrency)
+                    consumer.consume()
+
+                    while not self._stopping.is_set():
+                        self._run_commands(consumer)
+                        try:
+                            conn.drain_events(timeout=_DRAIN_TIMEOUT_SECONDS)
+                        except socket.timeout:
+                            pass
+                    self._run_commands(consumer)
+            except Exception:
+                if self._stopping.is_set():
+                    return
+                logger.exception("async_consumer.broker.connection_lost")
+                self._stopping.wait(1.0)
+
+    def _on_message(self, body, message) -> None:
+        # Broker thread → event loop
+        self._loop.call_soon_threadsafe(self._dispatch, body, message)
+
+    def _run_commands(self, consumer: Consumer) -> None:
+        while True:
+            try:
+                command = self._commands.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                command(consumer)
+            except Exception:
+                logger.exception("async_consumer.broker.command_failed")
+
+    def _command(self, command) -> None:
+        self._commands.put(command)
+
+    # ------------------------------------------------------------------ #
+    # Event loop side                                                      #
+    # ------------------------------------------------------------------ #
+
+    def _dispatch(self, body, message) -> None:
+        task = self._loop.create_task(self._handle(body, message))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _handle(self, body, message) -> None:
+        headers = message.headers or {}
+        name = headers.get("task")
+        task_id = headers.get("id")
+        handler = self._handlers.get(name)
+        if handler is None:
+            logger.error("async_consumer.unknown_task", extra={"task": name, "task_id": task_id})
+            self._command(lambda _consumer: message.reject(requeue=False))
+            return
+
+        args, kwargs, _embed = body
+        eta = _parse_eta(headers.get("eta"))
+        if eta is not None:
+            await self._wait_for_eta(eta)
+
+        async with self._slots:
+            context = AsyncTaskContext(
+                self._task(name),
+                task_id=task_id,
+                retries=headers.get("retries") or 0,
+            )
+            try:
+                await handler(context, args, kwargs)
+            except Retry as retry:
+                await self._republish(message, name, args, kwargs, context, retry.when)
+            except asyncio.CancelledError:
+                raise   # shutdown — leave unacked so the broker redelivers it
+            except Exception as exc:
+                # Final failure; _run_task has already recorded it
+                logger.warning(
+                    "async_consumer.task.failed",
+                    extra={"task": name, "task_id": task_id, "error": str(exc)},
+                )
+
+        self._command(lambda _consumer: message.ack())
+
+    async def _wait_for_eta(self, eta: datetime) -> None:
+        # Waiting messages must not starve the prefetch window
+        self._command(lambda consumer: consumer.qos(prefetch_count=consumer.channel.qos.prefetch_count + 1))
+        try:
+            delay = (eta - datetime.now(timezone.utc)).total_seconds()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        finally:
+            self._command(lambda consumer: consumer.qos(prefetch_count=consumer.channel.qos.prefetch_count - 1))
+
+    async def _republish(self, message, name, args, kwargs, context, countdown) -> None:
+        delivery_info = message.delivery_info or {}
+        await asyncio.to_thread(
+            celery_app.send_task,
+            name,
+            args=args,
+            kwargs=kwargs,
+            task_id=context.request.id,
+            retries=context.request.retries + 1,
+            countdown=countdown,
+            queue=delivery_info.get("routing_key"),
+            priority=(message.properties or {}).get("priority"),
+        )
+        logger.info(
+            "async_consumer.task.retry",
+            extra={"task": name, "task_id": context.request.id, "countdown": countdown},
+        )
+
+    def _task(self, name: str):
+        return celery_app.tasks[name]
+
+    # ------------------------------------------------------------------ #
+    # Handlers                                                             #
+    # ------------------------------------------------------------------ #
+
+    async def _execute_ai_task(self, context: AsyncTaskContext, args, kwargs):
+        return await celery_tasks._run_task(context, *args, **kwargs)
+
+    async def _execute_ai_task_batch(self, context: AsyncTaskContext, args, kwargs):
+        return await celery_tasks._run_task_batch(context, *args, **kwargs)
+
+    async def _reconcile_metrics(self, context: AsyncTaskContext, args, kwargs):
+        return await celery_tasks._reconcile_metrics()
+
+
+def _parse_eta(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    eta = datetime.fromisoformat(value)
+    return eta if eta.tzinfo else eta.replace(tzinfo=timezone.utc)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="asyncio TaskForge worker")
+    parser.add_argument(
+        "-Q", "--queues",
+        default=",".join((
+            settings.CELERY_HIGH_PRIORITY_QUEUE,
+            settings.CELERY_DEFAULT_QUEUE,
+            settings.CELERY_LOW_PRIORITY_QUEUE,
+        )),
+        help="comma-separated queues, in preference order",
+    )
+    parser.add_argument(
+        "-c", "--concurrency",
+        type=int,
+        default=settings.ASYNC_WORKER_CONCURRENCY,
+        help="max tasks running at once in this process",
+    )
+    options = parser.parse_args(argv)
+
+    AsyncConsumer(
+        [name for name in options.queues.split(",") if name],
+        concurrency=options.concurrency,
+    ).run()
+
+
+if __name__ == "__main__":
+    main()
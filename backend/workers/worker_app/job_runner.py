@@ -6,8 +6,8 @@ class JobRunner:
     """
     Pure computation dispatcher.
     No DB access. No asyncio. No status management.
-    Returns a coroutine — the caller (tasks.py) owns the single asyncio.run()
-    and awaits it inside the existing event loop.
+    Returns a coroutine — the caller (tasks.py) runs it on the worker
+    runtime's process-wide event loop.
     """
 
     @staticmethod
@@ -16,22 +16,25 @@ class JobRunner:
         task_type: str,
         payload: dict,
         model_version_id: str | None = None,
+        on_chunk=None,
     ):
-        from backend.services.model_service import ModelService
+        from backend.workers.worker_app.runtime import runtime
 
         if task_type == TaskType.INFERENCE:
-            return ModelService().run_inference(
+            return runtime.model_service.run_inference(
                 task_type=TaskType.INFERENCE,
                 input_payload=payload,
                 model_version_id=model_version_id,
+                on_chunk=on_chunk,
             )
 
         elif task_type == TaskType.ANALYSIS:
-            return ModelService().run_inference(
+            return runtime.model_service.run_inference(
                 task_type=TaskType.ANALYSIS,
                 input_payload=payload,
                 model_version_id=model_version_id,
+                on_chunk=on_chunk,
             )
 
         else:
-            raise TaskExecutionError(f"Unsupported task type: {task_type}")
\ No newline at end of file
+            raise TaskExecutionError(f"Unsupported task type: {task_type}")
@@ -0,0 +1,85 @@
+"""
+Start one Celery worker pool per priority queue.
+
+Each pool consumes only its own queue, so bulk work can never occupy a
+slot that an INFERENCE job is waiting for; the relative share of capacity
+("weight") is each pool's process count from WORKER_POOL_CONCURRENCY.
+
+    python -m backend.workers.worker_app.pools              # all pools
+    python -m backend.workers.worker_app.pools high default # a subset
+
+Equivalent to running, per pool:
+
+    celery -A backend.queue.celery_app:celery_app worker -Q <queue> -c <n> -n <pool>@%h
+
+With WORKER_EXECUTION_MODE="asyncio" each pool is instead one asyncio
+consumer process (see async_consumer.py); the busiest pool runs
+ASYNC_WORKER_CONCURRENCY tasks at once and the others scale by weight.
+"""
+import logging
+import signal
+import subprocess
+import sys
+
+from backend.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def pool_queues() -> dict[str, str]:
+    return {
+        "high": settings.CELERY_HIGH_PRIORITY_QUEUE,
+        "default": settings.CELERY_DEFAULT_QUEUE,
+        "low": settings.CELERY_LOW_PRIORITY_QUEUE,
+    }
+
+
+def worker_command(pool: str, concurrency: int) -> list[str]:
+    if settings.WORKER_EXECUTION_MODE == "asyncio":
+        return [
+            sys.executable, "-m", "backend.workers.worker_app.async_consumer",
+            "-Q", pool_queues()[pool],
+            "-c", str(async_concurrency(concurrency)),
+        ]
+    return [
+        sys.executable, "-m", "celery",
+        "-A", "backend.queue.celery_app:celery_app",
+        "worker",
+        "-Q", pool_queues()[pool],
+        "-c", str(concurrency),
+        "-n", f"{pool}@%h",
+        "--prefetch-multiplier", "1",
+    ]
+
+
+def async_concurrency(weight: int) -> int:
+    heaviest = max(settings.WORKER_POOL_CONCURRENCY.values(), default=1) or 1
+    return max(round(settings.ASYNC_WORKER_CONCURRENCY * weight / heaviest), 1)
+
+
+def main(pools: list[str]) -> int:
+    unknown = set(pools) - set(pool_queues())
+    if unknown:
+        raise SystemExit(f"Unknown worker pool(s): {', '.join(sorted(unknown))}")
+
+    processes: list[subprocess.Popen] = []
+    for pool in pools:
+        concurrency = settings.WORKER_POOL_CONCURRENCY.get(pool, 1)
+        if concurrency <= 0:
+            continue
+        logger.info("worker_pool.start", extra={"pool": pool, "concurrency": concurrency})
+        processes.append(subprocess.Popen(worker_command(pool, concurrency)))
+
+    def _forward(signum, _frame):
+        for proc in processes:
+            proc.send_signal(signum)
+
+    signal.signal(signal.SIGTERM, _forward)
+    signal.signal(signal.SIGINT, _forward)
+
+    # Exit non-zero if any pool dies abnormally
+    return max((proc.wait() for proc in processes), default=0)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:] or list(pool_queues())))
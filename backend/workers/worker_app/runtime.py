@@ -0,0 +1,157 @@
+import asyncio
+import logging
+import os
+from typing import Awaitable, Callable
+
+from celery.signals import worker_process_init, worker_process_shutdown
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from backend.core.config import settings
+from backend.monitoring.prometheus import mark_process_dead
+from backend.queue.redis_client import close_redis, init_redis
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerRuntime:
+    """
+    Process-scoped async runtime for Celery workers.
+
+    Each prefork child owns exactly one event loop and one async engine,
+    created after fork on `worker_process_init` and torn down on
+    `worker_process_shutdown`.  Tasks hand their coroutine to `run()`
+    instead of calling asyncio.run(), so the DB pool and provider HTTP
+    clients stay warm across tasks and Celery retries.
+
+    If the signals never fire (eager mode, `-P solo` in tests, scripts)
+    the runtime starts lazily on the first `run()` call.
+
+    Usage:
+        runtime.run(_run_task(self, task_id, payload))
+        async with runtime.session_factory() as db: ...
+    """
+
+    def __init__(self):
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.engine: AsyncEngine | None = None
+        self.session_factory: async_sessionmaker[AsyncSession] | None = None
+        self._model_service = None
+        self._shutdown_hooks: list[Callable[[], Awaitable[None]]] = []
+
+    # ------------------------------------------------------------------ #
+    # Lifecycle                                                            #
+    # ------------------------------------------------------------------ #
+
+    @property
+    def is_running(self) -> bool:
+        return self.loop is not None and not self.loop.is_closed()
+
+    def start(self) -> None:
+        if self.is_running:
+            return
+
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+        self.engine = create_async_engine(
+            settings.DATABASE_ASYNC_URL,
+            pool_pre_ping=True,
+            pool_size=settings.WORKER_DB_POOL_SIZE,
+            max_overflow=settings.WORKER_DB_MAX_OVERFLOW,
+            pool_recycle=settings.WORKER_DB_POOL_RECYCLE_SECONDS,
+            echo=False,
+        )
+        self.session_factory = async_sessionmaker(
+            bind=self.engine,
+            expire_on_commit=False,
+            autoflush=False,
+            class_=AsyncSession,
+        )
+
+        # Redis (completion cache, metrics counters) bound to this loop
+        self.loop.run_until_complete(init_redis())
+        self.add_shutdown_hook(close_redis)
+
+        logger.info("worker_runtime.started")
+
+    def shutdown(self) -> None:
+        if not self.is_running:
+            return
+
+        try:
+            for hook in reversed(self._shutdown_hooks):
+                try:
+                    self.loop.run_until_complete(hook())
+                except Exception:
+                    logger.exception("worker_runtime.shutdown_hook.failed")
+
+            self.loop.run_until_complete(self.engine.dispose())
+            self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+        finally:
+            self.loop.close()
+            self.loop = None
+            self.engine = None
+            self.session_factory = None
+            self._model_service = None
+            self._shutdown_hooks.clear()
+
+        logger.info("worker_runtime.stopped")
+
+    def add_shutdown_hook(self, hook: Callable[[], Awaitable[None]]) -> None:
+        """Register an async cleanup callable, run in reverse order on shutdown."""
+        self._shutdown_hooks.append(hook)
+
+    # ------------------------------------------------------------------ #
+    # Execution                                                            #
+    # ------------------------------------------------------------------ #
+
+    def run(self, coro):
+        """Run a coroutine to completion on the process-wide loop."""
+        if not self.is_running:
+            self.start()
+        return self.loop.run_until_complete(coro)
+
+    # ------------------------------------------------------------------ #
+    # Shared services                                                      #
+    # ------------------------------------------------------------------ #
+
+    @property
+    def model_service(self):
+        """
+        One ModelService per process, bound to this runtime's session
+        factory.  Provider HTTP clients live in the shared registry and are
+        closed by a shutdown hook.
+        """
+        if self._model_service is None:
+            from backend.ml.model_version_cache import get_model_version_cache
+            from backend.ml.providers.registry import close_providers
+            from backend.services.model_service import ModelService
+
+            self._model_service = ModelService(session_factory=self.session_factory)
+            self.add_shutdown_hook(close_providers)
+            # Its pub/sub connection belongs to this loop's Redis client
+            self.add_shutdown_hook(get_model_version_cache().close)
+        return self._model_service
+
+
+runtime = WorkerRuntime()
+
+
+# ------------------------------------------------------------------ #
+# Celery process signals                                               #
+# ------------------------------------------------------------------ #
+
+@worker_process_init.connect
+def _start_worker_runtime(**kwargs):
+    runtime.start()
+
+
+@worker_process_shutdown.connect
+def _stop_worker_runtime(**kwargs):
+    runtime.shutdown()
+    mark_process_dead(os.getpid())